@@ -0,0 +1,109 @@
+"""Admin endpoints for inspecting the running pipeline."""
+import asyncio
+import secrets
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.profiler import profiler
+from app.core.tracing import tracer
+from app.services.aggregation import AggregationWeights
+from app.services.analysis_archive import analysis_archive
+
+
+async def require_admin(x_admin_token: str = Header(default="")):
+    """Check the X-Admin-Token header against the configured token."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/traces")
+async def list_traces(limit: int = Query(default=20, ge=1, le=500)):
+    """List the most recent cycle and search traces, newest first."""
+    return {"traces": tracer.recent(limit)}
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Get all spans of one trace."""
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace '{trace_id}' not found")
+    return trace
+
+
+@router.post("/profiles")
+async def start_profile(
+    target: str = Query(..., description="'cycle' or a route path such as /api/v1/sentiment/search"),
+    mode: str = Query(default="sampling", pattern="^(sampling|cprofile)$"),
+    count: int = Query(default=1, ge=1),
+    interval_ms: float = Query(default=10.0, ge=1.0, le=1000.0),
+):
+    """Profile the next `count` aggregation cycles or requests to a route."""
+    if count > settings.profile_max_count:
+        raise HTTPException(status_code=400, detail=f"count must be at most {settings.profile_max_count}")
+    try:
+        session = profiler.start(mode, target, count, interval_ms)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return session.to_dict()
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """List the armed profiling session and recent finished ones."""
+    return {"profiles": profiler.sessions()}
+
+
+@router.delete("/profiles/current")
+async def stop_profile():
+    """Finish the armed session early, keeping what it captured."""
+    session = profiler.stop()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session is armed")
+    return session.to_dict()
+
+
+@router.get("/profiles/{session_id}/download")
+async def download_profile(session_id: str):
+    """Download a finished profile (collapsed stacks or pstats)."""
+    session = profiler.get(session_id)
+    if session is None or session.path is None or not Path(session.path).exists():
+        raise HTTPException(status_code=404, detail=f"Profile '{session_id}' not found")
+    media_type = "text/plain" if session.mode == "sampling" else "application/octet-stream"
+    return FileResponse(session.path, media_type=media_type, filename=Path(session.path).name)
+
+
+@router.get("/archive")
+async def archive_stats():
+    """Rows and disk usage of the per-item analysis archive."""
+    return await asyncio.to_thread(analysis_archive.stats)
+
+
+@router.post("/archive/reaggregate")
+async def reaggregate(
+    weights: AggregationWeights = AggregationWeights(),
+    start: Optional[datetime] = Query(default=None, description="UTC, inclusive"),
+    end: Optional[datetime] = Query(default=None, description="UTC, exclusive"),
+):
+    """Recompute archived cycles in a time range with alternative weights."""
+    started = time.perf_counter()
+    entries = await asyncio.to_thread(analysis_archive.reaggregate, start, end, weights)
+    return {
+        "weights": weights,
+        "cycles": len(entries),
+        "seconds": round(time.perf_counter() - started, 3),
+        "history": entries,
+    }
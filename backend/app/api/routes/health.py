@@ -1,5 +1,9 @@
 """Health check endpoints."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.warmup import warmup
 
 router = APIRouter()
 
@@ -12,6 +16,17 @@ async def health_check():
 
 @router.get("/ready")
 async def readiness_check():
-    """Check if the API is ready to serve requests."""
-    # TODO: Add database and model checks
-    return {"status": "ready"}
+    """Check if the API is ready to serve requests.
+
+    Returns 503 until history is loaded and the model is warm, so load
+    balancers only route to instances that answer at full speed.
+    """
+    if not warmup.ready:
+        return JSONResponse({"status": "starting", **warmup.status()}, status_code=503)
+    return {"status": "ready", **warmup.status()}
+
+
+@router.get("/metrics")
+async def metrics():
+    """Expose pipeline metrics in the Prometheus text format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -1,20 +1,28 @@
 """Sentiment API endpoints."""
-import asyncio
 import json
+import logging
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-
-from app.models.emotion import EmotionState, SourceSentiment
-from app.services.emotion_aggregator import EmotionAggregator
+from typing import Optional, Dict
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.cycle import cycle_coordinator
+from app.core.fanout import fanout
+from app.core.response_cache import response_cache
+from app.core.state_backend import state_backend
+from app.core.stream_protocol import StateUpdate, create_encoder, negotiate
+from app.core.warmup import warmup
+from app.models.emotion import EmotionState
 from app.services.history_store import history_store
+from app.services.topic_item_index import topic_item_index
+from app.services.watchlist import normalize_term, watchlist
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Store for connected WebSocket clients
-connected_clients: List[WebSocket] = []
+router = APIRouter()
 
-# Cache for current emotion state (in production, use Redis)
+# Current emotion state, kept in sync across workers by the state backend
 _current_emotion: Optional[EmotionState] = None
 _last_updated: Optional[datetime] = None
 
@@ -49,47 +57,86 @@ def get_current_emotion() -> EmotionState:
 
 
 def update_current_emotion(emotion: EmotionState):
-    """Update the current emotion state and notify WebSocket clients."""
+    """Update the current emotion state and notify clients of every worker."""
+    _apply_emotion(emotion)
+    state_backend.publish_nowait(
+        "emotion", emotion.model_dump_json(by_alias=True), key="emotion"
+    )
+
+
+def _apply_emotion(emotion: EmotionState):
     global _current_emotion, _last_updated
     _current_emotion = emotion
     _last_updated = datetime.utcnow()
+    response_cache.bump()
 
     # Notify connected clients
-    asyncio.create_task(broadcast_emotion(emotion))
+    broadcast_emotion(emotion)
 
 
-async def broadcast_emotion(emotion: EmotionState):
-    """Broadcast emotion update to all connected WebSocket clients."""
-    if not connected_clients:
-        return
+def restore_emotion(emotion: EmotionState, updated_at: datetime):
+    """Restore the emotion state saved before a restart."""
+    global _current_emotion, _last_updated
+    _current_emotion = emotion
+    _last_updated = updated_at
+    response_cache.bump()
 
-    message = emotion.model_dump_json(by_alias=True)
-    disconnected = []
 
-    for client in connected_clients:
-        try:
-            await client.send_text(message)
-        except Exception:
-            disconnected.append(client)
+def handle_state_message(channel: str, data: str):
+    """Apply a state change published by another worker."""
+    global _active_search_topic
+    if channel == "emotion":
+        _apply_emotion(EmotionState.model_validate_json(data))
+    elif channel == "search_topic":
+        _active_search_topic = data or None
 
-    # Remove disconnected clients
-    for client in disconnected:
-        connected_clients.remove(client)
+
+async def restore_state():
+    """Load the shared state published before this worker started."""
+    global _current_emotion, _last_updated, _active_search_topic
+    try:
+        emotion = await state_backend.get("emotion")
+        if emotion:
+            _current_emotion = EmotionState.model_validate_json(emotion)
+            _last_updated = datetime.utcnow()
+        _active_search_topic = await state_backend.get("search_topic") or None
+    except Exception as e:
+        logger.warning(f"Could not restore shared state: {e}")
+
+
+def broadcast_emotion(emotion: EmotionState):
+    """Queue an emotion update for every connected WebSocket client."""
+    if not len(fanout):
+        return
+    fanout.publish(StateUpdate(emotion))
 
 
 @router.get("/current", response_model=EmotionState)
-async def get_current_sentiment():
+async def get_current_sentiment(request: Request):
     """Get the current aggregated emotion state."""
-    return get_current_emotion()
+    return response_cache.respond(request, "current", get_current_emotion)
 
 
 @router.get("/history")
 async def get_sentiment_history(
+    request: Request,
     from_date: Optional[datetime] = Query(None, alias="from"),
     to_date: Optional[datetime] = Query(None, alias="to"),
     limit: int = Query(100, ge=1, le=1000),
 ):
     """Get historical sentiment data with topics."""
+    await history_store.ensure_loaded()
+    key = f"history:{from_date}:{to_date}:{limit}"
+    return response_cache.respond(
+        request, key, lambda: _build_history(from_date, to_date, limit)
+    )
+
+
+def _build_history(
+    from_date: Optional[datetime],
+    to_date: Optional[datetime],
+    limit: int,
+) -> Dict:
     # Default to last 24 hours if no date specified
     if from_date is None:
         from_date = datetime.utcnow() - timedelta(hours=24)
@@ -110,21 +157,139 @@ async def get_sentiment_history(
 
 @router.get("/topics")
 async def get_trending_topics(
+    request: Request,
     hours: int = Query(1, ge=1, le=24),
     limit: int = Query(10, ge=1, le=50),
+    sort: str = Query("mentions", pattern="^(mentions|burst)$"),
 ):
     """Get trending topics from recent sentiment analysis."""
-    topics = history_store.get_trending_topics(hours=hours, limit=limit)
+    await history_store.ensure_loaded()
+    return response_cache.respond(
+        request, f"topics:{hours}:{limit}:{sort}", lambda: _build_trending_topics(hours, limit, sort)
+    )
+
+
+def _cycle_timestamp() -> Optional[str]:
+    """Time of the latest cycle, which is what cached bodies reflect.
+
+    Cached bodies are rebuilt only when the state changes, so a request
+    time stamped into one would go stale between cycles.
+    """
+    latest = history_store.get_history(limit=1)
+    return latest[0]["timestamp"] if latest else None
+
+
+def _build_trending_topics(hours: int, limit: int, sort: str) -> Dict:
+    topics = history_store.get_trending_topics(hours=hours, limit=limit, sort=sort)
     return {
         "topics": topics,
         "hours": hours,
-        "timestamp": datetime.utcnow().isoformat(),
+        "sort": sort,
+        "timestamp": _cycle_timestamp(),
     }
 
 
+@router.get("/topics/heavy-hitters")
+async def get_heavy_hitter_topics(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Get long-running heavy-hitter topics tracked in fixed memory."""
+    await history_store.ensure_loaded()
+    return response_cache.respond(
+        request, f"topics/heavy-hitters:{limit}", lambda: _build_heavy_hitters(limit)
+    )
+
+
+def _build_heavy_hitters(limit: int) -> Dict:
+    topics = history_store.get_heavy_hitters(limit=limit)
+    tracker = history_store.topic_tracker
+    return {
+        "topics": topics,
+        "halfLifeHours": tracker.half_life_hours,
+        "epsilon": tracker.sketch.epsilon,
+        "delta": tracker.sketch.delta,
+        "timestamp": _cycle_timestamp(),
+    }
+
+
+@router.get("/topics/{topic}/items")
+async def get_topic_items(
+    topic: str,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Get the recent posts behind a topic, highest scoring first."""
+    items = topic_item_index.top_items(topic, limit=limit)
+    return {
+        "topic": topic.lower().strip(),
+        "items": items,
+        "count": len(items),
+    }
+
+
+@router.get("/watchlist")
+async def get_watchlist(request: Request):
+    """Get watched terms with their latest emotion reading."""
+    # Keyed by revision, as terms may change on another worker
+    return response_cache.respond(request, f"watchlist@{watchlist.revision}", _build_watchlist)
+
+
+def _build_watchlist() -> Dict:
+    terms = watchlist.get_terms()
+    return {
+        "terms": terms,
+        "count": len(terms),
+    }
+
+
+@router.post("/watchlist")
+async def add_watchlist_term(term: str = Query(..., min_length=2, max_length=100)):
+    """Start tracking a term in every scheduled scrape."""
+    try:
+        added = watchlist.add_term(term)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    response_cache.bump()
+    return {"status": "added" if added else "exists", "term": normalize_term(term)}
+
+
+@router.delete("/watchlist/{term}")
+async def remove_watchlist_term(term: str):
+    """Stop tracking a term and drop its series."""
+    if not watchlist.remove_term(term):
+        raise HTTPException(status_code=404, detail="Term not in watchlist")
+
+    response_cache.bump()
+    return {"status": "removed", "term": normalize_term(term)}
+
+
+@router.get("/watchlist/{term}/series")
+async def get_watchlist_series(
+    request: Request,
+    term: str,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Get the emotion time series of a watched term."""
+    if term not in watchlist:
+        raise HTTPException(status_code=404, detail="Term not in watchlist")
+
+    term = normalize_term(term)
+    return response_cache.respond(
+        request,
+        f"watchlist/{term}/series:{limit}@{watchlist.revision}",
+        lambda: {"term": term, "series": watchlist.get_series(term, limit=limit)},
+    )
+
+
 @router.get("/current/detailed")
-async def get_current_sentiment_detailed():
+async def get_current_sentiment_detailed(request: Request):
     """Get current emotion state with topics."""
+    await history_store.ensure_loaded()
+    return response_cache.respond(request, "current/detailed", _build_current_detailed)
+
+
+def _build_current_detailed() -> Dict:
     emotion = get_current_emotion()
 
     # Get recent topics from history
@@ -134,23 +299,27 @@ async def get_current_sentiment_detailed():
     return {
         "emotion": emotion.model_dump(by_alias=True),
         "topics": topics,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _cycle_timestamp(),
     }
 
 
 @router.get("/sources")
-async def get_sentiment_by_source():
+async def get_sentiment_by_source(request: Request):
     """Get sentiment breakdown by source."""
+    return response_cache.respond(request, "sources", _build_sources)
+
+
+def _build_sources() -> Dict:
     current = get_current_emotion()
 
-    # Generate per-source states (mock data for now)
+    # Generate per-source states (mock data for now), as of the current state
     sources = {
         "reddit": EmotionState(
             happiness=0.35,
             sadness=0.15,
             anger=0.2,
             overall_sentiment=0.15,
-            timestamp=datetime.utcnow(),
+            timestamp=current.timestamp,
         ),
         "hackernews": EmotionState(
             happiness=0.25,
@@ -158,7 +327,7 @@ async def get_sentiment_by_source():
             anger=0.1,
             surprise=0.3,
             overall_sentiment=0.25,
-            timestamp=datetime.utcnow(),
+            timestamp=current.timestamp,
         ),
         "rss": EmotionState(
             happiness=0.3,
@@ -166,7 +335,7 @@ async def get_sentiment_by_source():
             anger=0.15,
             fear=0.1,
             overall_sentiment=0.1,
-            timestamp=datetime.utcnow(),
+            timestamp=current.timestamp,
         ),
     }
 
@@ -177,15 +346,25 @@ async def get_sentiment_by_source():
 
 
 @router.websocket("/stream")
-async def sentiment_stream(websocket: WebSocket):
-    """WebSocket endpoint for real-time sentiment updates."""
-    await websocket.accept()
-    connected_clients.append(websocket)
+async def sentiment_stream(
+    websocket: WebSocket,
+    protocol: Optional[str] = Query(None, pattern="^(json|delta|binary)$"),
+):
+    """WebSocket endpoint for real-time sentiment updates.
+
+    Sends full JSON states by default; `protocol=delta|binary` (or the
+    sentiment.delta.v1 / sentiment.binary.v1 subprotocols) switches to a
+    keyframe followed by compact deltas. See app.core.stream_protocol.
+    """
+    encoding, subprotocol = negotiate(protocol, websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    client = fanout.register(
+        websocket, create_encoder(encoding, settings.ws_keyframe_interval)
+    )
 
     try:
         # Send current state immediately
-        current = get_current_emotion()
-        await websocket.send_text(current.model_dump_json(by_alias=True))
+        client.offer(StateUpdate(get_current_emotion()))
 
         # Keep connection alive
         while True:
@@ -195,16 +374,13 @@ async def sentiment_stream(websocket: WebSocket):
             except WebSocketDisconnect:
                 break
     finally:
-        if websocket in connected_clients:
-            connected_clients.remove(websocket)
+        fanout.unregister(client)
 
 
 @router.post("/refresh")
 async def refresh_sentiment():
-    """Manually trigger sentiment aggregation."""
-    aggregator = EmotionAggregator()
-    emotion = await aggregator.aggregate_all()
-    update_current_emotion(emotion)
+    """Manually trigger sentiment aggregation, joining a cycle already running."""
+    emotion = await cycle_coordinator.run()
     return {"status": "refreshed", "emotion": emotion.model_dump(by_alias=True)}
 
 
@@ -221,17 +397,21 @@ def set_active_search_topic(topic: Optional[str]):
     """Set the active search topic."""
     global _active_search_topic
     _active_search_topic = topic
+    state_backend.publish_nowait("search_topic", topic or "", key="search_topic")
 
 
 @router.post("/search")
 async def search_topic(query: str = Query(..., min_length=2, max_length=100)):
     """Search and analyze sentiment for a specific topic."""
+    from app.services.search_cache import search_cache
     from app.services.topic_searcher import TopicSearcher
 
     set_active_search_topic(query.lower())
 
+    # Identical searches share one computation and reuse recent results
+    await warmup.wait()
     searcher = TopicSearcher()
-    result = await searcher.search_topic(query)
+    result = await search_cache.get(query, searcher.search_topic)
 
     # Update current emotion with search results
     if result.get("emotion"):
@@ -241,6 +421,50 @@ async def search_topic(query: str = Query(..., min_length=2, max_length=100)):
     return result
 
 
+@router.get("/search/stream")
+async def stream_search_topic(query: str = Query(..., min_length=2, max_length=100)):
+    """Search a topic as Server-Sent Events.
+
+    Emits a "partial" event with the emotion estimate so far as local
+    results and each news source come in, then a final "result" event
+    with the same body as POST /search. A cached result, or a search for
+    the same query already running, yields only the "result" event.
+    """
+    from app.services.search_cache import search_cache
+    from app.services.topic_searcher import TopicSearcher
+
+    set_active_search_topic(query.lower())
+
+    async def search(key: str):
+        await warmup.wait()
+        async for event in TopicSearcher().search_topic_stream(key):
+            yield event
+
+    async def events():
+        # Shares the cache and in-flight searches with POST /search
+        result: Dict = {}
+        async for event in search_cache.stream(query, search):
+            if event["event"] == "result":
+                result = event["data"]
+            else:
+                yield _sse(event["event"], event["data"])
+
+        if result.get("emotion"):
+            update_current_emotion(EmotionState(**result["emotion"]))
+        yield _sse("result", result)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: Dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
 @router.delete("/search")
 async def clear_search():
     """Clear the active search topic."""
@@ -258,8 +482,13 @@ async def get_search_status():
 
 
 @router.get("/emotion-topics")
-async def get_emotion_topics():
+async def get_emotion_topics(request: Request):
     """Get topics associated with each emotion from recent history."""
+    await history_store.ensure_loaded()
+    return response_cache.respond(request, "emotion-topics", _build_emotion_topics)
+
+
+def _build_emotion_topics() -> Dict:
     # Get recent history entries
     recent = history_store.get_history(limit=50)
 
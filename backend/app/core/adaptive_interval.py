@@ -0,0 +1,68 @@
+"""Adaptive scrape interval driven by cycle cost and how much changed."""
+import math
+from typing import List, Optional
+
+from app.models.emotion import EmotionState
+
+
+class AdaptiveInterval:
+    """Picks the next scrape interval from the last cycle's measurements.
+
+    A cycle's activity is how far its share of new items and the movement
+    of the emotion vector went past their targets. Busy cycles shorten the
+    interval in proportion to their activity; quiet ones stretch it by
+    `stretch`. The interval never drops below `duration / max_duty`, so
+    scraping takes at most that share of wall time, and always stays
+    within [min_seconds, max_seconds].
+    """
+
+    def __init__(
+        self,
+        base_seconds: float,
+        min_seconds: float,
+        max_seconds: float,
+        target_new_fraction: float = 0.2,
+        target_movement: float = 0.05,
+        stretch: float = 1.25,
+        max_duty: float = 0.5,
+    ):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.target_new_fraction = target_new_fraction
+        self.target_movement = target_movement
+        self.stretch = stretch
+        self.max_duty = max_duty
+        self.seconds = self._clamp(base_seconds)
+        self.activity = 0.0
+        self._last_vector: Optional[List[float]] = None
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_seconds, max(self.min_seconds, seconds))
+
+    def observe(self, duration: float, new_fraction: float, emotion: EmotionState) -> float:
+        """Fold in one cycle's measurements and return the next interval."""
+        vector = [
+            emotion.happiness,
+            emotion.sadness,
+            emotion.anger,
+            emotion.fear,
+            emotion.surprise,
+            emotion.disgust,
+            emotion.overall_sentiment,
+        ]
+        movement = math.dist(vector, self._last_vector) if self._last_vector else 0.0
+        self._last_vector = vector
+
+        self.activity = max(
+            new_fraction / self.target_new_fraction,
+            movement / self.target_movement,
+        )
+        if self.activity >= 1.0:
+            seconds = self.seconds / min(self.activity, 4.0)
+        elif self.activity < 0.5:
+            seconds = self.seconds * self.stretch
+        else:
+            seconds = self.seconds
+
+        self.seconds = self._clamp(max(seconds, duration / self.max_duty))
+        return self.seconds
@@ -25,11 +25,88 @@ class Settings(BaseSettings):
     # Scraping settings
     scrape_interval_minutes: int = 5
     scrape_interval_seconds: int = 30  # Takes priority over minutes if set
+    scrape_schedule: str = "fixed"  # "adaptive" adjusts the interval each cycle
+    scrape_interval_min_seconds: int = 10
+    scrape_interval_max_seconds: int = 300
     max_posts_per_source: int = 100
 
     # Sentiment analysis
     sentiment_model: str = "cardiffnlp/twitter-roberta-base-emotion"
     emotion_model: str = "j-hartmann/emotion-english-distilroberta-base"
+    preload_model: bool = True  # Load and warm the model in the background at startup
+    warmup_batch_size: int = 8
+    compile_model: bool = False  # torch.compile the model during warmup
+
+    # Topic tracking (heavy hitters in fixed memory)
+    topic_tracker_capacity: int = 200
+    topic_sketch_width: int = 2048
+    topic_sketch_depth: int = 4
+    topic_decay_half_life_hours: float = 6.0
+
+    # Burst detection (EW baseline smoothing per cycle)
+    burst_alpha: float = 0.05
+
+    # Topic drill-down (topic -> recent items)
+    topic_items_window_hours: int = 6
+    topic_items_per_topic: int = 100
+
+    # Topic search cache (fresh TTL, then served stale while refreshing)
+    search_cache_ttl_seconds: int = 60
+    search_cache_stale_seconds: int = 600
+
+    # Local full-text index (searches go remote below min results)
+    content_index_max_documents: int = 20000
+    content_index_retention_hours: int = 48
+    local_search_min_results: int = 20
+    local_search_limit: int = 60
+
+    # Watchlist (terms matched against every scrape)
+    watchlist_max_terms: int = 500
+    watchlist_max_points: int = 1000
+
+    # WebSocket fan-out (per-client queue, oldest dropped when full)
+    ws_queue_size: int = 4
+    ws_send_timeout_seconds: float = 5.0
+    ws_keyframe_interval: int = 20
+
+    # Shared state across workers: memory, local (single host) or redis
+    state_backend: str = "memory"
+    state_dir: str = "/tmp/sentiment_face"
+    redis_url: str = "redis://localhost:6379/0"
+    state_key_prefix: str = "sentiment_face"
+
+    # Scheduler leader election: file (single host), postgres or none; auto
+    # picks file with a shared state backend and none with memory
+    leader_election: str = "auto"
+    leader_retry_seconds: float = 2.0
+    leader_lock_id: int = 7314001
+
+    # Runtime snapshot for warm restarts (written by the scheduler leader)
+    snapshot_enabled: bool = True
+    snapshot_interval_seconds: int = 300
+    snapshot_max_items: int = 5000
+    snapshot_max_age_hours: int = 24
+
+    # Per-item analysis archive (columnar day segments, for re-aggregation)
+    archive_enabled: bool = True
+    archive_retention_days: int = 7
+
+    # Tracing (recent traces in memory; optional JSONL file and OTLP/HTTP export)
+    tracing_enabled: bool = True
+    trace_buffer_size: int = 50
+    trace_jsonl_path: str = ""
+    otlp_endpoint: str = ""
+
+    # Admin endpoints are disabled unless a token is set
+    admin_token: str = ""
+
+    # On-demand profiles (collapsed stacks or pstats files)
+    profile_dir: str = "/tmp/sentiment_face/profiles"
+    profile_max_count: int = 100
+
+    # Flutter web build (manifest and precompressed .br/.gz built at startup)
+    static_precompress: bool = True
+    static_min_compress_bytes: int = 1024
 
     class Config:
         env_file = ".env"
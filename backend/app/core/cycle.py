@@ -0,0 +1,74 @@
+"""Coordinates aggregation cycles so at most one runs at a time."""
+import time
+from typing import List
+
+from app.core.metrics import AGGREGATION_DURATION
+from app.core.profiler import CYCLE_TARGET, profiler
+from app.core.singleflight import SingleFlight
+from app.core.tracing import tracer
+from app.core.warmup import warmup
+from app.models.emotion import EmotionState
+
+_CYCLE_KEY = "aggregation"
+
+
+class CycleCoordinator:
+    """Runs scrape-and-analyze cycles one at a time.
+
+    Callers that arrive while a cycle is running (a manual refresh during
+    a scheduled run, or several refreshes at once) join it and get its
+    result. One aggregator is shared across cycles, so scraper state such
+    as OAuth tokens survives between runs.
+    """
+
+    def __init__(self):
+        self._flight = SingleFlight()
+        self._aggregator = None
+        self.cycles = 0
+        self.joined = 0
+        self.last_duration = 0.0
+        self.last_new_fraction = 0.0
+
+    @property
+    def scrapers(self) -> List:
+        """The aggregator's scrapers, once the first cycle has created them."""
+        return self._aggregator.scrapers if self._aggregator is not None else []
+
+    @property
+    def running(self) -> bool:
+        """Check whether a cycle is in flight."""
+        return self._flight.in_flight(_CYCLE_KEY)
+
+    async def run(self) -> EmotionState:
+        """Run a cycle, or join the one in flight, and return its result."""
+        if self.running:
+            self.joined += 1
+        return await self._flight.do(_CYCLE_KEY, self._run_cycle)
+
+    async def _run_cycle(self) -> EmotionState:
+        from app.api.routes.sentiment import update_current_emotion
+        from app.services.emotion_aggregator import EmotionAggregator
+
+        if self._aggregator is None:
+            from app.core.snapshot import runtime_snapshot
+
+            # Don't load the model on the event loop while startup is loading it
+            await warmup.wait()
+            self._aggregator = EmotionAggregator()
+            runtime_snapshot.restore_scrapers(self._aggregator.scrapers)
+
+        self.cycles += 1
+        with tracer.trace("aggregation_cycle", cycle=self.cycles), profiler.capture(CYCLE_TARGET):
+            started = time.monotonic()
+            emotion = await self._aggregator.aggregate_all()
+            self.last_duration = time.monotonic() - started
+            AGGREGATION_DURATION.observe(self.last_duration)
+            self.last_new_fraction = self._aggregator.last_new_fraction
+
+            with tracer.span("broadcast"):
+                update_current_emotion(emotion)
+        return emotion
+
+
+# Global instance
+cycle_coordinator = CycleCoordinator()
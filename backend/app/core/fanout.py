@@ -0,0 +1,125 @@
+"""Non-blocking WebSocket fan-out with a bounded send queue per client."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Optional, Set
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.core.metrics import WS_BROADCAST_LATENCY, WS_CLIENTS, WS_DROPPED, WS_EVICTED
+
+logger = logging.getLogger(__name__)
+
+
+class ClientConnection:
+    """One WebSocket client with its own outbound queue and writer task.
+
+    The queue holds at most `queue_size` messages. When a slow client
+    falls behind, the oldest queued messages are dropped, so the client
+    always catches up to the latest state instead of replaying a backlog.
+
+    Messages are encoded by the client's `encoder` when they are sent, so
+    each client can use its own wire format. Without an encoder, messages
+    are sent as they are. An encoder may return None to skip a message.
+    """
+
+    def __init__(self, websocket: WebSocket, queue_size: int, encoder: Optional[Any] = None):
+        self.websocket = websocket
+        self.encoder = encoder
+        self.queue: Deque[Any] = deque(maxlen=queue_size)
+        self.dropped = 0
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def offer(self, message: Any, published_at: Optional[float] = None):
+        """Queue a message without waiting, dropping the oldest if full."""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+            WS_DROPPED.inc()
+        self.queue.append((published_at or time.perf_counter(), message))
+        self._ready.set()
+
+
+class FanOut:
+    """Broadcasts messages to WebSocket clients without awaiting any of them.
+
+    `publish` only appends to each client's queue, so its cost does not
+    depend on how fast clients read. A writer task per client drains its
+    queue; a send that takes longer than `send_timeout` or fails evicts
+    the client.
+    """
+
+    def __init__(self, queue_size: int = 4, send_timeout: float = 5.0):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self._clients: Set[ClientConnection] = set()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def register(self, websocket: WebSocket, encoder: Optional[Any] = None) -> ClientConnection:
+        """Start fanning out to an accepted WebSocket."""
+        client = ClientConnection(websocket, self.queue_size, encoder)
+        client._writer = asyncio.create_task(self._write(client))
+        self._clients.add(client)
+        return client
+
+    def unregister(self, client: ClientConnection):
+        """Stop fanning out to a client and cancel its writer."""
+        self._clients.discard(client)
+        if client._writer is not None and client._writer is not asyncio.current_task():
+            client._writer.cancel()
+
+    def publish(self, message: Any):
+        """Queue a message for every connected client."""
+        published_at = time.perf_counter()
+        for client in self._clients:
+            client.offer(message, published_at)
+
+    async def _write(self, client: ClientConnection):
+        """Drain one client's queue until it disconnects or is evicted."""
+        try:
+            while True:
+                await client._ready.wait()
+                client._ready.clear()
+
+                while client.queue:
+                    published_at, message = client.queue.popleft()
+                    payload = client.encoder.encode(message) if client.encoder else message
+                    if payload is None:
+                        continue
+
+                    if isinstance(payload, bytes):
+                        send = client.websocket.send_bytes(payload)
+                    else:
+                        send = client.websocket.send_text(payload)
+                    await asyncio.wait_for(send, timeout=self.send_timeout)
+                    WS_BROADCAST_LATENCY.observe(time.perf_counter() - published_at)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"Evicting WebSocket client after {self.send_timeout}s send timeout")
+            await self._evict(client)
+        except Exception as e:
+            logger.debug(f"WebSocket send failed: {e}")
+            await self._evict(client)
+
+    async def _evict(self, client: ClientConnection):
+        self.evicted += 1
+        WS_EVICTED.inc()
+        self.unregister(client)
+        try:
+            await asyncio.wait_for(client.websocket.close(code=1013), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+
+# Global instance
+fanout = FanOut(
+    queue_size=settings.ws_queue_size,
+    send_timeout=settings.ws_send_timeout_seconds,
+)
+WS_CLIENTS.set_function(lambda: len(fanout))
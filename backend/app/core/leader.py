@@ -0,0 +1,186 @@
+"""Leader election so only one worker runs the aggregation job.
+
+- ``file``: an exclusive flock on a file in `state_dir`, for workers on
+  one host. The kernel releases it when the holder exits or crashes.
+- ``postgres``: a session-level advisory lock on `database_url`, for
+  replicas sharing a database. It is released when the session ends.
+- ``none``: every worker considers itself leader.
+- ``auto``: ``file`` with a shared state backend, ``none`` without.
+
+Followers only see the leader's cycles through the state backend, so an
+election is refused (falling back to ``none``) while state stays in
+process memory: every worker then aggregates for itself.
+
+Followers retry every `leader_retry_seconds`, so a new leader takes over
+within that interval of the old one going away.
+"""
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# State backends that carry the leader's updates to other processes
+SHARED_STATE_BACKENDS = ("local", "redis")
+
+
+class LeaderElector:
+    """Keeps trying to become leader and tracks whether it is one."""
+
+    def __init__(self, retry_seconds: float = 2.0):
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        self._attempts = 0
+        self._callbacks: List[Callable[[bool], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def on_elected(self, callback: Callable[[bool], None]):
+        """Call `callback` whenever this worker becomes leader.
+
+        The callback gets True when taking over after having been a
+        follower, and False when elected on the first attempt at startup.
+        """
+        self._callbacks.append(callback)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.is_leader:
+            self.is_leader = False
+            await self._release()
+
+    async def _run(self):
+        while True:
+            try:
+                if self.is_leader:
+                    if not await self._still_held():
+                        self.is_leader = False
+                        logger.warning("Lost scheduler leadership")
+                else:
+                    self._attempts += 1
+                    if await self._try_acquire():
+                        self.is_leader = True
+                        logger.info(f"Elected scheduler leader (pid {os.getpid()})")
+                        for callback in self._callbacks:
+                            callback(self._attempts > 1)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.is_leader = False
+                logger.error(f"Leader election failed: {e}")
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _try_acquire(self) -> bool:
+        return True
+
+    async def _still_held(self) -> bool:
+        return True
+
+    async def _release(self):
+        pass
+
+
+class FileLockElector(LeaderElector):
+    """Leader is whichever process holds an exclusive flock on `path`."""
+
+    def __init__(self, path: str, retry_seconds: float = 2.0):
+        super().__init__(retry_seconds)
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    async def _try_acquire(self) -> bool:
+        import fcntl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    async def _release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class PostgresElector(LeaderElector):
+    """Leader is whichever session holds a Postgres advisory lock."""
+
+    def __init__(self, dsn: str, lock_id: int, retry_seconds: float = 2.0):
+        super().__init__(retry_seconds)
+        # asyncpg takes plain postgresql:// URLs
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self.lock_id = lock_id
+        self._conn = None
+
+    async def _try_acquire(self) -> bool:
+        import asyncpg
+
+        if self._conn is None or self._conn.is_closed():
+            self._conn = await asyncpg.connect(self.dsn, timeout=self.retry_seconds * 2)
+        return await self._conn.fetchval("SELECT pg_try_advisory_lock($1)", self.lock_id)
+
+    async def _still_held(self) -> bool:
+        # The lock lives as long as the session, so check the session
+        try:
+            await asyncio.wait_for(self._conn.fetchval("SELECT 1"), timeout=self.retry_seconds)
+            return True
+        except Exception:
+            await self._release()
+            return False
+
+    async def _release(self):
+        if self._conn is not None:
+            try:
+                await self._conn.close(timeout=self.retry_seconds)
+            except Exception:
+                self._conn.terminate()
+            self._conn = None
+
+
+def create_leader_elector(mode: str, state_backend: str = "memory") -> LeaderElector:
+    """Create the configured leader elector for the given state backend."""
+    shared_state = state_backend in SHARED_STATE_BACKENDS
+    if mode == "auto":
+        mode = "file" if shared_state else "none"
+    elif mode in ("file", "postgres") and not shared_state:
+        logger.error(
+            f"Leader election '{mode}' needs a shared state backend (local or redis), "
+            f"but state_backend is '{state_backend}'; followers would never receive "
+            "the leader's updates. Every worker will aggregate for itself instead."
+        )
+        mode = "none"
+
+    if mode == "file":
+        return FileLockElector(
+            os.path.join(settings.state_dir, "scheduler.lock"),
+            retry_seconds=settings.leader_retry_seconds,
+        )
+    if mode == "postgres":
+        return PostgresElector(
+            settings.database_url,
+            lock_id=settings.leader_lock_id,
+            retry_seconds=settings.leader_retry_seconds,
+        )
+    if mode != "none":
+        logger.warning(f"Unknown leader election mode '{mode}', using none")
+    return LeaderElector(retry_seconds=settings.leader_retry_seconds)
+
+
+# Global instance
+leader_elector = create_leader_elector(settings.leader_election, settings.state_backend)
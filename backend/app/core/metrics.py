@@ -0,0 +1,271 @@
+"""Minimal Prometheus-style metrics with text exposition.
+
+Metric objects are created once at import time and labelled children are
+cached, so recording a value is a dict lookup and a float update with no
+locks; the service runs on one event loop, and plain attribute updates
+are atomic under the GIL.
+"""
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds; covers fast cache hits through slow scrape cycles
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+        registry.register(self)
+
+    def labels(self, *values: str):
+        """Get the child for a set of label values, creating it once."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child holding the values of one set of labels."""
+        pass
+
+    @abstractmethod
+    def _samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Samples of an unlabelled metric as (name, extra labels, value)."""
+        pass
+
+    def collect(self) -> List[Tuple[str, Dict[str, str], float]]:
+        if not self.labelnames:
+            return self._samples()
+        samples = []
+        for values, child in self._children.items():
+            labels = dict(zip(self.labelnames, values))
+            for name, extra, value in child._samples():
+                samples.append((name, {**labels, **extra}, value))
+        return samples
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.value = 0.0
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> "_CounterChild":
+        return _CounterChild(self.name)
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def _samples(self):
+        return [(f"{self.name}_total", {}, self.value)]
+
+
+class _CounterChild:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def _samples(self):
+        return [(f"{self.name}_total", {}, self.value)]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        super().__init__(name, documentation, labelnames)
+
+    def set(self, value: float):
+        self.value = value
+
+    def _new_child(self) -> "_GaugeChild":
+        return _GaugeChild(self.name)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from `function` at scrape time."""
+        self._function = function
+
+    def _samples(self):
+        value = self._function() if self._function is not None else self.value
+        return [(self.name, {}, value)]
+
+
+class _GaugeChild:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def _samples(self):
+        return [(self.name, {}, self.value)]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(buckets)
+        self._state = _HistogramChild(name, self.buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> "_HistogramChild":
+        return _HistogramChild(self.name, self.buckets)
+
+    def observe(self, value: float):
+        self._state.observe(value)
+
+    def _samples(self):
+        return self._state._samples()
+
+
+class _HistogramChild:
+    __slots__ = ("name", "buckets", "counts", "sum", "count")
+
+    def __init__(self, name: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def _samples(self):
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            samples.append((f"{self.name}_bucket", {"le": _format(bound)}, cumulative))
+        samples.append((f"{self.name}_bucket", {"le": "+Inf"}, self.count))
+        samples.append((f"{self.name}_sum", {}, self.sum))
+        samples.append((f"{self.name}_count", {}, self.count))
+        return samples
+
+
+class Registry:
+    """Collects metrics and renders the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.collect():
+                if labels:
+                    label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {_format(value)}")
+                else:
+                    lines.append(f"{name} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def http_status_hooks(source: str) -> Dict[str, list]:
+    """httpx event hooks counting a scraper's responses by status code."""
+    async def record(response):
+        SCRAPE_HTTP_RESPONSES.labels(source, str(response.status_code)).inc()
+    return {"response": [record]}
+
+
+registry = Registry()
+
+# Scraping
+SCRAPE_DURATION = Histogram(
+    "sentiment_scrape_duration_seconds", "Time to scrape one source", ["source"]
+)
+SCRAPE_ITEMS = Counter("sentiment_scrape_items", "Items scraped", ["source"])
+SCRAPE_ERRORS = Counter("sentiment_scrape_errors", "Scrapes that raised", ["source"])
+SCRAPE_HTTP_RESPONSES = Counter(
+    "sentiment_scrape_http_responses", "HTTP responses received by scrapers", ["source", "status"]
+)
+
+# Inference
+INFERENCE_DURATION = Histogram(
+    "sentiment_inference_batch_duration_seconds", "Time to analyze one batch"
+)
+INFERENCE_QUEUE_WAIT = Histogram(
+    "sentiment_inference_queue_wait_seconds", "Time waiting for the model before inference starts"
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "sentiment_inference_batch_size", "Texts per analyzed batch",
+    buckets=(1, 5, 10, 25, 50, 100, 150, 250, 500),
+)
+INFERENCE_ITEMS = Counter("sentiment_inference_items", "Texts analyzed")
+INFERENCE_CHARS = Counter("sentiment_inference_chars", "Model input characters analyzed, after truncation")
+INFERENCE_FALLBACK = Counter("sentiment_inference_fallback_items", "Texts analyzed by the keyword fallback")
+
+# Aggregation and persistence
+AGGREGATION_DURATION = Histogram(
+    "sentiment_aggregation_duration_seconds", "Duration of a full aggregation cycle"
+)
+HISTORY_WRITE_DURATION = Histogram(
+    "sentiment_history_write_duration_seconds", "Time to persist the history file"
+)
+
+# WebSocket fan-out
+WS_CLIENTS = Gauge("sentiment_websocket_clients", "Connected WebSocket clients")
+WS_BROADCAST_LATENCY = Histogram(
+    "sentiment_websocket_broadcast_latency_seconds", "Time from publish to a client's send completing"
+)
+WS_DROPPED = Counter("sentiment_websocket_dropped_messages", "Messages dropped for slow clients")
+WS_EVICTED = Counter("sentiment_websocket_evictions", "Clients evicted for slow or failed sends")
+
+# Caches
+CACHE_REQUESTS = Counter(
+    "sentiment_cache_requests", "Cache lookups by cache and result", ["cache", "result"]
+)
@@ -0,0 +1,257 @@
+"""On-demand profiling of aggregation cycles and API routes.
+
+An admin arms a session for the next N aggregation cycles (target
+"cycle") or requests to one route path. While nothing is armed, call
+sites get a shared no-op context manager, so profiling costs nothing
+when off. Two modes are supported:
+
+- "sampling": a background thread samples the event loop thread's stack
+  and writes collapsed stacks (flamegraph.pl / speedscope input).
+- "cprofile": deterministic cProfile, written as a pstats file.
+
+The loop runs other coroutines while a profiled cycle or request awaits,
+so captures include whatever else ran on the loop in that window.
+"""
+import cProfile
+import logging
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("sampling", "cprofile")
+CYCLE_TARGET = "cycle"
+
+_NOOP = nullcontext()
+
+
+@dataclass
+class ProfileSession:
+    """One armed or finished capture."""
+
+    id: str
+    mode: str
+    target: str
+    count: int
+    interval: float
+    created_at: float
+    completed: int = 0
+    status: str = "armed"  # armed, running, done, stopped
+    path: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "target": self.target,
+            "count": self.count,
+            "completed": self.completed,
+            "intervalMs": round(self.interval * 1000, 3),
+            "createdAt": self.created_at,
+            "status": self.status,
+            "ready": self.path is not None,
+        }
+
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval while active."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.active = False
+        self.samples = 0
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.active:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            with self._lock:
+                self._counts[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def write(self, path: Path):
+        with self._lock:
+            lines = [f"{stack} {count}" for stack, count in self._counts.most_common()]
+        path.write_text("\n".join(lines) + "\n")
+
+
+_ROOT = str(Path(__file__).resolve().parents[2]) + "/"
+
+
+def _short_path(filename: str) -> str:
+    """Trim a source path to be relative to the backend or site-packages."""
+    if filename.startswith(_ROOT):
+        return filename[len(_ROOT):]
+    index = filename.rfind("site-packages/")
+    return filename[index + len("site-packages/"):] if index != -1 else filename
+
+
+class Profiler:
+    """Arms at most one profiling session at a time."""
+
+    def __init__(self, output_dir: str, history: int = 20):
+        self.output_dir = Path(output_dir)
+        self.session: Optional[ProfileSession] = None
+        self._finished: Deque[ProfileSession] = deque(maxlen=history)
+        self._depth = 0
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+
+    def start(self, mode: str, target: str, count: int, interval_ms: float = 10.0) -> ProfileSession:
+        """Arm a session for the next `count` cycles or requests to `target`.
+
+        Must be called from the event loop thread, which is the one sampled.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'")
+        if target != CYCLE_TARGET and not target.startswith("/"):
+            raise ValueError("Target must be 'cycle' or a route path starting with '/'")
+        if self.session is not None:
+            raise RuntimeError(f"Profiling session {self.session.id} is already armed")
+
+        session = ProfileSession(
+            id=secrets.token_hex(6),
+            mode=mode,
+            target=target,
+            count=count,
+            interval=interval_ms / 1000,
+            created_at=time.time(),
+        )
+        if mode == "sampling":
+            self._sampler = StackSampler(threading.get_ident(), session.interval)
+            self._sampler.start()
+        else:
+            self._cprofile = cProfile.Profile()
+        self.session = session
+        logger.info(f"Profiling session {session.id} armed: {mode} for {count} x {target}")
+        return session
+
+    def stop(self) -> Optional[ProfileSession]:
+        """Finish the armed session early with whatever it captured."""
+        session = self.session
+        if session is None:
+            return None
+        if self._depth:
+            self._pause()
+            self._depth = 0
+        self._finish(session, "stopped")
+        return session
+
+    def capture(self, target: str):
+        """Context manager profiling a block if a session targets it."""
+        session = self.session
+        if session is None or session.target != target:
+            return _NOOP
+        if session.completed + self._depth >= session.count:
+            # Enough windows are open to finish the session
+            return _NOOP
+        return self._capture(session)
+
+    @contextmanager
+    def _capture(self, session: ProfileSession):
+        self._depth += 1
+        if self._depth == 1:
+            session.status = "running"
+            self._resume()
+        try:
+            yield
+        finally:
+            if self.session is session:
+                self._depth -= 1
+                session.completed += 1
+                if self._depth == 0:
+                    self._pause()
+                    if session.completed >= session.count:
+                        self._finish(session, "done")
+
+    def _resume(self):
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        if self._sampler is not None:
+            self._sampler.active = True
+
+    def _pause(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.active = False
+
+    def _finish(self, session: ProfileSession, status: str):
+        session.status = status
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            if self._cprofile is not None:
+                path = self.output_dir / f"{session.id}.pstats"
+                self._cprofile.dump_stats(str(path))
+            else:
+                path = self.output_dir / f"{session.id}.collapsed"
+                self._sampler.stop()
+                self._sampler.write(path)
+            session.path = str(path)
+        except Exception as e:
+            logger.error(f"Failed to write profile {session.id}: {e}")
+
+        self.session = None
+        self._cprofile = None
+        self._sampler = None
+        self._finished.append(session)
+        logger.info(f"Profiling session {session.id} {status} after {session.completed} x {session.target}")
+
+    def sessions(self) -> List[Dict]:
+        """The armed session (if any) and recent finished ones, newest first."""
+        sessions = list(self._finished)[::-1]
+        if self.session is not None:
+            sessions.insert(0, self.session)
+        return [session.to_dict() for session in sessions]
+
+    def get(self, session_id: str) -> Optional[ProfileSession]:
+        for session in self._finished:
+            if session.id == session_id:
+                return session
+        return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests to the armed route path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or profiler.session is None:
+            await self.app(scope, receive, send)
+            return
+        with profiler.capture(scope["path"]):
+            await self.app(scope, receive, send)
+
+
+# Global instance
+profiler = Profiler(settings.profile_dir)
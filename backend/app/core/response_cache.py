@@ -0,0 +1,105 @@
+"""Generation-versioned cache of pre-serialized API responses."""
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.metrics import CACHE_REQUESTS
+
+_HITS = CACHE_REQUESTS.labels("response", "hit")
+_MISSES = CACHE_REQUESTS.labels("response", "miss")
+
+
+@dataclass
+class CachedBody:
+    """A response body encoded once per state generation."""
+
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+
+
+class ResponseCache:
+    """Caches encoded JSON bodies until the application state changes.
+
+    Readers key entries by route and query parameters. Any state change
+    (a new aggregation result or history entry) calls `bump()`, which
+    advances the generation and drops every cached body, so a cached
+    response is never older than the state it was built from.
+    """
+
+    def __init__(self, max_entries: int = 256, gzip_min_size: int = 1024):
+        self.max_entries = max_entries
+        self.gzip_min_size = gzip_min_size
+        self.generation = 0
+        self._entries: "OrderedDict[str, CachedBody]" = OrderedDict()
+
+    def bump(self):
+        """Advance the state generation and invalidate cached bodies."""
+        self.generation += 1
+        self._entries.clear()
+
+    def get_or_build(self, key: str, builder: Callable[[], Any]) -> CachedBody:
+        """Get the cached body for `key`, encoding `builder()` on a miss."""
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            _HITS.inc()
+            return cached
+
+        _MISSES.inc()
+        body = json.dumps(
+            jsonable_encoder(builder()),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        cached = CachedBody(
+            body=body,
+            etag=f'"{self.generation}-{digest}"',
+            gzipped=gzip.compress(body, compresslevel=6) if len(body) >= self.gzip_min_size else None,
+        )
+
+        self._entries[key] = cached
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return cached
+
+    def respond(self, request: Request, key: str, builder: Callable[[], Any]) -> Response:
+        """Serve a cached JSON body, honouring If-None-Match and gzip."""
+        cached = self.get_or_build(key, builder)
+        headers = {
+            "ETag": cached.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+
+        if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+
+        if cached.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(cached.gzipped, media_type="application/json", headers=headers)
+
+        return Response(cached.body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# Global instance
+response_cache = ResponseCache()
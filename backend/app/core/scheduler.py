@@ -1,25 +1,36 @@
 """Background task scheduler for sentiment aggregation."""
 import logging
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from datetime import datetime, timezone
+from typing import Optional
 
+from app.core.adaptive_interval import AdaptiveInterval
 from app.core.config import settings
+from app.core.cycle import cycle_coordinator
+from app.core.leader import leader_elector
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+# Created on start, keeping APScheduler out of the import path
+scheduler = None
+
+# Set in adaptive scheduling mode
+adaptive_interval: Optional[AdaptiveInterval] = None
 
 
 async def aggregate_sentiment_job():
     """Job that runs periodically to aggregate sentiment from all sources."""
-    from app.services.emotion_aggregator import EmotionAggregator
-    from app.api.routes.sentiment import update_current_emotion
+    if not leader_elector.is_leader:
+        logger.debug("Not the scheduler leader, skipping aggregation")
+        return
+
+    if cycle_coordinator.running:
+        # A manual refresh is already running this cycle
+        logger.info("Aggregation already in progress, skipping scheduled run")
+        return
 
     logger.info("Running sentiment aggregation job...")
     try:
-        aggregator = EmotionAggregator()
-        emotion = await aggregator.aggregate_all()
-        update_current_emotion(emotion)
+        emotion = await cycle_coordinator.run()
         logger.info(
             f"Emotions - happy:{emotion.happiness:.3f} sad:{emotion.sadness:.3f} "
             f"angry:{emotion.anger:.3f} fear:{emotion.fear:.3f} "
@@ -27,10 +38,28 @@ async def aggregate_sentiment_job():
         )
     except Exception as e:
         logger.error(f"Sentiment aggregation failed: {e}")
+        return
+
+    if adaptive_interval is not None:
+        from apscheduler.triggers.interval import IntervalTrigger
+
+        seconds = adaptive_interval.observe(
+            cycle_coordinator.last_duration, cycle_coordinator.last_new_fraction, emotion
+        )
+        scheduler.reschedule_job("sentiment_aggregation", trigger=IntervalTrigger(seconds=seconds))
+        logger.info(
+            f"Next aggregation in {seconds:.0f}s (cycle {cycle_coordinator.last_duration:.1f}s, "
+            f"new items {cycle_coordinator.last_new_fraction:.0%}, activity {adaptive_interval.activity:.2f})"
+        )
 
 
 def start_scheduler():
     """Start the background scheduler."""
+    global adaptive_interval, scheduler
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    scheduler = AsyncIOScheduler()
     # Use seconds if interval is less than 1 minute, otherwise use minutes
     interval_seconds = getattr(settings, 'scrape_interval_seconds', None)
     if interval_seconds:
@@ -40,18 +69,41 @@ def start_scheduler():
         trigger = IntervalTrigger(minutes=settings.scrape_interval_minutes)
         interval_msg = f"{settings.scrape_interval_minutes} minute"
 
+    if settings.scrape_schedule == "adaptive":
+        adaptive_interval = AdaptiveInterval(
+            base_seconds=interval_seconds or settings.scrape_interval_minutes * 60,
+            min_seconds=settings.scrape_interval_min_seconds,
+            max_seconds=settings.scrape_interval_max_seconds,
+        )
+        interval_msg = (
+            f"adaptive {settings.scrape_interval_min_seconds}-"
+            f"{settings.scrape_interval_max_seconds} second"
+        )
+
     scheduler.add_job(
         aggregate_sentiment_job,
         trigger=trigger,
         id="sentiment_aggregation",
         name="Aggregate sentiment from all sources",
         replace_existing=True,
+        # Never stack runs: a late tick is skipped, missed ticks collapse into one
+        max_instances=1,
+        coalesce=True,
     )
+    leader_elector.on_elected(_on_elected)
     scheduler.start()
     logger.info(f"Scheduler started with {interval_msg} interval")
 
 
+def _on_elected(takeover: bool):
+    """Run the job right away when taking over from a previous leader."""
+    if takeover:
+        scheduler.modify_job("sentiment_aggregation", next_run_time=datetime.now(timezone.utc))
+
+
 def stop_scheduler():
     """Stop the background scheduler."""
+    if scheduler is None:
+        return
     scheduler.shutdown()
     logger.info("Scheduler stopped")
@@ -0,0 +1,154 @@
+"""Runtime snapshot for warm restarts.
+
+The scheduler leader periodically writes the state a new process would
+otherwise have to rebuild: the current emotion, recently indexed items
+with their analyses, the topic -> items index and scraper state (RSS
+validators). Credentials such as the Reddit OAuth token are never
+written. On startup the snapshot is restored, so `/current` is accurate
+immediately and the first cycle only analyzes items that changed.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = Path(__file__).parent.parent.parent / "data" / "runtime_snapshot.json"
+# Version 1 snapshots could hold the Reddit token; they are ignored
+SNAPSHOT_VERSION = 2
+
+
+class RuntimeSnapshot:
+    """Saves and restores process state across restarts."""
+
+    def __init__(self, path: Path, interval_seconds: int, max_items: int, max_age_hours: int):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.max_items = max_items
+        self.max_age = timedelta(hours=max_age_hours)
+        self._task: Optional[asyncio.Task] = None
+        # Scraper state waits here until the first cycle creates the scrapers
+        self._scraper_state: Dict[str, Dict] = {}
+
+    def capture(self) -> Dict:
+        """Collect the snapshot on the event loop, where the state is mutated."""
+        from app.api.routes.sentiment import get_current_emotion
+        from app.core.cycle import cycle_coordinator
+        from app.services.content_index import content_index
+        from app.services.topic_item_index import topic_item_index
+
+        scrapers = dict(self._scraper_state)
+        for scraper in cycle_coordinator.scrapers:
+            if hasattr(scraper, "to_dict"):
+                scrapers[scraper.source_name] = scraper.to_dict()
+
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": datetime.utcnow().isoformat(),
+            "emotion": get_current_emotion().model_dump(mode="json"),
+            "content_index": content_index.to_dict(limit=self.max_items),
+            "topic_items": topic_item_index.to_dict(),
+            "scrapers": scrapers,
+        }
+
+    def _write(self, snapshot: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        # Readable by the service user only, from the moment it is created
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)
+        with open(fd, "w") as f:
+            json.dump(snapshot, f)
+        tmp_path.replace(self.path)
+
+    async def save(self):
+        """Write a snapshot if this worker runs the aggregation cycles."""
+        from app.core.leader import leader_elector
+
+        if not leader_elector.is_leader:
+            return
+        try:
+            snapshot = self.capture()
+            await asyncio.to_thread(self._write, snapshot)
+            logger.info(f"Saved runtime snapshot ({len(snapshot['content_index']['documents'])} items)")
+        except Exception as e:
+            logger.error(f"Failed to save runtime snapshot: {e}")
+
+    def restore(self) -> bool:
+        """Restore the last snapshot if there is a recent one."""
+        from app.api.routes.sentiment import restore_emotion
+        from app.models.emotion import EmotionState
+        from app.services.content_index import content_index
+        from app.services.topic_item_index import topic_item_index
+
+        try:
+            if not self.path.exists():
+                return False
+            with open(self.path, "r") as f:
+                snapshot = json.load(f)
+
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                logger.info("Ignoring runtime snapshot from another version")
+                return False
+            saved_at = datetime.fromisoformat(snapshot["saved_at"])
+            if datetime.utcnow() - saved_at > self.max_age:
+                logger.info(f"Ignoring runtime snapshot from {saved_at.isoformat()}")
+                return False
+
+            restore_emotion(EmotionState.model_validate(snapshot["emotion"]), saved_at)
+            content_index.restore(snapshot.get("content_index", {}))
+            topic_item_index.restore(snapshot.get("topic_items", {}))
+            self._scraper_state = snapshot.get("scrapers", {})
+        except Exception as e:
+            logger.error(f"Failed to restore runtime snapshot: {e}")
+            return False
+
+        logger.info(
+            f"Restored runtime snapshot from {saved_at.isoformat()}: "
+            f"{len(content_index)} items, {len(topic_item_index)} topic items"
+        )
+        return True
+
+    def restore_scrapers(self, scrapers: List):
+        """Hand snapshotted state to newly created scrapers."""
+        for scraper in scrapers:
+            if not hasattr(scraper, "restore"):
+                continue
+            state = self._scraper_state.pop(scraper.source_name, None)
+            if state:
+                try:
+                    scraper.restore(state)
+                except Exception as e:
+                    logger.warning(f"Could not restore {scraper.source_name} scraper state: {e}")
+
+    def start(self):
+        """Save periodically in the background."""
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.save()
+
+    async def stop(self):
+        """Stop periodic saves and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.save()
+
+
+# Global instance
+runtime_snapshot = RuntimeSnapshot(
+    SNAPSHOT_FILE,
+    interval_seconds=settings.snapshot_interval_seconds,
+    max_items=settings.snapshot_max_items,
+    max_age_hours=settings.snapshot_max_age_hours,
+)
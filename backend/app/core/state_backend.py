@@ -0,0 +1,331 @@
+"""Shared state and pub/sub between worker processes.
+
+Each worker keeps serving from its own in-memory state; the backend
+carries state changes between workers so every worker serves the same
+current state and pushes updates to its own WebSocket clients.
+
+- ``memory``: single process, nothing is shared.
+- ``local``: workers on one host exchange datagrams over Unix sockets
+  in `state_dir` and keep state in atomically replaced files there.
+- ``redis``: any Redis-protocol server, via a minimal RESP client.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+StateHandler = Callable[[str, str], None]
+
+
+class StateBackend(ABC):
+    """Key/value state plus a broadcast channel shared by all workers.
+
+    Messages are delivered to every other worker's handler; the publishing
+    worker is expected to have applied the change locally already.
+    """
+
+    def __init__(self):
+        self.origin: Optional[str] = None
+        self._handler: Optional[StateHandler] = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._pump: Optional[asyncio.Task] = None
+
+    async def start(self, handler: StateHandler):
+        """Start receiving messages from other workers."""
+        # Identified at start, not import: forked workers share the instance
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handler = handler
+        self._outbox = asyncio.Queue()
+        self._pump = asyncio.create_task(self._drain_outbox())
+
+    async def stop(self):
+        """Stop receiving messages and release resources."""
+        if self._pump is not None:
+            self._pump.cancel()
+            self._pump = None
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the stored value of `key`, or None."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str):
+        """Store `value` under `key` for all workers."""
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, data: str):
+        """Send a message to the other workers."""
+        pass
+
+    def publish_nowait(self, channel: str, data: str, key: Optional[str] = None):
+        """Store (if `key` is given) and publish in the background, in order."""
+        if self._outbox is None:
+            return
+        self._outbox.put_nowait((key, channel, data))
+
+    async def _drain_outbox(self):
+        while True:
+            key, channel, data = await self._outbox.get()
+            try:
+                if key is not None:
+                    await self.set(key, data)
+                await self.publish(channel, data)
+            except Exception as e:
+                logger.error(f"Failed to publish state on {channel}: {e}")
+
+    def _envelope(self, channel: str, data: str) -> str:
+        return json.dumps({"o": self.origin, "c": channel, "d": data}, separators=(",", ":"))
+
+    def _deliver(self, raw: str):
+        """Hand a message from another worker to the handler."""
+        try:
+            message = json.loads(raw)
+            if message["o"] == self.origin or self._handler is None:
+                return
+            self._handler(message["c"], message["d"])
+        except Exception as e:
+            logger.error(f"Failed to apply state message: {e}")
+
+
+class MemoryStateBackend(StateBackend):
+    """Single-process backend: state stays local and nothing is broadcast."""
+
+    def __init__(self):
+        super().__init__()
+        self._values: Dict[str, str] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._values.get(key)
+
+    async def set(self, key: str, value: str):
+        self._values[key] = value
+
+    async def publish(self, channel: str, data: str):
+        pass
+
+
+class LocalStateBackend(StateBackend):
+    """Single-host backend over Unix datagram sockets and state files.
+
+    Every worker binds `worker-<pid>.sock` in the state directory, and a
+    publish sends one datagram to each other socket found there. Sockets
+    of workers that have exited are removed on the first failed send.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = Path(directory)
+        self._path: Optional[Path] = None
+        self._sock: Optional[socket.socket] = None
+
+    async def start(self, handler: StateHandler):
+        await super().start(handler)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path = self.directory / f"worker-{os.getpid()}.sock"
+        if self._path.exists():
+            self._path.unlink()
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(str(self._path))
+        self._sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
+
+    async def stop(self):
+        await super().stop()
+        if self._sock is not None:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        if self._path is not None and self._path.exists():
+            self._path.unlink()
+
+    def _on_readable(self):
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            self._deliver(data.decode("utf-8"))
+
+    async def get(self, key: str) -> Optional[str]:
+        path = self.directory / f"state-{key}.json"
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    async def set(self, key: str, value: str):
+        path = self.directory / f"state-{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(value, encoding="utf-8")
+        tmp_path.replace(path)
+
+    async def publish(self, channel: str, data: str):
+        if self._sock is None:
+            return
+
+        payload = self._envelope(channel, data).encode("utf-8")
+        for path in self.directory.glob("worker-*.sock"):
+            if path == self._path:
+                continue
+            try:
+                self._sock.sendto(payload, str(path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker behind this socket has exited
+                path.unlink(missing_ok=True)
+            except BlockingIOError:
+                logger.warning(f"Dropped state message for busy worker {path.name}")
+
+
+class RedisStateBackend(StateBackend):
+    """Redis-protocol backend using a minimal RESP client.
+
+    Uses one connection for commands and one for the subscription, which
+    reconnects with backoff if the server goes away.
+    """
+
+    def __init__(self, url: str, prefix: str = "sentiment_face"):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self._channel = f"{prefix}:events"
+        self._conn: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._lock = asyncio.Lock()
+        self._subscriber: Optional[asyncio.Task] = None
+
+    async def start(self, handler: StateHandler):
+        await super().start(handler)
+        self._subscriber = asyncio.create_task(self._subscribe())
+
+    async def stop(self):
+        await super().stop()
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            self._subscriber = None
+        if self._conn is not None:
+            self._conn[1].close()
+            self._conn = None
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._command("GET", f"{self.prefix}:{key}")
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str):
+        await self._command("SET", f"{self.prefix}:{key}", value)
+
+    async def publish(self, channel: str, data: str):
+        await self._command("PUBLISH", self._channel, self._envelope(channel, data))
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await _send(writer, "AUTH", self.password)
+            await _read_reply(reader)
+        if self.db:
+            await _send(writer, "SELECT", str(self.db))
+            await _read_reply(reader)
+        return reader, writer
+
+    async def _command(self, *args: str) -> Any:
+        async with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = await self._connect()
+                reader, writer = self._conn
+                await _send(writer, *args)
+                return await _read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Reconnect on the next command
+                if self._conn is not None:
+                    self._conn[1].close()
+                self._conn = None
+                raise
+
+    async def _subscribe(self):
+        backoff = 0.5
+        while True:
+            try:
+                reader, writer = await self._connect()
+                await _send(writer, "SUBSCRIBE", self._channel)
+                backoff = 0.5
+                try:
+                    while True:
+                        reply = await _read_reply(reader)
+                        if isinstance(reply, list) and reply and reply[0] == b"message":
+                            self._deliver(reply[2].decode("utf-8"))
+                finally:
+                    writer.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"State subscription lost ({e}), retrying in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+async def _send(writer: asyncio.StreamWriter, *args: str):
+    parts: List[bytes] = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        encoded = arg.encode("utf-8")
+        parts.append(f"${len(encoded)}\r\n".encode() + encoded + b"\r\n")
+    writer.write(b"".join(parts))
+    await writer.drain()
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply."""
+    line = await reader.readuntil(b"\r\n")
+    kind, body = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return body
+    if kind == b"-":
+        raise RedisError(body.decode("utf-8"))
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(count)]
+    raise RedisError(f"Unexpected reply: {line!r}")
+
+
+def create_state_backend(name: str) -> StateBackend:
+    """Create the configured state backend."""
+    if name == "local":
+        return LocalStateBackend(settings.state_dir)
+    if name == "redis":
+        return RedisStateBackend(settings.redis_url, prefix=settings.state_key_prefix)
+    if name != "memory":
+        logger.warning(f"Unknown state backend '{name}', using memory")
+    return MemoryStateBackend()
+
+
+# Global instance
+state_backend = create_state_backend(settings.state_backend)
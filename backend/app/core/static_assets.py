@@ -0,0 +1,389 @@
+"""Static file serving for the Flutter web build.
+
+The static directory is scanned once at startup into an in-memory
+manifest, so a request is a dictionary lookup rather than filesystem
+checks. Each asset carries a content-hash ETag and, for compressible
+types, precompressed `.br`/`.gz` siblings chosen by Accept-Encoding.
+`python -m app.core.static_assets <dir>` precompresses ahead of time and
+saves the content hashes to `.manifest.json`, so startup only stats the
+files; files the saved manifest does not cover are hashed, and missing
+variants generated, in a worker thread. Fingerprinted file names are
+cached as immutable; everything else revalidates with If-None-Match.
+Range requests are served from the uncompressed file.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # gzip variants only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "image/svg+xml",
+    "font/otf",
+    "font/ttf",
+)
+# Sibling files that hold a compressed variant, by content coding
+VARIANT_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+# Names like main.3f2a9c1d.js or chunk-3f2a9c1d0b.js
+HASHED_NAME = re.compile(r"[.-][0-9a-f]{8,}\.[^/]+$")
+
+# Saved content hashes, keyed by path with the size and mtime they were taken at
+MANIFEST_FILE = ".manifest.json"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+CHUNK_SIZE = 64 * 1024
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("application/wasm", ".wasm")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("font/otf", ".otf")
+mimetypes.add_type("font/ttf", ".ttf")
+
+
+@dataclass
+class StaticAsset:
+    """A file in the manifest and its compressed variants."""
+
+    path: Path
+    media_type: str
+    size: int
+    digest: str
+    hashed: bool
+    # Content coding -> (file, size)
+    variants: Dict[str, Tuple[Path, int]] = field(default_factory=dict)
+
+    @property
+    def compressible(self) -> bool:
+        return self.media_type.startswith(COMPRESSIBLE_TYPES)
+
+    def etag(self, coding: Optional[str] = None) -> str:
+        # Each representation gets its own strong tag
+        return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check If-None-Match against any representation of this content."""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip().removeprefix("W/").strip('"')
+            if candidate == "*" or candidate.split("-")[0] == self.digest:
+                return True
+        return False
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range `bytes=` header into an inclusive (start, end).
+
+    Returns None for headers to ignore (serve the full body) and raises
+    ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise ValueError(f"Unsatisfiable range {value}")
+    return start, end
+
+
+class FileSliceResponse(Response):
+    """Streams part or all of a file without holding it in memory."""
+
+    def __init__(self, path: Path, start: int, length: int, status_code: int, headers: Dict[str, str]):
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.start = start
+        self.length = length
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # The file shrank since the manifest was built
+            await send({"type": "http.response.body", "body": b""})
+
+
+class StaticAssets:
+    """ASGI app serving the static manifest, with an SPA fallback page."""
+
+    def __init__(
+        self,
+        directory: Path,
+        fallback: str = "index.html",
+        exclude_prefixes: Tuple[str, ...] = (),
+        min_compress_bytes: int = 1024,
+    ):
+        self.directory = directory
+        self.fallback = fallback
+        self.exclude_prefixes = exclude_prefixes
+        self.min_compress_bytes = min_compress_bytes
+        self.assets: Dict[str, StaticAsset] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _is_variant(path: Path) -> bool:
+        return path.suffix in VARIANT_SUFFIXES.values() and path.with_name(path.stem).is_file()
+
+    def _saved_digests(self) -> Dict[str, Dict]:
+        try:
+            with open(self.directory / MANIFEST_FILE, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable static manifest: {e}")
+            return {}
+
+    def build(self) -> int:
+        """Scan the directory into the manifest, picking up existing variants.
+
+        Content hashes saved by `save` are reused for files whose size and
+        mtime are unchanged. Returns how many files had to be hashed.
+        """
+        saved = self._saved_digests()
+        assets: Dict[str, StaticAsset] = {}
+        variant_files = set()
+        hashed_files = 0
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file() or self._is_variant(path) or path.name == MANIFEST_FILE:
+                continue
+            rel = path.relative_to(self.directory).as_posix()
+            stat = path.stat()
+            entry = saved.get(rel)
+            if entry is not None and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                digest = entry["digest"]
+            else:
+                digest = _hash_file(path)
+                hashed_files += 1
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type == "application/javascript":
+                media_type += "; charset=utf-8"
+            asset = StaticAsset(
+                path=path,
+                media_type=media_type,
+                size=stat.st_size,
+                digest=digest,
+                hashed=bool(HASHED_NAME.search(path.name)),
+            )
+            for coding, suffix in VARIANT_SUFFIXES.items():
+                variant = path.with_name(path.name + suffix)
+                # A variant older than its source is stale
+                if variant.is_file() and variant.stat().st_mtime >= stat.st_mtime:
+                    asset.variants[coding] = (variant, variant.stat().st_size)
+                    variant_files.add(variant)
+            assets[rel] = asset
+        self.assets = assets
+        logger.info(
+            f"Static manifest: {len(assets)} files ({hashed_files} hashed), "
+            f"{len(variant_files)} precompressed variants"
+        )
+        return hashed_files
+
+    def save(self) -> bool:
+        """Save the content hashes so later builds only stat the files."""
+        saved = {}
+        for rel, asset in self.assets.items():
+            stat = asset.path.stat()
+            saved[rel] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": asset.digest}
+        path = self.directory / MANIFEST_FILE
+        try:
+            # Per-process name, as several workers may save at once
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(saved, f, separators=(",", ":"))
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Cannot save static manifest to {self.directory}: {e}")
+            return False
+        return True
+
+    async def load(self):
+        """Build the manifest off the event loop, saving it if files had to be hashed."""
+        if await asyncio.to_thread(self.build):
+            await asyncio.to_thread(self.save)
+
+    def compress_missing(self) -> int:
+        """Write any missing compressed variants; returns how many were written."""
+        written = 0
+        for asset in list(self.assets.values()):
+            if not asset.compressible or asset.size < self.min_compress_bytes:
+                continue
+            missing = [c for c in VARIANT_SUFFIXES if c not in asset.variants and (c != "br" or brotli)]
+            if not missing:
+                continue
+            data = asset.path.read_bytes()
+            for coding in missing:
+                if coding == "br":
+                    body = brotli.compress(data, quality=11)
+                else:
+                    body = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(body) >= asset.size:
+                    continue
+                variant = asset.path.with_name(asset.path.name + VARIANT_SUFFIXES[coding])
+                try:
+                    tmp_path = variant.with_name(variant.name + ".tmp")
+                    tmp_path.write_bytes(body)
+                    tmp_path.replace(variant)
+                except OSError as e:
+                    logger.warning(f"Cannot write compressed static files to {variant.parent}: {e}")
+                    return written
+                # Swapped, not mutated, since requests read it on the event loop
+                asset.variants = {**asset.variants, coding: (variant, len(body))}
+                written += 1
+        if written:
+            logger.info(f"Precompressed {written} static variants")
+        return written
+
+    def start(self):
+        """Generate missing variants in a worker thread; identity is served meanwhile."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(asyncio.to_thread(self.compress_missing))
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        """Resolve a request path, falling back to the SPA page."""
+        path = path.lstrip("/")
+        asset = self.assets.get(path or self.fallback)
+        if asset is not None:
+            return asset
+        if path.startswith(self.exclude_prefixes):
+            return None
+        return self.assets.get(self.fallback)
+
+    def response(self, asset: StaticAsset, headers: Headers) -> Response:
+        """Pick the representation and status for a request."""
+        response_headers = {
+            "ETag": asset.etag(),
+            "Cache-Control": IMMUTABLE if asset.hashed else REVALIDATE,
+        }
+        if asset.variants:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        if asset.matches(headers.get("if-none-match")):
+            return Response(status_code=304, headers=response_headers)
+
+        range_header = headers.get("range")
+        if range_header and headers.get("if-range", asset.etag()) == asset.etag():
+            try:
+                byte_range = _parse_range(range_header, asset.size)
+            except ValueError:
+                return Response(status_code=416, headers={**response_headers, "Content-Range": f"bytes */{asset.size}"})
+            if byte_range is not None:
+                start, end = byte_range
+                response_headers.update({
+                    "Accept-Ranges": "bytes",
+                    "Content-Type": asset.media_type,
+                    "Content-Range": f"bytes {start}-{end}/{asset.size}",
+                    "Content-Length": str(end - start + 1),
+                })
+                return FileSliceResponse(asset.path, start, end - start + 1, 206, response_headers)
+
+        accept_encoding = headers.get("accept-encoding", "")
+        for coding in VARIANT_SUFFIXES:
+            if coding in asset.variants and _accepts(accept_encoding, coding):
+                variant, size = asset.variants[coding]
+                response_headers.update({
+                    "ETag": asset.etag(coding),
+                    "Content-Encoding": coding,
+                    "Content-Type": asset.media_type,
+                    "Content-Length": str(size),
+                })
+                return FileSliceResponse(variant, 0, size, 200, response_headers)
+
+        response_headers.update({
+            "Accept-Ranges": "bytes",
+            "Content-Type": asset.media_type,
+            "Content-Length": str(asset.size),
+        })
+        return FileSliceResponse(asset.path, 0, asset.size, 200, response_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["method"] not in ("GET", "HEAD"):
+            response = Response(status_code=405, headers={"Allow": "GET, HEAD"})
+        else:
+            asset = self.lookup(scope["path"][len(scope.get("root_path", "")):])
+            if asset is None:
+                response = Response('{"detail":"Not found"}', status_code=404, media_type="application/json")
+            else:
+                response = self.response(asset, Headers(scope=scope))
+        await response(scope, receive, send)
+
+
+def main(argv=None) -> int:
+    """Precompress a static directory and save its manifest, e.g. at image build time."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print("usage: python -m app.core.static_assets <static dir>")
+        return 2
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if brotli is None:
+        logger.warning("brotli is not installed; writing gzip variants only")
+    assets = StaticAssets(Path(args[0]), min_compress_bytes=settings.static_min_compress_bytes)
+    assets.build()
+    assets.compress_missing()
+    return 0 if assets.save() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
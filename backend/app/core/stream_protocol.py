@@ -0,0 +1,213 @@
+"""Wire encodings for the /stream WebSocket.
+
+Clients pick an encoding with the `protocol` query parameter or the
+matching WebSocket subprotocol:
+
+- ``json`` (default): every update is the full EmotionState JSON.
+- ``delta`` / ``sentiment.delta.v1``: a JSON keyframe, then JSON deltas
+  holding only the fields whose quantized value changed.
+- ``binary`` / ``sentiment.binary.v1``: the same keyframe/delta scheme
+  in compact binary frames with values quantized to int16.
+
+Binary frames are little-endian. Every frame starts with a type byte
+(1 = keyframe, 2 = delta) and a uint32 Unix timestamp. A keyframe
+carries all FIELDS as int16 followed by a source block; a delta carries
+a uint16 bitmask of changed FIELDS (bit 15 = sources changed) followed
+by the changed values in field order and, if bit 15 is set, a source
+block. A source block is a uint8 count, then per source a uint8 name
+length, the UTF-8 name and an int16 value. Values are scaled by SCALE.
+
+Compression is left to permessage-deflate, which the server negotiates
+when the client offers it.
+"""
+import json
+import struct
+from datetime import datetime
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.models.emotion import EmotionState
+
+# Quantized fields in wire order (aliases as sent by the JSON encodings)
+FIELDS: Tuple[str, ...] = (
+    "happiness",
+    "sadness",
+    "anger",
+    "fear",
+    "surprise",
+    "disgust",
+    "confusion",
+    "pride",
+    "loneliness",
+    "pain",
+    "contempt",
+    "anticipation",
+    "trust",
+    "overallSentiment",
+    "intensity",
+)
+
+SCALE = 10000
+
+KEYFRAME = 1
+DELTA = 2
+SOURCES_BIT = 1 << 15
+
+SUBPROTOCOLS = {
+    "sentiment.delta.v1": "delta",
+    "sentiment.binary.v1": "binary",
+}
+
+Payload = Union[str, bytes]
+
+
+class StateUpdate:
+    """An emotion state queued for clients, encoded lazily per protocol."""
+
+    def __init__(self, emotion: EmotionState):
+        self.emotion = emotion
+
+    @cached_property
+    def json(self) -> str:
+        """Full JSON body, encoded once and shared by all JSON clients."""
+        return self.emotion.model_dump_json(by_alias=True)
+
+    @cached_property
+    def quantized(self) -> Tuple[List[int], Dict[str, int], int]:
+        """Quantized field values, source contributions and Unix timestamp."""
+        data = self.emotion.model_dump(by_alias=True)
+        values = [round(data[name] * SCALE) for name in FIELDS]
+        sources = {
+            name: round(value * SCALE)
+            for name, value in data["sourceContributions"].items()
+        }
+        timestamp = self.emotion.timestamp or datetime.utcnow()
+        return values, sources, int((timestamp - datetime(1970, 1, 1)).total_seconds())
+
+
+class JsonEncoder:
+    """Sends every update as the full EmotionState JSON."""
+
+    def encode(self, update: StateUpdate) -> Optional[Payload]:
+        return update.json
+
+
+class DeltaEncoder:
+    """Sends a keyframe, then only the fields that changed since the last frame.
+
+    Each client gets its own encoder, so deltas are always relative to what
+    that client last received, even when the fan-out dropped updates it was
+    too slow for. A keyframe is resent every `keyframe_interval` frames.
+    """
+
+    def __init__(self, keyframe_interval: int = 20):
+        self.keyframe_interval = keyframe_interval
+        self._values: Optional[List[int]] = None
+        self._sources: Optional[Dict[str, int]] = None
+        self._since_keyframe = 0
+
+    def encode(self, update: StateUpdate) -> Optional[Payload]:
+        """Encode an update, or return None if nothing visible changed."""
+        values, sources, timestamp = update.quantized
+
+        if self._values is None or self._since_keyframe >= self.keyframe_interval:
+            self._values, self._sources = values, sources
+            self._since_keyframe = 0
+            return self._keyframe(values, sources, timestamp)
+
+        changed = [i for i, (old, new) in enumerate(zip(self._values, values)) if old != new]
+        sources_changed = sources != self._sources
+        if not changed and not sources_changed:
+            return None
+
+        self._values, self._sources = values, sources
+        self._since_keyframe += 1
+        return self._delta(changed, values, sources if sources_changed else None, timestamp)
+
+    def _keyframe(self, values: List[int], sources: Dict[str, int], timestamp: int) -> Payload:
+        return _compact_json({
+            "t": "k",
+            "ts": timestamp,
+            "v": {name: value / SCALE for name, value in zip(FIELDS, values)},
+            "s": {name: value / SCALE for name, value in sources.items()},
+        })
+
+    def _delta(
+        self,
+        changed: List[int],
+        values: List[int],
+        sources: Optional[Dict[str, int]],
+        timestamp: int,
+    ) -> Payload:
+        message = {
+            "t": "d",
+            "ts": timestamp,
+            "v": {FIELDS[i]: values[i] / SCALE for i in changed},
+        }
+        if sources is not None:
+            message["s"] = {name: value / SCALE for name, value in sources.items()}
+        return _compact_json(message)
+
+
+class BinaryEncoder(DeltaEncoder):
+    """Keyframe/delta scheme in quantized binary frames."""
+
+    _KEYFRAME = struct.Struct(f"<BI{len(FIELDS)}h")
+    _DELTA_HEADER = struct.Struct("<BIH")
+
+    def _keyframe(self, values: List[int], sources: Dict[str, int], timestamp: int) -> Payload:
+        return self._KEYFRAME.pack(KEYFRAME, timestamp, *values) + _pack_sources(sources)
+
+    def _delta(
+        self,
+        changed: List[int],
+        values: List[int],
+        sources: Optional[Dict[str, int]],
+        timestamp: int,
+    ) -> Payload:
+        mask = 0
+        for i in changed:
+            mask |= 1 << i
+        if sources is not None:
+            mask |= SOURCES_BIT
+
+        frame = self._DELTA_HEADER.pack(DELTA, timestamp, mask)
+        frame += struct.pack(f"<{len(changed)}h", *(values[i] for i in changed))
+        if sources is not None:
+            frame += _pack_sources(sources)
+        return frame
+
+
+def negotiate(protocol: Optional[str], offered: List[str]) -> Tuple[str, Optional[str]]:
+    """Pick an encoding from the query parameter or offered subprotocols.
+
+    Returns the encoding name and the subprotocol to accept, if any.
+    """
+    for subprotocol in offered:
+        if subprotocol in SUBPROTOCOLS:
+            return SUBPROTOCOLS[subprotocol], subprotocol
+    if protocol in ("delta", "binary"):
+        return protocol, None
+    return "json", None
+
+
+def create_encoder(encoding: str, keyframe_interval: int = 20):
+    """Create a per-client encoder for a negotiated encoding."""
+    if encoding == "delta":
+        return DeltaEncoder(keyframe_interval)
+    if encoding == "binary":
+        return BinaryEncoder(keyframe_interval)
+    return JsonEncoder()
+
+
+def _compact_json(message: Dict) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+def _pack_sources(sources: Dict[str, int]) -> bytes:
+    items = list(sources.items())[:255]
+    frame = bytearray(struct.pack("<B", len(items)))
+    for name, value in items:
+        encoded = name.encode("utf-8")[:255]
+        frame += struct.pack(f"<B{len(encoded)}sh", len(encoded), encoded, value)
+    return bytes(frame)
@@ -0,0 +1,260 @@
+"""Lightweight tracing spans for aggregation cycles and searches.
+
+A trace starts with `tracer.trace()` (one per cycle or search; its trace
+ID is the cycle ID) and child spans are opened with `tracer.span()`.
+The current span lives in a context variable, so spans opened in tasks
+created inside a trace attach to the right parent. Outside a trace,
+`span()` records nothing. Async generators must not hold a span across
+`yield`, since the consumer runs in between: they use `start_trace()`
+and `end_trace()`, and make the root current with `activate()` only
+around the steps between yields.
+
+Finished traces are kept in an in-memory ring for the admin endpoint and
+can also be appended to a JSONL file and exported over OTLP/HTTP.
+"""
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed stage of a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start", "duration", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict:
+        return {
+            "spanId": self.span_id,
+            "parentId": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "durationMs": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """All spans of one cycle or search."""
+
+    def __init__(self, name: str):
+        self.trace_id = secrets.token_hex(16)
+        self.name = name
+        self.spans: List[Span] = []
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    def summary(self) -> Dict:
+        root = self.root
+        return {
+            "traceId": self.trace_id,
+            "name": self.name,
+            "start": root.start,
+            "durationMs": round(root.duration * 1000, 3) if root.duration is not None else None,
+            "spans": len(self.spans),
+            "error": root.error,
+        }
+
+    def to_dict(self) -> Dict:
+        return {**self.summary(), "spans": [span.to_dict() for span in self.spans]}
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Records spans and hands finished traces to the exporters."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        buffer_size: int = 50,
+        jsonl_path: str = "",
+        otlp_endpoint: str = "",
+        service_name: str = "sentiment-face",
+    ):
+        self.enabled = enabled
+        self.jsonl_path = jsonl_path
+        self.otlp_endpoint = otlp_endpoint.rstrip("/")
+        self.service_name = service_name
+        self._finished: Deque[Trace] = deque(maxlen=buffer_size)
+        self._exports: set = set()
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Start a new trace whose root span covers the block."""
+        if not self.enabled:
+            yield None
+            return
+        trace = Trace(name)
+        try:
+            with self._open(trace, name, None, attributes) as span:
+                yield span
+        finally:
+            self._finish(trace)
+
+    def start_trace(self, name: str, **attributes: Any) -> Optional[Span]:
+        """Start a trace without making it current; finish it with `end_trace`."""
+        if not self.enabled:
+            return None
+        trace = Trace(name)
+        root = Span(trace, name, None, attributes)
+        trace.spans.append(root)
+        return root
+
+    def end_trace(self, root: Optional[Span], error: Optional[BaseException] = None):
+        """Close a trace started with `start_trace`."""
+        if root is None:
+            return
+        root.duration = time.time() - root.start
+        if error is not None:
+            root.error = repr(error)
+        self._finish(root.trace)
+
+    @contextmanager
+    def activate(self, span: Optional[Span]) -> Iterator[None]:
+        """Make `span` current for a block that does not yield."""
+        if span is None:
+            yield
+            return
+        token = _current_span.set(span)
+        try:
+            yield
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Open a child span of the current span, if there is a trace."""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        with self._open(parent.trace, name, parent.span_id, attributes) as span:
+            yield span
+
+    @contextmanager
+    def _open(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        span = Span(trace, name, parent_id, attributes)
+        trace.spans.append(span)
+        started = time.perf_counter()
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+
+    def current_trace_id(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.trace.trace_id if span is not None else None
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        """Summaries of the most recent traces, newest first."""
+        return [trace.summary() for trace in list(self._finished)[::-1][:limit]]
+
+    def get(self, trace_id: str) -> Optional[Dict]:
+        for trace in self._finished:
+            if trace.trace_id == trace_id:
+                return trace.to_dict()
+        return None
+
+    def _finish(self, trace: Trace):
+        self._finished.append(trace)
+        if self.jsonl_path:
+            self._write_jsonl(trace)
+        if self.otlp_endpoint:
+            try:
+                task = asyncio.get_running_loop().create_task(self._export_otlp(trace))
+            except RuntimeError:
+                return
+            self._exports.add(task)
+            task.add_done_callback(self._exports.discard)
+
+    def _write_jsonl(self, trace: Trace):
+        try:
+            with open(self.jsonl_path, "a") as f:
+                f.write(json.dumps(trace.to_dict(), default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write trace: {e}")
+
+    async def _export_otlp(self, trace: Trace):
+        """Send a trace to an OTLP/HTTP collector as JSON."""
+        import httpx
+
+        spans = []
+        for span in trace.spans:
+            start_ns = int(span.start * 1e9)
+            otlp_span = {
+                "traceId": trace.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int((span.duration or 0) * 1e9)),
+                "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            spans.append(otlp_span)
+
+        body = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": spans}],
+            }]
+        }
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                await client.post(f"{self.otlp_endpoint}/v1/traces", json=body)
+        except Exception as e:
+            logger.warning(f"OTLP trace export failed: {e}")
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# Global instance
+tracer = Tracer(
+    enabled=settings.tracing_enabled,
+    buffer_size=settings.trace_buffer_size,
+    jsonl_path=settings.trace_jsonl_path,
+    otlp_endpoint=settings.otlp_endpoint,
+)
@@ -0,0 +1,90 @@
+"""Background warmup of the model and stored state at startup."""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Loads history and the emotion model in worker threads.
+
+    The server accepts requests while this runs. `/ready` reports ready
+    once both are warm, and work that needs the model (aggregation cycles,
+    searches) awaits `wait()` instead of loading it on the event loop.
+    With `preload_model` off the model is not part of the gate: inference
+    is "lazy" at once and the first cycle or search loads it.
+    """
+
+    def __init__(self):
+        self.storage = False  # True once history loaded; a failed load keeps /ready at 503
+        # "model" or "fallback" once warm; "lazy" (not loaded, not gated) without preload_model
+        self.inference: Optional[str] = None
+        self.errors: Dict[str, str] = {}
+        self.durations: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.storage and self.inference is not None
+
+    def start(self):
+        """Start warming up in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def wait(self):
+        """Wait for warmup to finish; returns at once if it never started."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _run(self):
+        started = time.perf_counter()
+        await asyncio.gather(self._warm_storage(), self._warm_inference())
+        logger.info(f"Warmup finished in {time.perf_counter() - started:.2f}s ({self.inference} inference)")
+
+    async def _warm_storage(self):
+        from app.services.history_store import history_store
+
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(history_store.load)
+            self.storage = True
+        except Exception as e:
+            self.errors["storage"] = str(e)
+            logger.error(f"Failed to load history: {e}")
+        self.durations["storage"] = time.perf_counter() - started
+
+    async def _warm_inference(self):
+        from app.services.sentiment_analyzer import warm_up_pipeline
+
+        started = time.perf_counter()
+        if not settings.preload_model:
+            # The first cycle or search loads the model
+            self.inference = "lazy"
+            return
+        try:
+            loaded = await asyncio.to_thread(
+                warm_up_pipeline, settings.warmup_batch_size, settings.compile_model
+            )
+        except Exception as e:
+            self.errors["inference"] = str(e)
+            logger.error(f"Model warmup failed: {e}")
+            loaded = False
+        self.inference = "model" if loaded else "fallback"
+        self.durations["inference"] = time.perf_counter() - started
+
+    def status(self) -> Dict:
+        return {
+            "storage": self.storage,
+            "inference": self.inference,
+            "durations": {k: round(v, 3) for k, v in self.durations.items()},
+            "errors": self.errors,
+        }
+
+
+# Global instance
+warmup = Warmup()
@@ -7,12 +7,16 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 
-from app.api.routes import sentiment, health
+from app.api.routes import admin, sentiment, health
 from app.core.config import settings
+from app.core.leader import leader_elector
+from app.core.profiler import ProfilingMiddleware
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.snapshot import runtime_snapshot
+from app.core.static_assets import StaticAssets
+from app.core.state_backend import state_backend
+from app.core.warmup import warmup
 
 # Configure logging
 logging.basicConfig(
@@ -21,14 +25,36 @@ logging.basicConfig(
 )
 
 
+# Set below when the Flutter web build is deployed
+static_assets = None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
-    # Startup
+    # Startup; the model and history load in the background until /ready
+    warmup.start()
+    if settings.snapshot_enabled:
+        runtime_snapshot.restore()
+    await state_backend.start(sentiment.handle_state_message)
+    # Shared state from running workers is fresher than the snapshot
+    await sentiment.restore_state()
+    await leader_elector.start()
     start_scheduler()
+    if settings.snapshot_enabled:
+        runtime_snapshot.start()
+    if static_assets is not None:
+        # Reads the manifest saved at image build time, hashing only what it misses
+        await static_assets.load()
+        if settings.static_precompress:
+            static_assets.start()
     yield
     # Shutdown
     stop_scheduler()
+    if settings.snapshot_enabled:
+        await runtime_snapshot.stop()
+    await leader_elector.stop()
+    await state_backend.stop()
 
 
 app = FastAPI(
@@ -47,9 +73,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiles requests to a route while an admin has a session armed
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(sentiment.router, prefix="/api/v1/sentiment", tags=["Sentiment"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 
 
 @app.get("/api")
@@ -66,66 +96,21 @@ async def api_root():
 STATIC_DIR = Path(__file__).parent.parent / "static"
 
 if STATIC_DIR.exists():
-    # Mount static files (JS, CSS, assets)
-    app.mount("/assets", StaticFiles(directory=STATIC_DIR / "assets"), name="assets")
-    app.mount("/icons", StaticFiles(directory=STATIC_DIR / "icons"), name="icons")
-
-    # Serve Flutter web app files
-    @app.get("/flutter_bootstrap.js")
-    async def flutter_bootstrap():
-        return FileResponse(STATIC_DIR / "flutter_bootstrap.js", media_type="application/javascript")
-
-    @app.get("/flutter.js")
-    async def flutter_js():
-        return FileResponse(STATIC_DIR / "flutter.js", media_type="application/javascript")
-
-    @app.get("/main.dart.js")
-    async def main_dart_js():
-        js_file = STATIC_DIR / "main.dart.js"
-        if js_file.exists():
-            return FileResponse(js_file, media_type="application/javascript")
-        return FileResponse(STATIC_DIR / "index.html")
-
-    @app.get("/flutter_service_worker.js")
-    async def service_worker():
-        return FileResponse(STATIC_DIR / "flutter_service_worker.js", media_type="application/javascript")
-
-    @app.get("/manifest.json")
-    async def manifest():
-        return FileResponse(STATIC_DIR / "manifest.json", media_type="application/json")
-
-    @app.get("/favicon.png")
-    async def favicon():
-        return FileResponse(STATIC_DIR / "favicon.png", media_type="image/png")
-
-    @app.get("/version.json")
-    async def version():
-        version_file = STATIC_DIR / "version.json"
-        if version_file.exists():
-            return FileResponse(version_file, media_type="application/json")
-        return {"version": "1.0.0"}
-
-    # Root route serves index.html
-    @app.get("/")
-    async def serve_index():
-        return FileResponse(STATIC_DIR / "index.html")
-
-    # Catch-all route for Flutter client-side routing
-    @app.get("/{path:path}")
-    async def serve_spa(path: str):
-        # Don't intercept API, health, or static file routes
-        if path.startswith(("api", "health", "assets", "icons")):
-            # Let FastAPI handle these via their registered routes
-            from fastapi import HTTPException
-            raise HTTPException(status_code=404, detail="Not found")
-
-        # Check if it's a real file in static directory
-        file_path = STATIC_DIR / path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(file_path)
-
-        # Otherwise serve index.html for client-side routing
-        return FileResponse(STATIC_DIR / "index.html")
+    static_assets = StaticAssets(
+        STATIC_DIR,
+        # Unknown paths under these are 404s rather than client-side routes
+        exclude_prefixes=("api/", "health", "assets/", "icons/", "canvaskit/"),
+        min_compress_bytes=settings.static_min_compress_bytes,
+    )
+
+    if not (STATIC_DIR / "version.json").exists():
+        @app.get("/version.json")
+        async def version():
+            return {"version": "1.0.0"}
+
+    # Everything not matched by an API route, including `/`, is a static
+    # file or the SPA page for client-side routing
+    app.mount("/", static_assets, name="static")
 else:
     @app.get("/")
     async def root():
@@ -0,0 +1,125 @@
+"""Vectorized weighting of per-item analyses into emotion states.
+
+The live cycle aggregates one group (its scraped items); the analysis
+archive re-aggregates many cycles at once with the same code, so
+alternative weights can be replayed over past items without the model.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field, field_validator
+
+from app.services.scrapers.base_scraper import ScrapedContent
+from app.services.sentiment_analyzer import AnalysisResult
+
+# Model emotions, in column order of emotion vectors
+EMOTIONS = ("happiness", "sadness", "anger", "fear", "surprise", "disgust")
+
+
+class AggregationWeights(BaseModel):
+    """How items are weighted and how secondary emotions are derived."""
+
+    engagement_scale: float = Field(default=1000.0, gt=0, description="Score that doubles an item's weight")
+    recency_half_life_hours: float = Field(default=24.0, gt=0)
+    recency_floor: float = Field(default=0.1, ge=0)
+    use_confidence: bool = True
+    source_weights: Dict[str, float] = Field(default_factory=dict, description="Per-source multiplier, default 1")
+    secondary: Dict[str, Dict[str, float]] = Field(
+        default_factory=lambda: {
+            "confusion": {"surprise": 0.5, "fear": 0.3},
+            "pride": {"happiness": 0.3},
+            "loneliness": {"sadness": 0.5},
+            "pain": {"sadness": 0.3, "fear": 0.2},
+        },
+        description="Secondary emotion -> {primary emotion: coefficient}",
+    )
+    intensity_scale: float = 3.0
+    intensity_floor: float = 0.3
+
+    @field_validator("secondary")
+    @classmethod
+    def _known_emotions(cls, secondary: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        for coefficients in secondary.values():
+            unknown = set(coefficients) - set(EMOTIONS)
+            if unknown:
+                raise ValueError(f"Unknown emotions {sorted(unknown)}; choose from {', '.join(EMOTIONS)}")
+        return secondary
+
+
+DEFAULT_WEIGHTS = AggregationWeights()
+
+
+def to_epoch(timestamp: datetime) -> float:
+    """Seconds since the epoch, reading naive datetimes as UTC like the cycle does."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def item_columns(
+    content: List[ScrapedContent], results: List[AnalysisResult]
+) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """Columns of per-item inputs, with source codes indexing the returned names."""
+    sources, source_codes = np.unique([item.source for item in content], return_inverse=True)
+    columns = {
+        "item_ts": np.array([to_epoch(item.timestamp) for item in content], dtype=np.float64),
+        "source": source_codes.astype(np.int64),
+        "score": np.array([item.score for item in content], dtype=np.float64),
+        "confidence": np.array([r.confidence for r in results], dtype=np.float64),
+        "sentiment": np.array([r.sentiment_score for r in results], dtype=np.float64),
+        "emotions": np.array(
+            [[r.emotions.get(emotion, 0.0) for emotion in EMOTIONS] for r in results], dtype=np.float64
+        ).reshape(-1, len(EMOTIONS)),
+    }
+    return columns, [str(source) for source in sources]
+
+
+def aggregate(
+    columns: Dict[str, np.ndarray],
+    age_hours: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int,
+    sources: List[str],
+    weights: AggregationWeights = DEFAULT_WEIGHTS,
+) -> Dict[str, np.ndarray]:
+    """Aggregate items into `n_groups` emotion states, one array per field.
+
+    `groups` assigns each item to a group (a cycle). Groups whose items
+    carry no weight have a total_weight of zero and should be discarded.
+    """
+    # The live formula's rounded constants, so past cycles replay exactly
+    recency = np.maximum(
+        weights.recency_floor, np.power(2.718, -0.693 / weights.recency_half_life_hours * age_hours)
+    )
+    weight = (1.0 + columns["score"] / weights.engagement_scale) * recency
+    if weights.use_confidence:
+        weight = weight * columns["confidence"]
+    if weights.source_weights:
+        per_source = np.array([weights.source_weights.get(source, 1.0) for source in sources])
+        weight = weight * per_source[columns["source"]]
+
+    total = np.bincount(groups, weights=weight, minlength=n_groups)
+    divisor = np.where(total > 0, total, 1.0)
+    emotions = columns["emotions"]
+    primary = np.stack(
+        [np.bincount(groups, weights=emotions[:, k] * weight, minlength=n_groups) for k in range(len(EMOTIONS))],
+        axis=1,
+    )
+    primary = np.clip(primary / divisor[:, None], 0.0, 1.0)
+    sentiment = np.bincount(groups, weights=columns["sentiment"] * weight, minlength=n_groups) / divisor
+
+    aggregated = {emotion: primary[:, k] for k, emotion in enumerate(EMOTIONS)}
+    for name, coefficients in weights.secondary.items():
+        value = np.zeros(n_groups)
+        for emotion, coefficient in coefficients.items():
+            value += primary[:, EMOTIONS.index(emotion)] * coefficient
+        aggregated[name] = np.minimum(1.0, value)
+
+    # Intensity from how far emotions spread from their mean
+    spread = np.abs(primary - primary.mean(axis=1, keepdims=True)).mean(axis=1)
+    aggregated["intensity"] = np.maximum(weights.intensity_floor, np.minimum(1.0, spread * weights.intensity_scale))
+    aggregated["overall_sentiment"] = np.clip(sentiment, -1.0, 1.0)
+    aggregated["total_weight"] = total
+    aggregated["items"] = np.bincount(groups, minlength=n_groups)
+    return aggregated
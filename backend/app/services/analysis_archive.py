@@ -0,0 +1,285 @@
+"""Append-only columnar archive of per-item analyses.
+
+Every cycle appends one row per scraped item (cycle time, item id,
+source, timestamp, score, confidence, sentiment and the emotion vector)
+to the day's segment directory, one raw little-endian file per column.
+Segments older than the retention window are deleted whole. Because the
+inputs of every past cycle are kept, `reaggregate` can recompute the
+history of any time range under different weights with numpy, without
+running the model again.
+
+Values are stored as float64, the precision the live cycle aggregates
+in, so replaying a cycle under its original weights reproduces it
+exactly. Each segment records its column types in `columns.json`;
+segments written before that file existed hold float32 values and replay
+to within float32 rounding (about 1e-7 relative).
+"""
+import hashlib
+import json
+import logging
+import shutil
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.aggregation import (
+    DEFAULT_WEIGHTS,
+    EMOTIONS,
+    AggregationWeights,
+    aggregate,
+    item_columns,
+    to_epoch,
+)
+from app.services.scrapers.base_scraper import ScrapedContent
+from app.services.sentiment_analyzer import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = Path(__file__).parent.parent.parent / "data" / "analysis_archive"
+
+# Column -> dtype; emotions hold len(EMOTIONS) values per row
+COLUMNS = {
+    "cycle_ts": np.dtype("<f8"),
+    "item_id": np.dtype("<u8"),
+    "item_ts": np.dtype("<f8"),
+    "source": np.dtype("u1"),
+    "score": np.dtype("<f8"),
+    "confidence": np.dtype("<f8"),
+    "sentiment": np.dtype("<f8"),
+    "emotions": np.dtype("<f8"),
+}
+# Segments without a layout file
+LEGACY_COLUMNS = {
+    **COLUMNS,
+    "score": np.dtype("<f4"),
+    "confidence": np.dtype("<f4"),
+    "sentiment": np.dtype("<f4"),
+    "emotions": np.dtype("<f4"),
+}
+LAYOUT_FILE = "columns.json"
+SEGMENT_FORMAT = "%Y-%m-%d"
+
+Layout = Dict[str, np.dtype]
+
+
+def _width(name: str) -> int:
+    return len(EMOTIONS) if name == "emotions" else 1
+
+
+def item_id(url: str) -> int:
+    """Stable 64-bit id of an item, from its URL."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class AnalysisArchive:
+    """Stores per-item analyses by day and re-aggregates them on demand."""
+
+    def __init__(self, directory: Path, retention_days: int):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._sources: Optional[List[str]] = None
+        self._segment: Optional[str] = None
+        self._layouts: Dict[str, Layout] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _sources_file(self) -> Path:
+        return self.directory / "sources.json"
+
+    def _load_sources(self) -> List[str]:
+        if self._sources is None:
+            self._sources = []
+            if self._sources_file.exists():
+                with open(self._sources_file, "r") as f:
+                    self._sources = json.load(f)
+        return self._sources
+
+    def _source_code(self, source: str) -> int:
+        sources = self._load_sources()
+        if source not in sources:
+            if len(sources) >= 256:
+                raise ValueError("Analysis archive supports at most 256 sources")
+            sources.append(source)
+            tmp_path = self._sources_file.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(sources, f)
+            tmp_path.replace(self._sources_file)
+        return sources.index(source)
+
+    def _segments(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(p for p in self.directory.iterdir() if p.is_dir())
+
+    def _layout(self, segment: Path, create: bool = False) -> Layout:
+        """Column types of a segment; `create` starts a new segment in the current layout."""
+        layout = self._layouts.get(segment.name)
+        if layout is not None:
+            return layout
+
+        layout_file = segment / LAYOUT_FILE
+        if layout_file.exists():
+            with open(layout_file, "r") as f:
+                layout = {name: np.dtype(dtype) for name, dtype in json.load(f).items()}
+        elif any(segment.glob("*.bin")):
+            layout = LEGACY_COLUMNS
+        elif create:
+            with open(layout_file, "w") as f:
+                json.dump({name: dtype.str for name, dtype in COLUMNS.items()}, f)
+            layout = COLUMNS
+        else:
+            return COLUMNS
+        self._layouts[segment.name] = layout
+        return layout
+
+    def _rows(self, segment: Path) -> Dict[str, int]:
+        rows = {}
+        for name, dtype in self._layout(segment).items():
+            path = segment / f"{name}.bin"
+            size = path.stat().st_size if path.exists() else 0
+            rows[name] = size // (dtype.itemsize * _width(name))
+        return rows
+
+    def _repair(self, segment: Path):
+        """Cut columns back to a whole number of rows after an interrupted append."""
+        rows = self._rows(segment)
+        complete = min(rows.values())
+        for name, dtype in self._layout(segment).items():
+            path = segment / f"{name}.bin"
+            size = complete * dtype.itemsize * _width(name)
+            if path.exists() and path.stat().st_size != size:
+                logger.warning(f"Truncating {path} to {complete} rows")
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def append(self, content: List[ScrapedContent], results: List[AnalysisResult], cycle_time: datetime):
+        """Append the analyzed items of one cycle."""
+        if not content:
+            return
+        columns, sources = item_columns(content, results)
+        segment = self.directory / cycle_time.strftime(SEGMENT_FORMAT)
+        with self._lock:
+            segment.mkdir(parents=True, exist_ok=True)
+            # A segment started before an upgrade keeps its layout for the day
+            layout = self._layout(segment, create=True)
+            if segment.name != self._segment:
+                # First append to this segment by this process, or a new day
+                self._repair(segment)
+                self._segment = segment.name
+                self.enforce_retention(cycle_time)
+
+            codes = np.array([self._source_code(source) for source in sources], dtype=layout["source"])
+            rows = {
+                "cycle_ts": np.full(len(content), to_epoch(cycle_time)),
+                "item_id": np.array([item_id(item.url) for item in content], dtype=layout["item_id"]),
+                "item_ts": columns["item_ts"],
+                "source": codes[columns["source"]],
+                "score": columns["score"],
+                "confidence": columns["confidence"],
+                "sentiment": columns["sentiment"],
+                "emotions": columns["emotions"],
+            }
+            for name, dtype in layout.items():
+                with open(segment / f"{name}.bin", "ab") as f:
+                    f.write(np.ascontiguousarray(rows[name], dtype=dtype).tobytes())
+
+    def enforce_retention(self, now: Optional[datetime] = None):
+        """Delete day segments older than the retention window."""
+        now = now or datetime.utcnow()
+        oldest = (now - timedelta(days=self.retention_days)).strftime(SEGMENT_FORMAT)
+        for segment in self._segments():
+            if segment.name < oldest:
+                shutil.rmtree(segment, ignore_errors=True)
+                self._layouts.pop(segment.name, None)
+                logger.info(f"Dropped analysis archive segment {segment.name}")
+
+    def read(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Rows of cycles in [start, end), as one array per column."""
+        start_ts = to_epoch(start) if start else -np.inf
+        end_ts = to_epoch(end) if end else np.inf
+        first = datetime.utcfromtimestamp(start_ts).strftime(SEGMENT_FORMAT) if start else ""
+        last = datetime.utcfromtimestamp(end_ts).strftime(SEGMENT_FORMAT) if end else "9999"
+
+        parts = {name: [np.empty((0, _width(name)), dtype=dtype)] for name, dtype in COLUMNS.items()}
+        for segment in self._segments():
+            if not first <= segment.name <= last:
+                continue
+            # A concurrent append may have written some columns already
+            count = min(self._rows(segment).values())
+            if count == 0:
+                continue
+            data = {
+                name: np.fromfile(segment / f"{name}.bin", dtype=dtype, count=count * _width(name))
+                for name, dtype in self._layout(segment).items()
+            }
+            mask = (data["cycle_ts"] >= start_ts) & (data["cycle_ts"] < end_ts)
+            for name, values in data.items():
+                parts[name].append(values.reshape(-1, _width(name))[mask].astype(COLUMNS[name]))
+
+        columns = {name: np.concatenate(values) for name, values in parts.items()}
+        return {name: values if _width(name) > 1 else values[:, 0] for name, values in columns.items()}
+
+    def reaggregate(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        weights: AggregationWeights = DEFAULT_WEIGHTS,
+    ) -> List[Dict]:
+        """Recompute the emotion state of every archived cycle in a range.
+
+        Entries follow the history entry format, oldest first.
+        """
+        rows = self.read(start, end)
+        if not len(rows["cycle_ts"]):
+            return []
+
+        cycles, groups = np.unique(rows["cycle_ts"], return_inverse=True)
+        columns = {name: rows[name].astype(np.float64) for name in ("score", "confidence", "sentiment", "emotions")}
+        columns["source"] = rows["source"].astype(np.int64)
+        age_hours = (rows["cycle_ts"] - rows["item_ts"]) / 3600
+        sources = list(self._load_sources())
+        aggregated = aggregate(columns, age_hours, groups, len(cycles), sources, weights)
+
+        # Items per source and cycle, in one pass
+        per_source = np.bincount(
+            groups * len(sources) + columns["source"], minlength=len(cycles) * len(sources)
+        ).reshape(len(cycles), len(sources))
+
+        emotion_names = list(EMOTIONS) + list(weights.secondary)
+        entries = []
+        for i, cycle_ts in enumerate(cycles):
+            if aggregated["total_weight"][i] == 0:
+                continue
+            entries.append({
+                "timestamp": datetime.utcfromtimestamp(cycle_ts).isoformat(),
+                "emotions": {name: float(aggregated[name][i]) for name in emotion_names},
+                "overallSentiment": float(aggregated["overall_sentiment"][i]),
+                "intensity": float(aggregated["intensity"][i]),
+                "sources": {source: int(n) for source, n in zip(sources, per_source[i]) if n},
+                "items": int(aggregated["items"][i]),
+            })
+        return entries
+
+    def stats(self) -> Dict:
+        """Row counts and disk usage per segment."""
+        segments = []
+        for segment in self._segments():
+            segments.append({
+                "day": segment.name,
+                "rows": min(self._rows(segment).values()),
+                "bytes": sum(p.stat().st_size for p in segment.glob("*.bin")),
+            })
+        return {
+            "retentionDays": self.retention_days,
+            "rows": sum(s["rows"] for s in segments),
+            "bytes": sum(s["bytes"] for s in segments),
+            "segments": segments,
+        }
+
+
+# Global instance
+analysis_archive = AnalysisArchive(ARCHIVE_DIR, retention_days=settings.archive_retention_days)
@@ -0,0 +1,103 @@
+"""Burst detection for topics against an exponentially weighted baseline."""
+import math
+from typing import Dict, List, Optional
+
+
+class BurstDetector:
+    """Scores topic mention rates against their own history.
+
+    Each topic keeps an exponentially weighted mean and variance of its
+    mentions per cycle. A topic's burst score is the z-score of its latest
+    count against the baseline from before that count, so perennial topics
+    score near zero and sudden spikes stand out.
+
+    Cycles where a topic is absent count as zero mentions. They are applied
+    lazily in closed form the next time the topic is touched, so an update
+    costs O(1) per topic present in the cycle.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        min_std: float = 1.0,
+        prune_every: int = 500,
+    ):
+        self.alpha = alpha
+        self.min_std = min_std
+        self.prune_every = prune_every
+        self.cycle = 0
+        # topic -> [mean, variance, last_cycle, last_score]
+        self._stats: Dict[str, List[float]] = {}
+
+    def observe(self, counts: Dict[str, float]):
+        """Fold one cycle's mention counts into the baselines."""
+        self.cycle += 1
+        alpha = self.alpha
+
+        for topic, value in counts.items():
+            stats = self._stats.get(topic)
+            if stats is None:
+                stats = self._stats[topic] = [0.0, 0.0, self.cycle - 1, 0.0]
+            else:
+                self._catch_up(stats, self.cycle - 1)
+
+            mean, variance = stats[0], stats[1]
+            stats[3] = self._z_score(value, mean, variance)
+
+            # Incremental exponentially weighted mean and variance
+            diff = value - mean
+            increment = alpha * diff
+            stats[0] = mean + increment
+            stats[1] = (1 - alpha) * (variance + diff * increment)
+            stats[2] = self.cycle
+
+        if self.prune_every and self.cycle % self.prune_every == 0:
+            self._prune()
+
+    def score(self, topic: str) -> float:
+        """Get the burst score of a topic in the latest cycle."""
+        stats = self._stats.get(topic)
+        if stats is None:
+            return 0.0
+        if stats[2] == self.cycle:
+            return stats[3]
+
+        # Absent this cycle: score a zero count against the decayed baseline
+        mean, variance = self._decayed(stats, self.cycle - 1)
+        return self._z_score(0.0, mean, variance)
+
+    def baseline(self, topic: str) -> Optional[Dict[str, float]]:
+        """Get the current baseline mean and standard deviation of a topic."""
+        stats = self._stats.get(topic)
+        if stats is None:
+            return None
+        mean, variance = self._decayed(stats, self.cycle)
+        return {"mean": mean, "std": math.sqrt(variance)}
+
+    def _z_score(self, value: float, mean: float, variance: float) -> float:
+        return (value - mean) / math.sqrt(variance + self.min_std ** 2)
+
+    def _decayed(self, stats: List[float], cycle: int):
+        """Baseline after applying zero counts for the cycles a topic missed."""
+        missed = cycle - stats[2]
+        if missed <= 0:
+            return stats[0], stats[1]
+
+        # Closed form of `missed` zero updates of the EW mean and variance
+        keep = (1 - self.alpha) ** missed
+        mean = stats[0] * keep
+        variance = keep * (stats[1] + stats[0] ** 2 * (1 - keep))
+        return mean, variance
+
+    def _catch_up(self, stats: List[float], cycle: int):
+        stats[0], stats[1] = self._decayed(stats, cycle)
+        stats[2] = cycle
+
+    def _prune(self):
+        """Drop topics whose baseline has decayed to nothing."""
+        stale = [
+            topic for topic, stats in self._stats.items()
+            if self._decayed(stats, self.cycle)[0] < 1e-3
+        ]
+        for topic in stale:
+            del self._stats[topic]
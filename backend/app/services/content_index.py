@@ -0,0 +1,246 @@
+"""Local full-text index over collected content, ranked with BM25."""
+import heapq
+import math
+import re
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.sentiment_analyzer import AnalysisResult
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class IndexedDocument:
+    """A collected item with its cached analysis."""
+
+    doc_id: int
+    url: str
+    title: str
+    text: str
+    source: str
+    score: int
+    timestamp: datetime
+    indexed_at: datetime
+    analysis: AnalysisResult
+    length: int
+
+    def to_content(self) -> Dict:
+        """Convert to the content dict shape used by topic search."""
+        return {
+            "title": self.title,
+            "text": self.text,
+            "source": self.source,
+            "score": self.score,
+            "url": self.url,
+        }
+
+
+class ContentIndex:
+    """In-process inverted index with BM25 ranking.
+
+    Every scraped item is indexed with its analysis, so a search that
+    local content can answer needs neither the network nor the model.
+    Items are keyed by URL; re-indexing an item refreshes its score and
+    analysis. The index holds at most `max_documents` items and drops
+    items indexed more than `retention_hours` ago.
+    """
+
+    def __init__(
+        self,
+        max_documents: int = 20000,
+        retention_hours: int = 48,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.max_documents = max_documents
+        self.retention = timedelta(hours=retention_hours)
+        self.k1 = k1
+        self.b = b
+
+        self._documents: Dict[int, IndexedDocument] = {}
+        self._by_url: Dict[str, int] = {}
+        # term -> {doc_id: term frequency}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # (indexed_at, doc_id) in insertion order, one record per document
+        self._order: Deque[Tuple[datetime, int]] = deque()
+        self._total_length = 0
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, item: Dict, analysis: AnalysisResult, now: Optional[datetime] = None):
+        """Index one item (title, text, url, source, score) with its analysis."""
+        url = item.get("url")
+        if not url:
+            return
+
+        now = now or datetime.utcnow()
+        doc_id = self._by_url.get(url)
+        if doc_id is not None:
+            document = self._documents[doc_id]
+            if document.text == item.get("text", ""):
+                document.score = item.get("score", document.score)
+                document.analysis = analysis
+                document.indexed_at = now
+                return
+            self._remove(doc_id)
+
+        terms = Counter(tokenize(f"{item.get('title', '')} {item.get('text', '')}"))
+        doc_id = self._next_id
+        self._next_id += 1
+
+        self._documents[doc_id] = IndexedDocument(
+            doc_id=doc_id,
+            url=url,
+            title=item.get("title", ""),
+            text=item.get("text", ""),
+            source=item.get("source", ""),
+            score=item.get("score", 0),
+            timestamp=item.get("timestamp") or now,
+            indexed_at=now,
+            analysis=analysis,
+            length=sum(terms.values()),
+        )
+        self._by_url[url] = doc_id
+        self._order.append((now, doc_id))
+        self._total_length += self._documents[doc_id].length
+
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+            postings[doc_id] = frequency
+
+        self._evict(now)
+
+    def get(self, url: str) -> Optional[IndexedDocument]:
+        """Get the indexed document for a URL."""
+        doc_id = self._by_url.get(url)
+        return self._documents[doc_id] if doc_id is not None else None
+
+    def add_batch(self, items: List[Dict], analyses: List[AnalysisResult]):
+        """Index items alongside their analyses."""
+        now = datetime.utcnow()
+        for item, analysis in zip(items, analyses):
+            self.add(item, analysis, now=now)
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[IndexedDocument, float]]:
+        """Find documents containing every query term, best BM25 score first."""
+        self._evict(datetime.utcnow())
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._documents:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if not all(postings):
+            return []
+
+        # Intersect from the rarest term
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for term_postings in postings[1:]:
+            candidates.intersection_update(term_postings)
+            if not candidates:
+                return []
+
+        total = len(self._documents)
+        avg_length = self._total_length / total
+        k1, b = self.k1, self.b
+        idfs = [
+            math.log(1 + (total - len(p) + 0.5) / (len(p) + 0.5))
+            for p in postings
+        ]
+
+        scored = []
+        for doc_id in candidates:
+            norm = k1 * (1 - b + b * self._documents[doc_id].length / avg_length)
+            score = 0.0
+            for idf, term_postings in zip(idfs, postings):
+                frequency = term_postings[doc_id]
+                score += idf * frequency * (k1 + 1) / (frequency + norm)
+            scored.append((score, doc_id))
+
+        return [
+            (self._documents[doc_id], score)
+            for score, doc_id in heapq.nlargest(limit, scored)
+        ]
+
+    def to_dict(self, limit: int) -> Dict:
+        """Snapshot the `limit` most recently indexed documents with their analyses."""
+        documents = heapq.nlargest(limit, self._documents.values(), key=lambda d: d.indexed_at)
+        return {
+            "documents": [
+                {
+                    "url": d.url,
+                    "title": d.title,
+                    "text": d.text,
+                    "source": d.source,
+                    "score": d.score,
+                    "timestamp": d.timestamp.isoformat(),
+                    "indexed_at": d.indexed_at.isoformat(),
+                    "analysis": asdict(d.analysis),
+                }
+                for d in reversed(documents)
+            ]
+        }
+
+    def restore(self, data: Dict):
+        """Re-index snapshotted documents, oldest first."""
+        for document in data.get("documents", []):
+            item = {**document, "timestamp": datetime.fromisoformat(document["timestamp"])}
+            self.add(
+                item,
+                AnalysisResult(**document["analysis"]),
+                now=datetime.fromisoformat(document["indexed_at"]),
+            )
+        self._evict(datetime.utcnow())
+
+    def _evict(self, now: datetime):
+        """Drop the oldest documents beyond the size or age limits."""
+        cutoff = now - self.retention
+        order = self._order
+        while order:
+            indexed_at, doc_id = order[0]
+            document = self._documents.get(doc_id)
+            if document is None:
+                order.popleft()
+                continue
+            if len(self._documents) <= self.max_documents and indexed_at >= cutoff:
+                break
+            order.popleft()
+            if document.indexed_at > indexed_at:
+                # Refreshed since it was queued: requeue instead of dropping
+                order.append((document.indexed_at, doc_id))
+            else:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: int):
+        document = self._documents.pop(doc_id)
+        if self._by_url.get(document.url) == doc_id:
+            del self._by_url[document.url]
+        self._total_length -= document.length
+
+        for term in set(tokenize(f"{document.title} {document.text}")):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+
+# Global instance
+content_index = ContentIndex(
+    max_documents=settings.content_index_max_documents,
+    retention_hours=settings.content_index_retention_hours,
+)
@@ -1,15 +1,26 @@
 """Aggregates sentiment from multiple sources into a unified emotion state."""
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional
 
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS, SCRAPE_DURATION, SCRAPE_ERRORS, SCRAPE_ITEMS
+from app.core.tracing import tracer
 from app.models.emotion import EmotionState
+from app.services.aggregation import aggregate, item_columns, to_epoch
+from app.services.analysis_archive import analysis_archive
 from app.services.sentiment_analyzer import SentimentAnalyzer, AnalysisResult
 from app.services.scrapers.base_scraper import ScrapedContent
 from app.services.scrapers.reddit_scraper import RedditScraper
 from app.services.scrapers.hackernews_scraper import HackerNewsScraper
 from app.services.scrapers.rss_scraper import RSSScraper
+from app.services.content_index import content_index
 from app.services.history_store import history_store, topic_extractor
+from app.services.topic_item_index import topic_item_index
+from app.services.watchlist import watchlist
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +35,7 @@ class EmotionAggregator:
             HackerNewsScraper(),
             RSSScraper(),
         ]
+        self.last_new_fraction = 0.0
 
     async def aggregate_all(self) -> EmotionState:
         """Scrape and aggregate sentiment from all sources."""
@@ -31,57 +43,118 @@ class EmotionAggregator:
         source_content: Dict[str, List[ScrapedContent]] = {}
 
         # Scrape from all sources
-        for scraper in self.scrapers:
-            try:
-                content = await scraper.scrape(limit=50)
-                all_content.extend(content)
-                source_content[scraper.source_name] = content
-                logger.info(f"Scraped {len(content)} items from {scraper.source_name}")
-            except Exception as e:
-                logger.error(f"Error scraping {scraper.source_name}: {e}")
+        with tracer.span("scrape"):
+            for scraper in self.scrapers:
+                started = time.perf_counter()
+                with tracer.span("scrape.source", source=scraper.source_name) as span:
+                    try:
+                        content = await scraper.scrape(limit=50)
+                        all_content.extend(content)
+                        source_content[scraper.source_name] = content
+                        SCRAPE_ITEMS.labels(scraper.source_name).inc(len(content))
+                        if span:
+                            span.set("items", len(content))
+                        logger.info(f"Scraped {len(content)} items from {scraper.source_name}")
+                    except Exception as e:
+                        SCRAPE_ERRORS.labels(scraper.source_name).inc()
+                        if span:
+                            span.error = repr(e)
+                        logger.error(f"Error scraping {scraper.source_name}: {e}")
+                SCRAPE_DURATION.labels(scraper.source_name).observe(time.perf_counter() - started)
 
         if not all_content:
             logger.warning("No content scraped from any source")
             return EmotionState(timestamp=datetime.utcnow())
 
-        # Analyze all content
-        texts = [c.text for c in all_content]
-        results = self.analyzer.analyze_batch(texts)
+        # Analyze new or edited items; rescraped ones reuse their indexed analysis
+        results = self._analyze(all_content)
+
+        # Index content for local topic search
+        content_dicts = [
+            {
+                "title": c.title,
+                "text": c.text,
+                "url": c.url,
+                "source": c.source,
+                "score": c.score,
+                "timestamp": c.timestamp,
+            }
+            for c in all_content
+        ]
+        new_items = sum(1 for c in content_dicts if content_index.get(c["url"]) is None)
+        self.last_new_fraction = new_items / len(content_dicts)
+        with tracer.span("index", new_items=new_items):
+            content_index.add_batch(content_dicts, results)
+
+            # Record watched terms from the same analysis results
+            watchlist.observe(content_dicts, results)
 
         # Extract topics from content
-        content_dicts = [{"title": c.title, "text": c.text} for c in all_content]
         result_dicts = [{"sentiment_score": r.sentiment_score} for r in results]
-        topics = topic_extractor.extract_topics(content_dicts, result_dicts, limit=10)
+        with tracer.span("extract_topics"):
+            topics = topic_extractor.extract_topics(
+                content_dicts, result_dicts, limit=10, item_index=topic_item_index
+            )
 
         # Aggregate results
-        emotion_state = self._aggregate_results(all_content, results, source_content)
+        with tracer.span("aggregate"):
+            emotion_state = self._aggregate_results(all_content, results, source_content)
 
         # Store in history
         sources_summary = {source: len(items) for source, items in source_content.items()}
-        history_store.add_entry(
-            emotion_state={
-                "happiness": emotion_state.happiness,
-                "sadness": emotion_state.sadness,
-                "anger": emotion_state.anger,
-                "fear": emotion_state.fear,
-                "surprise": emotion_state.surprise,
-                "disgust": emotion_state.disgust,
-                "confusion": emotion_state.confusion,
-                "pride": emotion_state.pride,
-                "loneliness": emotion_state.loneliness,
-                "pain": emotion_state.pain,
-                "overall_sentiment": emotion_state.overall_sentiment,
-                "intensity": emotion_state.intensity,
-            },
-            topics=topics,
-            sources_summary=sources_summary,
-        )
+        with tracer.span("persist"):
+            history_store.add_entry(
+                emotion_state={
+                    "happiness": emotion_state.happiness,
+                    "sadness": emotion_state.sadness,
+                    "anger": emotion_state.anger,
+                    "fear": emotion_state.fear,
+                    "surprise": emotion_state.surprise,
+                    "disgust": emotion_state.disgust,
+                    "confusion": emotion_state.confusion,
+                    "pride": emotion_state.pride,
+                    "loneliness": emotion_state.loneliness,
+                    "pain": emotion_state.pain,
+                    "overall_sentiment": emotion_state.overall_sentiment,
+                    "intensity": emotion_state.intensity,
+                },
+                topics=topics,
+                sources_summary=sources_summary,
+            )
+            if settings.archive_enabled:
+                # Keep the per-item inputs so past cycles can be re-aggregated
+                try:
+                    analysis_archive.append(all_content, results, emotion_state.timestamp)
+                except Exception as e:
+                    logger.error(f"Failed to archive analyses: {e}")
 
         # Store topics on the emotion state for API access
         self._last_topics = topics
 
         return emotion_state
 
+    def _analyze(self, content: List[ScrapedContent]) -> List[AnalysisResult]:
+        """Analyze items, reusing cached analyses of unchanged items."""
+        results: List[Optional[AnalysisResult]] = [None] * len(content)
+        pending = []
+        for i, item in enumerate(content):
+            document = content_index.get(item.url)
+            if document is not None and document.text == item.text:
+                results[i] = document.analysis
+            else:
+                pending.append(i)
+
+        CACHE_REQUESTS.labels("analysis", "hit").inc(len(content) - len(pending))
+        CACHE_REQUESTS.labels("analysis", "miss").inc(len(pending))
+
+        with tracer.span("analyze", items=len(pending), cached=len(content) - len(pending)):
+            texts = [content[i].text for i in pending]
+            analyzed = self.analyzer.analyze_batch(texts)
+
+        for i, result in zip(pending, analyzed):
+            results[i] = result
+        return results
+
     def get_last_topics(self) -> List[Dict]:
         """Get topics from the last aggregation."""
         return getattr(self, '_last_topics', [])
@@ -93,47 +166,17 @@ class EmotionAggregator:
         source_content: Dict[str, List[ScrapedContent]],
     ) -> EmotionState:
         """Aggregate analysis results into a single emotion state."""
+        now = datetime.utcnow()
         if not results:
-            return EmotionState(timestamp=datetime.utcnow())
-
-        # Weighted aggregation based on engagement (score) and recency
-        total_weight = 0.0
-        weighted_emotions: Dict[str, float] = {
-            "happiness": 0.0,
-            "sadness": 0.0,
-            "anger": 0.0,
-            "fear": 0.0,
-            "surprise": 0.0,
-            "disgust": 0.0,
-        }
-        weighted_sentiment = 0.0
-
-        for i, (item, result) in enumerate(zip(content, results)):
-            # Weight based on engagement and recency
-            engagement_weight = 1.0 + (item.score / 1000)  # Normalize score
-            recency_weight = self._calculate_recency_weight(item.timestamp)
-            confidence_weight = result.confidence
-
-            weight = engagement_weight * recency_weight * confidence_weight
-            total_weight += weight
-
-            # Accumulate weighted emotions
-            for emotion, value in result.emotions.items():
-                if emotion in weighted_emotions:
-                    weighted_emotions[emotion] += value * weight
-
-            weighted_sentiment += result.sentiment_score * weight
-
-        if total_weight == 0:
-            return EmotionState(timestamp=datetime.utcnow())
-
-        # Normalize
-        for emotion in weighted_emotions:
-            weighted_emotions[emotion] /= total_weight
-            weighted_emotions[emotion] = min(1.0, max(0.0, weighted_emotions[emotion]))
+            return EmotionState(timestamp=now)
 
-        weighted_sentiment /= total_weight
-        weighted_sentiment = min(1.0, max(-1.0, weighted_sentiment))
+        # Weighted by engagement (score), recency and model confidence
+        columns, sources = item_columns(content, results)
+        age_hours = (to_epoch(now) - columns["item_ts"]) / 3600
+        groups = np.zeros(len(results), dtype=np.int64)
+        aggregated = aggregate(columns, age_hours, groups, 1, sources)
+        if aggregated["total_weight"][0] == 0:
+            return EmotionState(timestamp=now)
 
         # Calculate source contributions
         source_contributions = {}
@@ -141,38 +184,8 @@ class EmotionAggregator:
         for source, items in source_content.items():
             source_contributions[source] = len(items) / total_items if total_items > 0 else 0
 
-        # Calculate secondary emotions
-        confusion = min(1.0, weighted_emotions["surprise"] * 0.5 + weighted_emotions["fear"] * 0.3)
-        pride = min(1.0, weighted_emotions["happiness"] * 0.3)
-        loneliness = min(1.0, weighted_emotions["sadness"] * 0.5)
-        pain = min(1.0, weighted_emotions["sadness"] * 0.3 + weighted_emotions["fear"] * 0.2)
-
-        # Calculate intensity based on variance of emotions
-        emotion_values = list(weighted_emotions.values())
-        avg_emotion = sum(emotion_values) / len(emotion_values)
-        intensity = min(1.0, sum(abs(v - avg_emotion) for v in emotion_values) / len(emotion_values) * 3)
-
         return EmotionState(
-            happiness=weighted_emotions["happiness"],
-            sadness=weighted_emotions["sadness"],
-            anger=weighted_emotions["anger"],
-            fear=weighted_emotions["fear"],
-            surprise=weighted_emotions["surprise"],
-            disgust=weighted_emotions["disgust"],
-            confusion=confusion,
-            pride=pride,
-            loneliness=loneliness,
-            pain=pain,
-            overall_sentiment=weighted_sentiment,
-            intensity=max(0.3, intensity),
-            timestamp=datetime.utcnow(),
+            **{name: float(values[0]) for name, values in aggregated.items() if name not in ("total_weight", "items")},
+            timestamp=now,
             source_contributions=source_contributions,
         )
-
-    def _calculate_recency_weight(self, timestamp: datetime) -> float:
-        """Calculate weight based on how recent the content is."""
-        age_hours = (datetime.utcnow() - timestamp).total_seconds() / 3600
-
-        # Exponential decay: halve weight every 24 hours
-        decay_rate = 0.693 / 24  # ln(2) / 24 hours
-        return max(0.1, 2.718 ** (-decay_rate * age_hours))
@@ -0,0 +1,242 @@
+"""Bounded-memory heavy-hitter tracking for topics.
+
+Combines a Space-Saving summary (which topics are heavy) with a Count-Min
+Sketch (how heavy any topic is) under exponential time decay. Memory is
+fixed by the sketch dimensions and the Space-Saving capacity, regardless of
+how many distinct topics are seen.
+"""
+import base64
+import hashlib
+import json
+import logging
+import math
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Rescale stored weights before the forward-decay factor overflows
+_MAX_EXPONENT = 50.0
+
+
+class CountMinSketch:
+    """Count-Min Sketch with `depth` rows of `width` counters.
+
+    Estimates never undercount. With probability 1 - exp(-depth), an
+    estimate exceeds the true count by at most (e / width) * total.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0.0
+        self._table = array("d", bytes(8 * width * depth))
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def _cells(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * self.depth).digest()
+        return [
+            row * self.width + int.from_bytes(digest[row * 8:row * 8 + 8], "little") % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, key: str, amount: float = 1.0) -> float:
+        """Add `amount` to `key` and return its new estimate."""
+        table = self._table
+        estimate = math.inf
+        for cell in self._cells(key):
+            table[cell] += amount
+            estimate = min(estimate, table[cell])
+        self.total += amount
+        return estimate
+
+    def estimate(self, key: str) -> float:
+        """Estimate the count of `key`."""
+        return min(self._table[cell] for cell in self._cells(key))
+
+    def scale(self, factor: float):
+        """Multiply every counter by `factor`."""
+        table = self._table
+        for i in range(len(table)):
+            table[i] *= factor
+        self.total *= factor
+
+    def to_dict(self) -> Dict:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "table": base64.b64encode(self._table.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CountMinSketch":
+        sketch = cls(width=data["width"], depth=data["depth"])
+        sketch.total = data["total"]
+        sketch._table = array("d", base64.b64decode(data["table"]))
+        return sketch
+
+
+class SpaceSaving:
+    """Space-Saving top-k summary with at most `capacity` monitored keys.
+
+    A key's count overestimates its true count by at most its recorded
+    error, which is never more than total / capacity.
+    """
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        # key -> [count, error, sentiment_sum]
+        self.counters: Dict[str, List[float]] = {}
+
+    def add(self, key: str, amount: float = 1.0, sentiment: float = 0.0):
+        """Count `amount` occurrences of `key`."""
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += amount
+            counter[2] += sentiment
+            return
+
+        if len(self.counters) < self.capacity:
+            self.counters[key] = [amount, 0.0, sentiment]
+            return
+
+        # Replace the smallest counter; its count becomes the new key's error
+        victim = min(self.counters, key=lambda k: self.counters[k][0])
+        floor = self.counters.pop(victim)[0]
+        self.counters[key] = [floor + amount, floor, sentiment]
+
+    def scale(self, factor: float):
+        """Multiply every counter by `factor`."""
+        for counter in self.counters.values():
+            counter[0] *= factor
+            counter[1] *= factor
+            counter[2] *= factor
+
+
+class HeavyHitterTracker:
+    """Time-decayed heavy-hitter topics in fixed memory.
+
+    Uses forward decay: each update is weighted by exp((t - landmark) / tau),
+    and queries divide by the same factor at query time, so decay costs
+    nothing per update. Weights are rescaled to a new landmark before the
+    factor grows large.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        width: int = 2048,
+        depth: int = 4,
+        half_life_hours: float = 6.0,
+    ):
+        self.half_life_hours = half_life_hours
+        self.sketch = CountMinSketch(width=width, depth=depth)
+        self.summary = SpaceSaving(capacity=capacity)
+        self.landmark = 0.0
+
+    @property
+    def _tau(self) -> float:
+        return self.half_life_hours * 3600 / math.log(2)
+
+    def _weight(self, timestamp: datetime) -> float:
+        seconds = (timestamp - _EPOCH).total_seconds()
+        if not self.landmark:
+            self.landmark = seconds
+
+        exponent = (seconds - self.landmark) / self._tau
+        if exponent > _MAX_EXPONENT:
+            factor = math.exp(-exponent)
+            self.sketch.scale(factor)
+            self.summary.scale(factor)
+            self.landmark = seconds
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _decay(self, now: datetime) -> float:
+        seconds = (now - _EPOCH).total_seconds()
+        return math.exp(-(seconds - self.landmark) / self._tau) if self.landmark else 1.0
+
+    def add(self, topic: str, count: float = 1.0, sentiment: float = 0.0, timestamp: Optional[datetime] = None):
+        """Record `count` mentions of `topic` at `timestamp`."""
+        weight = self._weight(timestamp or datetime.utcnow())
+        self.sketch.add(topic, count * weight)
+        self.summary.add(topic, count * weight, sentiment * weight)
+
+    def estimate(self, topic: str, now: Optional[datetime] = None) -> float:
+        """Estimate the decayed mention count of any topic."""
+        return self.sketch.estimate(topic) * self._decay(now or datetime.utcnow())
+
+    def top(self, limit: int = 10, now: Optional[datetime] = None) -> List[Dict]:
+        """Get the heaviest topics with their decayed counts and error bounds."""
+        decay = self._decay(now or datetime.utcnow())
+        sketch_error = self.sketch.epsilon * self.sketch.total
+
+        ranked = []
+        for topic, (count, error, sentiment_sum) in self.summary.counters.items():
+            # Both structures only overcount, so the smaller estimate is tighter
+            estimate = min(count, self.sketch.estimate(topic))
+            ranked.append({
+                "topic": topic,
+                "mentions": estimate * decay,
+                "avgSentiment": sentiment_sum / count if count else 0.0,
+                "errorBound": min(error, sketch_error) * decay,
+            })
+
+        ranked.sort(key=lambda x: x["mentions"], reverse=True)
+        return ranked[:limit]
+
+    def to_dict(self) -> Dict:
+        return {
+            "half_life_hours": self.half_life_hours,
+            "landmark": self.landmark,
+            "capacity": self.summary.capacity,
+            "counters": self.summary.counters,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HeavyHitterTracker":
+        tracker = cls(
+            capacity=data["capacity"],
+            width=data["sketch"]["width"],
+            depth=data["sketch"]["depth"],
+            half_life_hours=data["half_life_hours"],
+        )
+        tracker.landmark = data["landmark"]
+        tracker.summary.counters = data["counters"]
+        tracker.sketch = CountMinSketch.from_dict(data["sketch"])
+        return tracker
+
+    def save(self, path: Path):
+        """Snapshot the tracker state to disk."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.error(f"Failed to save topic tracker: {e}")
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "HeavyHitterTracker":
+        """Restore a tracker snapshot, or start empty if there is none."""
+        try:
+            if path.exists():
+                with open(path, "r") as f:
+                    return cls.from_dict(json.load(f))
+        except Exception as e:
+            logger.error(f"Failed to load topic tracker: {e}")
+        return cls(**kwargs)
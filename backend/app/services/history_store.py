@@ -1,16 +1,30 @@
 """Simple JSON-based storage for sentiment history with topics."""
+import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 from collections import Counter
+import math
 import re
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import HISTORY_WRITE_DURATION
+from app.core.tracing import tracer
+from app.core.response_cache import response_cache
+from app.services.burst_detector import BurstDetector
+from app.services.heavy_hitters import HeavyHitterTracker
+from app.services.topic_index import TopicIndex
+from app.services.topic_item_index import TopicItemIndex
 
 logger = logging.getLogger(__name__)
 
 # Storage file path
 HISTORY_FILE = Path(__file__).parent.parent.parent / "data" / "sentiment_history.json"
+TOPIC_SKETCH_FILE = Path(__file__).parent.parent.parent / "data" / "topic_sketch.json"
 
 
 class SentimentHistoryStore:
@@ -18,7 +32,43 @@ class SentimentHistoryStore:
 
     def __init__(self):
         self.history: List[Dict] = []
-        self._load()
+        self.topic_index = TopicIndex()
+        self.topic_tracker = HeavyHitterTracker(
+            capacity=settings.topic_tracker_capacity,
+            width=settings.topic_sketch_width,
+            depth=settings.topic_sketch_depth,
+            half_life_hours=settings.topic_decay_half_life_hours,
+        )
+        self.burst_detector = BurstDetector(alpha=settings.burst_alpha)
+        self.loaded = False
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        """Load stored history and the topic sketch, once.
+
+        Startup calls this from a background thread; a read or write that
+        comes first loads synchronously instead. Request handlers use
+        `ensure_loaded` so they never wait for the load on the event loop.
+        """
+        if self.loaded:
+            return
+        with self._load_lock:
+            if self.loaded:
+                return
+            self.topic_tracker = HeavyHitterTracker.load(
+                TOPIC_SKETCH_FILE,
+                capacity=settings.topic_tracker_capacity,
+                width=settings.topic_sketch_width,
+                depth=settings.topic_sketch_depth,
+                half_life_hours=settings.topic_decay_half_life_hours,
+            )
+            self._load()
+            self.loaded = True
+
+    async def ensure_loaded(self):
+        """Load in a worker thread unless loading has finished."""
+        if not self.loaded:
+            await asyncio.to_thread(self.load)
 
     def _load(self):
         """Load history from file."""
@@ -31,19 +81,33 @@ class SentimentHistoryStore:
             logger.error(f"Failed to load history: {e}")
             self.history = []
 
+        self.topic_index.rebuild(self.history)
+        for entry in self.history:
+            self.burst_detector.observe(self._topic_counts(entry.get("topics", [])))
+
+        # Seed the tracker from history when there is no snapshot yet
+        if not self.topic_tracker.landmark:
+            for entry in self.history:
+                self._track_topics(entry.get("topics", []), datetime.fromisoformat(entry["timestamp"]))
+
     def _save(self):
         """Save history to file."""
-        try:
-            HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(HISTORY_FILE, 'w') as f:
-                json.dump(self.history, f, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"Failed to save history: {e}")
+        started = time.perf_counter()
+        with tracer.span("history.save", entries=len(self.history)):
+            try:
+                HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+                with open(HISTORY_FILE, 'w') as f:
+                    json.dump(self.history, f, indent=2, default=str)
+            except Exception as e:
+                logger.error(f"Failed to save history: {e}")
+        HISTORY_WRITE_DURATION.observe(time.perf_counter() - started)
 
     def add_entry(self, emotion_state: Dict, topics: List[Dict], sources_summary: Dict):
         """Add a new history entry."""
+        self.load()
+        now = datetime.utcnow()
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now.isoformat(),
             "emotions": {
                 "happiness": emotion_state.get("happiness", 0),
                 "sadness": emotion_state.get("sadness", 0),
@@ -64,14 +128,33 @@ class SentimentHistoryStore:
         }
 
         self.history.append(entry)
+        self.topic_index.add(now, topics, entry["dominantEmotion"])
+        self._track_topics(topics, now)
+        self.burst_detector.observe(self._topic_counts(topics))
 
         # Keep last 1000 entries (about 8 hours at 30s intervals)
         if len(self.history) > 1000:
             self.history = self.history[-1000:]
 
         self._save()
+        self.topic_tracker.save(TOPIC_SKETCH_FILE)
+        response_cache.bump()
         logger.info(f"Added history entry with {len(topics)} topics")
 
+    def _track_topics(self, topics: List[Dict], timestamp: datetime):
+        """Feed topic mentions into the heavy-hitter tracker."""
+        for topic in topics:
+            count = topic.get("count", 1)
+            self.topic_tracker.add(topic["topic"], count, topic.get("sentiment", 0) * count, timestamp)
+
+    @staticmethod
+    def _topic_counts(topics: List[Dict]) -> Dict[str, float]:
+        """Sum mention counts per topic for one entry."""
+        counts: Dict[str, float] = {}
+        for topic in topics:
+            counts[topic["topic"]] = counts.get(topic["topic"], 0) + topic.get("count", 1)
+        return counts
+
     def _get_dominant_emotion(self, emotion_state: Dict) -> str:
         """Get the dominant emotion name."""
         emotions = {
@@ -95,6 +178,7 @@ class SentimentHistoryStore:
         limit: int = 100
     ) -> List[Dict]:
         """Get history entries within date range."""
+        self.load()
         result = self.history
 
         if from_date:
@@ -112,40 +196,26 @@ class SentimentHistoryStore:
         # Return most recent first
         return list(reversed(result[-limit:]))
 
-    def get_trending_topics(self, hours: int = 1, limit: int = 10) -> List[Dict]:
-        """Get trending topics from recent history."""
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+    def get_trending_topics(self, hours: int = 1, limit: int = 10, sort: str = "mentions") -> List[Dict]:
+        """Get trending topics from recent history, ranked by mentions or burst score."""
+        self.load()
+        if sort == "burst":
+            trending = self.topic_index.get_trending(hours=hours, limit=None)
+        else:
+            trending = self.topic_index.get_trending(hours=hours, limit=limit)
 
-        topic_stats = {}
+        for topic in trending:
+            topic["burstScore"] = self.burst_detector.score(topic["topic"])
 
-        for entry in self.history:
-            entry_time = datetime.fromisoformat(entry["timestamp"])
-            if entry_time >= cutoff:
-                for topic in entry.get("topics", []):
-                    name = topic["topic"]
-                    if name not in topic_stats:
-                        topic_stats[name] = {
-                            "count": 0,
-                            "sentiment_sum": 0,
-                            "emotions": Counter()
-                        }
-                    topic_stats[name]["count"] += topic.get("count", 1)
-                    topic_stats[name]["sentiment_sum"] += topic.get("sentiment", 0)
-                    topic_stats[name]["emotions"][entry["dominantEmotion"]] += 1
-
-        # Calculate averages and sort by count
-        trending = []
-        for name, stats in topic_stats.items():
-            trending.append({
-                "topic": name,
-                "mentions": stats["count"],
-                "avgSentiment": stats["sentiment_sum"] / max(stats["count"], 1),
-                "dominantEmotion": stats["emotions"].most_common(1)[0][0] if stats["emotions"] else "neutral"
-            })
-
-        trending.sort(key=lambda x: x["mentions"], reverse=True)
+        if sort == "burst":
+            trending.sort(key=lambda x: x["burstScore"], reverse=True)
         return trending[:limit]
 
+    def get_heavy_hitters(self, limit: int = 10) -> List[Dict]:
+        """Get time-decayed heavy-hitter topics with error bounds."""
+        self.load()
+        return self.topic_tracker.top(limit=limit)
+
 
 class TopicExtractor:
     """Extracts topics from scraped content."""
@@ -245,74 +315,178 @@ class TopicExtractor:
         'created': 'create', 'creates': 'create', 'creating': 'create',
     }
 
+    # Words of 3+ letters; digits, punctuation and other letters end a word
+    WORD_PATTERN = re.compile(r"\b[a-z]{3,}\b")
+
+    # Phrase detection: adjacent word pairs (extended to triples) are kept
+    # when they recur and their normalized PMI clears the threshold. Smaller
+    # batches are too small for co-occurrence counts to mean anything.
+    MIN_PHRASE_DOCS = 20
+    MIN_PHRASE_COUNT = 2
+    MIN_PHRASE_SCORE = 0.5
+
     def extract_topics(
         self,
         contents: List[Dict],
         results: List[Dict],
-        limit: int = 10
+        limit: int = 10,
+        item_index: Optional[TopicItemIndex] = None,
     ) -> List[Dict]:
-        """Extract topics from scraped content with sentiment association."""
-        word_stats = {}
+        """Extract topics from scraped content with sentiment association.
 
-        for content, result in zip(contents, results):
-            # Get title - most important for topic extraction
-            title = content.get("title", "") or content.get("text", "")[:100]
+        When `item_index` is given, each item is indexed under its topics so
+        the posts behind a topic can be looked up later.
+        """
+        contents = contents[:len(results)]
+        # Get title - most important for topic extraction
+        titles = [content.get("title", "") or content.get("text", "")[:100] for content in contents]
+        sentiments = [result.get("sentiment_score", 0) if result else 0 for result in results[:len(contents)]]
 
-            # Extract meaningful words (2+ chars, not numbers, not stop words)
-            words = self._extract_words(title)
-            sentiment = result.get("sentiment_score", 0) if result else 0
+        tokenized = [self._tokenize(title) for title in titles]
+        terms_by_doc = [words for words, _ in tokenized]
+        if len(titles) >= self.MIN_PHRASE_DOCS:
+            terms_by_doc = self._apply_phrases(tokenized)
 
-            for word in words:
-                if word not in word_stats:
-                    word_stats[word] = {
+        word_stats = {}
+        for content, terms, sentiment in zip(contents, terms_by_doc, sentiments):
+            if item_index is not None:
+                item_index.add(content, sentiment, terms)
+            for term in terms:
+                if term not in word_stats:
+                    word_stats[term] = {
                         "count": 0,
                         "sentiment_sum": 0,
                     }
-                word_stats[word]["count"] += 1
-                word_stats[word]["sentiment_sum"] += sentiment
-
-        # Convert to list and sort by frequency
-        topics = []
-        for word, stats in word_stats.items():
-            if stats["count"] >= 2:  # Only include words that appear 2+ times
-                topics.append({
-                    "topic": word,
-                    "count": stats["count"],
-                    "sentiment": stats["sentiment_sum"] / stats["count"]
-                })
-
+                word_stats[term]["count"] += 1
+                word_stats[term]["sentiment_sum"] += sentiment
+
+        # Only include terms that appear 2+ times
+        topics = [
+            {"topic": term, "count": stats["count"], "sentiment": stats["sentiment_sum"] / stats["count"]}
+            for term, stats in word_stats.items()
+            if stats["count"] >= 2
+        ]
         topics.sort(key=lambda x: x["count"], reverse=True)
         return topics[:limit]
 
     def _extract_words(self, text: str) -> List[str]:
         """Extract meaningful words from text."""
-        # Lowercase and extract words (at least 3 chars)
+        return self._tokenize(text)[0]
+
+    def _tokenize(self, text: str) -> Tuple[List[str], Set[str]]:
+        """Split text into its meaningful words and candidate phrases.
+
+        Words are unique and in order of first appearance. Phrases are runs
+        of two or three words separated only by whitespace; stop words,
+        short words and punctuation break runs, so "the supreme court's
+        ruling" yields only "supreme court".
+        """
         text = text.lower()
-        words = re.findall(r'\b[a-z]{3,}\b', text)
+        words: List[str] = []
+        phrases: Set[str] = set()
+        run: List[str] = []
+        run_end = 0
+
+        for match in self.WORD_PATTERN.finditer(text):
+            word = match.group()
+            if not text[run_end:match.start()].isspace():
+                run = []
+            run_end = match.end()
 
-        # Filter stop words, generic words, and normalize stems
-        filtered = []
-        seen = set()
-        for word in words:
             # Skip stop words and generic words
             if word in self.STOP_WORDS or word in self.GENERIC_WORDS:
+                run = []
                 continue
 
             # Normalize word using stem mappings
             normalized = self.STEM_MAPPINGS.get(word, word)
 
-            # Skip if already seen (after normalization)
-            if normalized in seen:
-                continue
+            run = run[-2:] + [normalized]
+            for n in (2, 3):
+                if len(run) >= n:
+                    phrases.add(" ".join(run[-n:]))
+
+            if normalized not in words:
+                words.append(normalized)
+
+        return words, phrases
+
+    def _apply_phrases(self, tokenized: List[Tuple[List[str], Set[str]]]) -> List[List[str]]:
+        """Detect recurring phrases and put them in place of the words they cover."""
+        total_docs = len(tokenized)
+        word_counts = Counter(word for words, _ in tokenized for word in words)
+        candidate_counts = Counter(phrase for _, phrases in tokenized for phrase in phrases)
+
+        bigrams = self._score_phrases(
+            word_counts,
+            {phrase: count for phrase, count in candidate_counts.items() if phrase.count(" ") == 1},
+            total_docs,
+        )
+        # A triple is only a candidate when both of its pairs are phrases
+        trigrams = self._score_phrases(
+            word_counts,
+            {
+                phrase: count
+                for phrase, count in candidate_counts.items()
+                if phrase.count(" ") == 2 and _pairs_of(phrase) <= bigrams
+            },
+            total_docs,
+        )
+        accepted = bigrams | trigrams
+
+        terms_by_doc = []
+        for words, phrases in tokenized:
+            found = accepted & phrases
+            terms_by_doc.append(self._resolve_phrases(words, found) if found else words)
+        return terms_by_doc
 
-            # Skip very short words after normalization
-            if len(normalized) < 3:
+    def _score_phrases(
+        self,
+        word_counts: Counter,
+        phrase_counts: Dict[str, int],
+        total_docs: int,
+    ) -> Set[str]:
+        """Select phrases whose words co-occur far more often than by chance."""
+        accepted = set()
+        for phrase, count in phrase_counts.items():
+            if count < self.MIN_PHRASE_COUNT:
                 continue
+            words = phrase.split(" ")
+            joins = len(words) - 1
+
+            # Generalized normalized PMI: 1.0 when the words only ever appear together
+            pmi = math.log(count) + joins * math.log(total_docs) - sum(math.log(word_counts[w]) for w in words)
+            bound = joins * (math.log(total_docs) - math.log(count))
+            score = pmi / bound if bound > 0 else 1.0
+
+            if score >= self.MIN_PHRASE_SCORE:
+                accepted.add(phrase)
+
+        return accepted
+
+    @staticmethod
+    def _resolve_phrases(words: List[str], found: Set[str]) -> List[str]:
+        """Replace words covered by accepted phrases with the phrases themselves."""
+        kept: List[str] = []
+        # Longest phrases first so "a b c" absorbs "a b" and "b c"
+        for phrase in sorted(found, key=lambda phrase: (-phrase.count(" "), phrase)):
+            if not any(f" {phrase} " in f" {longer} " for longer in kept):
+                kept.append(phrase)
+
+        # Each phrase takes the place of its first word
+        covered = {word for phrase in kept for word in phrase.split(" ")}
+        terms = []
+        for word in words:
+            if word in covered:
+                terms.extend(phrase for phrase in kept if phrase.split(" ", 1)[0] == word)
+            else:
+                terms.append(word)
+        return terms
 
-            filtered.append(normalized)
-            seen.add(normalized)
 
-        return filtered
+def _pairs_of(trigram: str) -> Set[str]:
+    a, b, c = trigram.split(" ")
+    return {f"{a} {b}", f"{b} {c}"}
 
 
 # Global instances
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import List
 import httpx
 
+from app.core.metrics import http_status_hooks
 from app.services.scrapers.base_scraper import BaseScraper, ScrapedContent
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ class HackerNewsScraper(BaseScraper):
         """Scrape top stories from HackerNews."""
         contents = []
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(event_hooks=http_status_hooks(self.source_name)) as client:
             try:
                 # Get top story IDs
                 response = await client.get(
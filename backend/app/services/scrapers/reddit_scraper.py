@@ -1,14 +1,18 @@
 """Reddit content scraper using the official API."""
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import http_status_hooks
 from app.services.scrapers.base_scraper import BaseScraper, ScrapedContent
 
 logger = logging.getLogger(__name__)
 
+# Refresh the OAuth token this long before Reddit expires it
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
 
 class RedditScraper(BaseScraper):
     """Scraper for Reddit content using the official API."""
@@ -51,7 +55,8 @@ class RedditScraper(BaseScraper):
             data = response.json()
             self._access_token = data.get("access_token", "")
             # Token expires in 1 hour, refresh a bit earlier
-            self._token_expires = datetime.utcnow()
+            expires_in = timedelta(seconds=data.get("expires_in", 3600))
+            self._token_expires = datetime.utcnow() + expires_in - TOKEN_EXPIRY_MARGIN
             return self._access_token
 
     async def scrape(self, limit: int = 100) -> List[ScrapedContent]:
@@ -59,7 +64,7 @@ class RedditScraper(BaseScraper):
         contents = []
         posts_per_sub = max(10, limit // len(self.subreddits))
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(event_hooks=http_status_hooks(self.source_name)) as client:
             token = await self._get_access_token()
             headers = {"User-Agent": settings.reddit_user_agent}
 
@@ -1,10 +1,12 @@
 """RSS feed scraper for news and blog content."""
 import logging
+from dataclasses import asdict
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 import httpx
 import feedparser
 
+from app.core.metrics import http_status_hooks
 from app.services.scrapers.base_scraper import BaseScraper, ScrapedContent
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,8 @@ class RSSScraper(BaseScraper):
 
     def __init__(self, feeds: List[str] = None):
         self.feeds = feeds or self.DEFAULT_FEEDS
+        # feed URL -> ETag/Last-Modified and the items of the last full response
+        self._feed_cache: Dict[str, Dict] = {}
 
     @property
     def source_name(self) -> str:
@@ -34,21 +38,35 @@ class RSSScraper(BaseScraper):
         contents = []
         items_per_feed = max(10, limit // len(self.feeds))
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(event_hooks=http_status_hooks(self.source_name)) as client:
             for feed_url in self.feeds:
                 try:
+                    # Conditional GET: unchanged feeds answer 304 with no body
+                    cached = self._feed_cache.get(feed_url)
+                    headers = {}
+                    if cached and cached.get("etag"):
+                        headers["If-None-Match"] = cached["etag"]
+                    if cached and cached.get("last_modified"):
+                        headers["If-Modified-Since"] = cached["last_modified"]
+
                     response = await client.get(
                         feed_url,
+                        headers=headers,
                         timeout=10.0,
                         follow_redirects=True,
                     )
 
+                    if response.status_code == 304 and cached:
+                        contents.extend(cached["items"])
+                        continue
+
                     if response.status_code != 200:
                         logger.warning(f"RSS fetch error for {feed_url}: {response.status_code}")
                         continue
 
                     # Parse the feed
                     feed = feedparser.parse(response.text)
+                    feed_items = []
 
                     for entry in feed.entries[:items_per_feed]:
                         title = entry.get("title", "")
@@ -70,7 +88,7 @@ class RSSScraper(BaseScraper):
                             except Exception:
                                 pass
 
-                        contents.append(ScrapedContent(
+                        feed_items.append(ScrapedContent(
                             text=text[:1000],
                             source=self.source_name,
                             url=entry.get("link", ""),
@@ -80,9 +98,45 @@ class RSSScraper(BaseScraper):
                             title=title,
                         ))
 
+                    contents.extend(feed_items)
+                    self._feed_cache[feed_url] = {
+                        "etag": response.headers.get("etag"),
+                        "last_modified": response.headers.get("last-modified"),
+                        "items": feed_items,
+                    }
+
                 except Exception as e:
                     logger.error(f"Error scraping RSS feed {feed_url}: {e}")
                     continue
 
         logger.info(f"Scraped {len(contents)} items from RSS feeds")
         return contents[:limit]
+
+    def to_dict(self) -> Dict:
+        """Snapshot feed validators and items so a restart can send conditional GETs."""
+        return {
+            feed_url: {
+                "etag": cached["etag"],
+                "last_modified": cached["last_modified"],
+                "items": [
+                    {**asdict(item), "timestamp": item.timestamp.isoformat()}
+                    for item in cached["items"]
+                ],
+            }
+            for feed_url, cached in self._feed_cache.items()
+            if cached["etag"] or cached["last_modified"]
+        }
+
+    def restore(self, data: Dict):
+        """Restore feed validators and items from a snapshot."""
+        for feed_url, cached in data.items():
+            if feed_url not in self.feeds:
+                continue
+            self._feed_cache[feed_url] = {
+                "etag": cached.get("etag"),
+                "last_modified": cached.get("last_modified"),
+                "items": [
+                    ScrapedContent(**{**item, "timestamp": datetime.fromisoformat(item["timestamp"])})
+                    for item in cached.get("items", [])
+                ],
+            }
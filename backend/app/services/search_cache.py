@@ -0,0 +1,151 @@
+"""TTL cache with request coalescing for topic searches."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_HITS = CACHE_REQUESTS.labels("search", "hit")
+_STALE_HITS = CACHE_REQUESTS.labels("search", "stale")
+_MISSES = CACHE_REQUESTS.labels("search", "miss")
+
+
+@dataclass
+class _Entry:
+    """A cached search result and when it was computed."""
+
+    value: Dict
+    created: float
+
+
+class SearchCache:
+    """Caches search results by normalized query.
+
+    Results younger than `ttl` are served as-is. Results younger than
+    `stale_ttl` are served immediately while a single background refresh
+    runs (stale-while-revalidate). Anything older, or a miss, waits for a
+    fresh computation that concurrent identical searches share.
+    """
+
+    def __init__(self, ttl: float = 60, stale_ttl: float = 600, max_entries: int = 256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshes: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize a query so equivalent searches share a cache entry."""
+        return " ".join(query.lower().split())
+
+    async def get(self, query: str, compute: Callable[[str], Awaitable[Dict]]) -> Dict:
+        """Get the result for `query`, computing it with `compute` if needed."""
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        age = time.monotonic() - entry.created if entry else None
+
+        if entry is not None and age < self.ttl:
+            self.hits += 1
+            _HITS.inc()
+            self._entries.move_to_end(key)
+            return entry.value
+
+        if entry is not None and age < self.stale_ttl:
+            self.stale_hits += 1
+            _STALE_HITS.inc()
+            if not self._flight.in_flight(key):
+                task = asyncio.create_task(self._flight.do(key, lambda: self._refresh(key, compute)))
+                self._refreshes.add(task)
+                task.add_done_callback(self._refresh_done)
+            return entry.value
+
+        self.misses += 1
+        _MISSES.inc()
+        return await self._flight.do(key, lambda: self._refresh(key, compute))
+
+    async def stream(
+        self, query: str, compute: Callable[[str], AsyncIterator[Dict]]
+    ) -> AsyncIterator[Dict]:
+        """Like `get` for a streamed search, yielding its events as they come.
+
+        `compute` yields "partial" events and a final "result" event. When
+        this call starts the search, its partial events are passed through
+        and concurrent identical searches join it; otherwise only the
+        cached or joined result is yielded.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def collect(key: str) -> Dict:
+            result: Dict = {}
+            async for event in compute(key):
+                if event["event"] == "result":
+                    result = event["data"]
+                else:
+                    events.put_nowait(event)
+            return result
+
+        search = asyncio.ensure_future(self.get(query, collect))
+        try:
+            while not search.done():
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({search, next_event}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event in done:
+                    yield next_event.result()
+                else:
+                    next_event.cancel()
+            while not events.empty():
+                yield events.get_nowait()
+            yield {"event": "result", "data": search.result()}
+        finally:
+            # Only stops waiting: the shared search is shielded and still caches its result
+            search.cancel()
+
+    def peek(self, query: str) -> Optional[Dict]:
+        """Get the result for `query` only if it is still fresh."""
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.created >= self.ttl:
+            return None
+
+        self.hits += 1
+        _HITS.inc()
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def put(self, query: str, value: Dict):
+        """Store a result computed outside `get`, e.g. by a streamed search."""
+        key = self.normalize(query)
+        self._entries[key] = _Entry(value=value, created=time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _refresh(self, key: str, compute: Callable[[str], Awaitable[Dict]]) -> Dict:
+        value = await compute(key)
+        self.put(key, value)
+        return value
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background search refresh failed: {task.exception()}")
+
+
+# Global instance
+search_cache = SearchCache(
+    ttl=settings.search_cache_ttl_seconds,
+    stale_ttl=settings.search_cache_stale_seconds,
+)
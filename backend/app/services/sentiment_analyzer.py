@@ -1,35 +1,88 @@
 """Sentiment and emotion analysis using Hugging Face transformers."""
 import logging
+import threading
+import time
 from typing import Dict, List
 from dataclasses import dataclass
 
 from app.core.config import settings
+from app.core.metrics import (
+    INFERENCE_BATCH_SIZE,
+    INFERENCE_DURATION,
+    INFERENCE_FALLBACK,
+    INFERENCE_CHARS,
+    INFERENCE_ITEMS,
+    INFERENCE_QUEUE_WAIT,
+)
+from app.core.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 # Lazy loading for heavy ML dependencies
 _emotion_pipeline = None
 _sentiment_pipeline = None
+# Startup preloads in a thread while a request may ask for the model too
+_pipeline_lock = threading.Lock()
+# Analysis runs in worker threads; one inference at a time keeps batches
+# from splitting the CPU between them
+_inference_lock = threading.Lock()
 
 
 def get_emotion_pipeline():
     """Lazy load the emotion classification pipeline."""
     global _emotion_pipeline
-    if _emotion_pipeline is None:
+    if _emotion_pipeline is not None:
+        return _emotion_pipeline
+    with _pipeline_lock:
+        if _emotion_pipeline is None:
+            try:
+                from transformers import pipeline
+                logger.info(f"Loading emotion model: {settings.emotion_model}")
+                _emotion_pipeline = pipeline(
+                    "text-classification",
+                    model=settings.emotion_model,
+                    top_k=None,  # Return all labels with scores
+                    device=-1,  # CPU, use 0 for GPU
+                )
+                logger.info("Emotion model loaded successfully")
+            except Exception as e:
+                logger.error(f"Failed to load emotion model: {e}")
+                _emotion_pipeline = None
+    return _emotion_pipeline
+
+
+def warm_up_pipeline(batch_size: int = 8, compile_model: bool = False) -> bool:
+    """Load the emotion model and run a warmup batch through it.
+
+    Returns False if the model is unavailable and analysis will use the
+    keyword fallback. With `compile_model`, the model is wrapped with
+    torch.compile and the warmup batch pays the compilation cost.
+    """
+    pipeline = get_emotion_pipeline()
+    if pipeline is None:
+        return False
+
+    original_model = pipeline.model
+    if compile_model:
         try:
-            from transformers import pipeline
-            logger.info(f"Loading emotion model: {settings.emotion_model}")
-            _emotion_pipeline = pipeline(
-                "text-classification",
-                model=settings.emotion_model,
-                top_k=None,  # Return all labels with scores
-                device=-1,  # CPU, use 0 for GPU
-            )
-            logger.info("Emotion model loaded successfully")
+            import torch
+            pipeline.model = torch.compile(original_model)
         except Exception as e:
-            logger.error(f"Failed to load emotion model: {e}")
-            _emotion_pipeline = None
-    return _emotion_pipeline
+            logger.warning(f"Model compilation unavailable, running eagerly: {e}")
+
+    if batch_size:
+        texts = ["Warming up the emotion model with a short example sentence."] * batch_size
+        started = time.perf_counter()
+        try:
+            pipeline(texts)
+        except Exception as e:
+            if pipeline.model is original_model:
+                raise
+            logger.warning(f"Compiled model failed warmup, running eagerly: {e}")
+            pipeline.model = original_model
+            pipeline(texts)
+        logger.info(f"Model warmup batch of {batch_size} took {time.perf_counter() - started:.2f}s")
+    return True
 
 
 @dataclass
@@ -76,7 +129,10 @@ class SentimentAnalyzer:
             # Truncate long text
             text = text[:512]
 
-            results = self.pipeline(text)
+            queued = time.perf_counter()
+            with _inference_lock:
+                INFERENCE_QUEUE_WAIT.observe(time.perf_counter() - queued)
+                results = self.pipeline(text)
 
             # Convert model output to our emotion format
             emotions = {}
@@ -114,24 +170,39 @@ class SentimentAnalyzer:
             return self._fallback_analyze(text)
 
     def analyze_batch(self, texts: List[str]) -> List[AnalysisResult]:
-        """Analyze multiple texts efficiently."""
+        """Analyze multiple texts efficiently, one result per text."""
         if not texts:
             return []
 
         if self.pipeline is None:
+            INFERENCE_FALLBACK.inc(len(texts))
             return [self._fallback_analyze(t) for t in texts]
 
         try:
-            # Truncate and filter texts
-            valid_texts = [t[:512] for t in texts if t and len(t.strip()) >= 5]
-
-            if not valid_texts:
-                return []
-
-            results = self.pipeline(valid_texts)
-
-            analyzed = []
-            for result in results:
+            # Texts too short to analyze get the same empty result as `analyze`
+            valid = [i for i, t in enumerate(texts) if t and len(t.strip()) >= 5]
+            analyzed = [
+                AnalysisResult(emotions={}, sentiment_score=0.0, confidence=0.0)
+                for _ in texts
+            ]
+            if not valid:
+                return analyzed
+
+            # Truncate texts
+            valid_texts = [texts[i][:512] for i in valid]
+
+            queued = time.perf_counter()
+            with _inference_lock, tracer.span("inference.batch", size=len(valid_texts)):
+                started = time.perf_counter()
+                INFERENCE_QUEUE_WAIT.observe(started - queued)
+                results = self.pipeline(valid_texts)
+            INFERENCE_DURATION.observe(time.perf_counter() - started)
+            INFERENCE_BATCH_SIZE.observe(len(valid_texts))
+            INFERENCE_ITEMS.inc(len(valid_texts))
+            # Characters rather than tokens: counting tokens would tokenize the batch twice
+            INFERENCE_CHARS.inc(sum(map(len, valid_texts)))
+
+            for i, result in zip(valid, results):
                 emotions = {}
                 max_score = 0.0
 
@@ -155,16 +226,17 @@ class SentimentAnalyzer:
                 )
                 sentiment = (positive - negative) / max(positive + negative, 0.001)
 
-                analyzed.append(AnalysisResult(
+                analyzed[i] = AnalysisResult(
                     emotions=emotions,
                     sentiment_score=max(-1.0, min(1.0, sentiment)),
                     confidence=max_score,
-                ))
+                )
 
             return analyzed
 
         except Exception as e:
             logger.error(f"Batch analysis error: {e}")
+            INFERENCE_FALLBACK.inc(len(texts))
             return [self._fallback_analyze(t) for t in texts]
 
     def _fallback_analyze(self, text: str) -> AnalysisResult:
@@ -0,0 +1,166 @@
+"""Incremental sliding-window index of trending topics."""
+import heapq
+from collections import Counter, deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional
+
+# Bucket granularity and the longest window the index can answer
+BUCKET_SECONDS = 60
+MAX_WINDOW_HOURS = 24
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class _TopicStats:
+    """Running mention/sentiment/emotion totals for a single topic."""
+
+    __slots__ = ("count", "sentiment_sum", "emotions")
+
+    def __init__(self):
+        self.count = 0
+        self.sentiment_sum = 0.0
+        self.emotions: Counter = Counter()
+
+    def add(self, other: "_TopicStats"):
+        self.count += other.count
+        self.sentiment_sum += other.sentiment_sum
+        self.emotions.update(other.emotions)
+
+    def subtract(self, other: "_TopicStats"):
+        self.count -= other.count
+        self.sentiment_sum -= other.sentiment_sum
+        self.emotions -= other.emotions
+
+    @property
+    def empty(self) -> bool:
+        return self.count <= 0 and not self.emotions
+
+
+class TopicIndex:
+    """Per-topic counters kept in time buckets with one running total per window.
+
+    Each history entry is folded into a per-minute bucket and added to the
+    running totals of every supported window (1..24 hours). Buckets that slide
+    out of a window are subtracted from that window's totals, so answering a
+    trending query is a merge over the topics in one window rather than a scan
+    over every history entry.
+    """
+
+    def __init__(self, max_hours: int = MAX_WINDOW_HOURS):
+        self.max_hours = max_hours
+        self._reset()
+
+    def _reset(self):
+        """Drop all buckets and window totals."""
+        self._buckets: Dict[int, Dict[str, _TopicStats]] = {}
+        self._totals: Dict[int, Dict[str, _TopicStats]] = {
+            hours: {} for hours in range(1, self.max_hours + 1)
+        }
+        # Bucket keys still counted in each window, oldest first
+        self._pending: Dict[int, Deque[int]] = {
+            hours: deque() for hours in range(1, self.max_hours + 1)
+        }
+        self._latest_bucket: Optional[int] = None
+
+    @staticmethod
+    def _bucket_key(timestamp: datetime) -> int:
+        return int((timestamp - _EPOCH).total_seconds()) // BUCKET_SECONDS
+
+    def rebuild(self, history: Iterable[Dict], now: Optional[datetime] = None):
+        """Rebuild the index from stored history entries."""
+        self._reset()
+        horizon = self._bucket_key(now or datetime.utcnow()) - self._window_buckets(self.max_hours)
+
+        for entry in history:
+            timestamp = datetime.fromisoformat(entry["timestamp"])
+            if self._bucket_key(timestamp) < horizon:
+                continue
+            self.add(timestamp, entry.get("topics", []), entry.get("dominantEmotion", "neutral"))
+
+    def add(self, timestamp: datetime, topics: List[Dict], dominant_emotion: str):
+        """Fold one history entry's topics into the index."""
+        key = self._bucket_key(timestamp)
+        # Keep buckets monotonic so window expiry stays in order
+        if self._latest_bucket is not None and key < self._latest_bucket:
+            key = self._latest_bucket
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {}
+            for pending in self._pending.values():
+                pending.append(key)
+            self._latest_bucket = key
+
+        delta: Dict[str, _TopicStats] = {}
+        for topic in topics:
+            name = topic["topic"]
+            stats = delta.get(name)
+            if stats is None:
+                stats = delta[name] = _TopicStats()
+            stats.count += topic.get("count", 1)
+            stats.sentiment_sum += topic.get("sentiment", 0)
+            stats.emotions[dominant_emotion] += 1
+
+        for name, stats in delta.items():
+            self._merge(bucket, name, stats)
+            for totals in self._totals.values():
+                self._merge(totals, name, stats)
+
+        self._expire(key)
+
+    def get_trending(
+        self,
+        hours: int = 1,
+        limit: Optional[int] = 10,
+        now: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """Get the most mentioned topics within the last `hours` hours.
+
+        With `limit=None` every topic in the window is returned.
+        """
+        hours = min(max(hours, 1), self.max_hours)
+        self._expire(self._bucket_key(now or datetime.utcnow()))
+
+        trending = (
+            {
+                "topic": name,
+                "mentions": stats.count,
+                "avgSentiment": stats.sentiment_sum / max(stats.count, 1),
+                "dominantEmotion": stats.emotions.most_common(1)[0][0] if stats.emotions else "neutral",
+            }
+            for name, stats in self._totals[hours].items()
+        )
+        if limit is None:
+            return sorted(trending, key=lambda x: x["mentions"], reverse=True)
+        return heapq.nlargest(limit, trending, key=lambda x: x["mentions"])
+
+    def _expire(self, now_key: int):
+        """Subtract buckets that have slid out of each window."""
+        for hours, pending in self._pending.items():
+            lower = now_key - self._window_buckets(hours)
+            totals = self._totals[hours]
+            while pending and pending[0] < lower:
+                key = pending.popleft()
+                # The longest window is the last reference to a bucket
+                if hours == self.max_hours:
+                    bucket = self._buckets.pop(key, {})
+                else:
+                    bucket = self._buckets.get(key, {})
+                for name, stats in bucket.items():
+                    current = totals.get(name)
+                    if current is None:
+                        continue
+                    current.subtract(stats)
+                    if current.empty:
+                        del totals[name]
+
+    @staticmethod
+    def _window_buckets(hours: int) -> int:
+        return hours * 3600 // BUCKET_SECONDS
+
+    @staticmethod
+    def _merge(target: Dict[str, _TopicStats], name: str, stats: _TopicStats):
+        current = target.get(name)
+        if current is None:
+            current = target[name] = _TopicStats()
+        current.add(stats)
@@ -0,0 +1,166 @@
+"""Inverted index from topics back to the items that produced them."""
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+@dataclass
+class IndexedItem:
+    """A scraped item referenced by one or more topics."""
+
+    url: str
+    title: str
+    source: str
+    score: int
+    sentiment: float
+    last_seen: datetime
+    topics: Set[str] = field(default_factory=set)
+
+    def to_dict(self) -> Dict:
+        return {
+            "url": self.url,
+            "title": self.title,
+            "source": self.source,
+            "score": self.score,
+            "sentiment": self.sentiment,
+            "lastSeen": self.last_seen.isoformat(),
+        }
+
+
+class TopicItemIndex:
+    """Maps each topic to the recent items whose titles produced it.
+
+    Items are keyed by URL, so posts rescraped every cycle refresh their
+    existing entry instead of adding new ones. Items not seen within the
+    window are dropped along with their postings, and each topic keeps at
+    most `max_items_per_topic` of its most recently seen items.
+    """
+
+    def __init__(self, window_hours: int = 6, max_items_per_topic: int = 100):
+        self.window = timedelta(hours=window_hours)
+        self.max_items_per_topic = max_items_per_topic
+        self._items: Dict[str, IndexedItem] = {}
+        # topic -> item URLs, least recently seen first
+        self._postings: Dict[str, Dict[str, None]] = {}
+        self._expiry: Deque[Tuple[datetime, str]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(
+        self,
+        content: Dict,
+        sentiment: float,
+        topics: Iterable[str],
+        now: Optional[datetime] = None,
+    ):
+        """Index one item under each of its topics, replacing its previous ones."""
+        url = content.get("url")
+        if not url:
+            return
+
+        now = now or datetime.utcnow()
+        self.prune(now)
+
+        item = self._items.get(url)
+        if item is None:
+            item = self._items[url] = IndexedItem(
+                url=url,
+                title=content.get("title", ""),
+                source=content.get("source", ""),
+                score=content.get("score", 0),
+                sentiment=sentiment,
+                last_seen=now,
+            )
+        else:
+            item.score = content.get("score", item.score)
+            item.sentiment = sentiment
+            item.last_seen = now
+        self._expiry.append((now, url))
+
+        topics = set(topics)
+        # A re-added item stops answering for topics its title no longer yields
+        for topic in item.topics - topics:
+            self._unpost(topic, url)
+        item.topics &= topics
+
+        for topic in topics:
+            postings = self._postings.get(topic)
+            if postings is None:
+                postings = self._postings[topic] = {}
+            postings.pop(url, None)
+            postings[url] = None
+            item.topics.add(topic)
+
+            if len(postings) > self.max_items_per_topic:
+                oldest = next(iter(postings))
+                del postings[oldest]
+                self._items[oldest].topics.discard(topic)
+
+    def top_items(self, topic: str, limit: int = 10, now: Optional[datetime] = None) -> List[Dict]:
+        """Get a topic's highest-scoring recent items."""
+        self.prune(now)
+        postings = self._postings.get(topic.lower().strip())
+        if not postings:
+            return []
+
+        items = (self._items[url] for url in postings)
+        return [item.to_dict() for item in heapq.nlargest(limit, items, key=lambda i: i.score)]
+
+    def to_dict(self) -> Dict:
+        """Snapshot the indexed items with their topics."""
+        self.prune()
+        items = sorted(self._items.values(), key=lambda i: i.last_seen)
+        return {
+            "items": [
+                {**item.to_dict(), "topics": sorted(item.topics)}
+                for item in items
+                if item.topics
+            ]
+        }
+
+    def restore(self, data: Dict):
+        """Re-index snapshotted items, oldest first."""
+        for item in data.get("items", []):
+            self.add(
+                item,
+                item["sentiment"],
+                item["topics"],
+                now=datetime.fromisoformat(item["lastSeen"]),
+            )
+        self.prune()
+
+    def prune(self, now: Optional[datetime] = None):
+        """Drop items that have not been seen within the window."""
+        cutoff = (now or datetime.utcnow()) - self.window
+        expiry = self._expiry
+
+        while expiry and expiry[0][0] < cutoff:
+            seen, url = expiry.popleft()
+            item = self._items.get(url)
+            # Later sightings have their own expiry record
+            if item is None or item.last_seen > seen:
+                continue
+
+            del self._items[url]
+            for topic in item.topics:
+                self._unpost(topic, url)
+
+    def _unpost(self, topic: str, url: str):
+        postings = self._postings.get(topic)
+        if postings is None:
+            return
+        postings.pop(url, None)
+        if not postings:
+            del self._postings[topic]
+
+
+# Global instance
+topic_item_index = TopicItemIndex(
+    window_hours=settings.topic_items_window_hours,
+    max_items_per_topic=settings.topic_items_per_topic,
+)
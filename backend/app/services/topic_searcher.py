@@ -1,12 +1,18 @@
 """Search and analyze sentiment for specific topics."""
+import asyncio
 import logging
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Set
 import httpx
 
+from app.core.config import settings
+from app.core.tracing import Span, tracer
 from app.models.emotion import EmotionState
-from app.services.sentiment_analyzer import SentimentAnalyzer
+from app.services.content_index import content_index
+from app.services.sentiment_analyzer import AnalysisResult, SentimentAnalyzer
 from app.services.history_store import history_store, topic_extractor
+from app.services.topic_item_index import topic_item_index
 
 logger = logging.getLogger(__name__)
 
@@ -18,89 +24,200 @@ class TopicSearcher:
         self.analyzer = SentimentAnalyzer()
 
     async def search_topic(self, query: str) -> Dict:
-        """Search for a topic across news sources and analyze sentiment."""
+        """Search for a topic and analyze sentiment."""
+        result: Dict = {}
+        async for event in self.search_topic_stream(query):
+            if event["event"] == "result":
+                result = event["data"]
+        return result
+
+    async def search_topic_stream(self, query: str) -> AsyncIterator[Dict]:
+        """Search for a topic, yielding partial estimates as sources complete.
+
+        Answers from the local content index when it has enough matches,
+        and only searches news sources when local recall is too low. Remote
+        sources are searched concurrently; a "partial" event with the
+        emotion estimate so far follows each batch of results, and a final
+        "result" event carries the merged search result.
+        """
         query = query.lower().strip()
-        all_content = []
-
-        # Search Reddit
-        reddit_content = await self._search_reddit(query)
-        all_content.extend(reddit_content)
-
-        # Search HackerNews
-        hn_content = await self._search_hackernews(query)
-        all_content.extend(hn_content)
+        # Spans never stay open across a yield: the consumer runs in between
+        root = tracer.start_trace("search", query=query)
+        error = None
+        try:
+            async for event in self._search_stream(query, root):
+                yield event
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            tracer.end_trace(root, error)
+
+    async def _search_stream(self, query: str, root: Optional[Span]) -> AsyncIterator[Dict]:
+        # Search locally indexed content first
+        with tracer.activate(root), tracer.span("local_search") as span:
+            local_matches = content_index.search(query, limit=settings.local_search_limit)
+            if span:
+                span.set("matches", len(local_matches))
+        all_content = [document.to_content() for document, _ in local_matches]
+        results = [document.analysis for document, _ in local_matches]
+
+        if local_matches:
+            yield self._partial_event("local", all_content, results)
+
+        if len(local_matches) < settings.local_search_min_results:
+            seen_urls = {c["url"] for c in all_content}
+            # Tasks copy the context, so their spans attach to the search
+            with tracer.activate(root):
+                pending = [
+                    asyncio.create_task(self._search_reddit(query)),
+                    asyncio.create_task(self._search_hackernews(query)),
+                ]
+            try:
+                for next_source in asyncio.as_completed(pending):
+                    remote_content = await next_source
+                    with tracer.activate(root):
+                        added = await self._merge_remote(remote_content, seen_urls, all_content, results)
+                    if not added:
+                        continue
+                    yield self._partial_event(remote_content[0]["source"], all_content, results)
+            finally:
+                # The consumer may stop early (e.g. a disconnected client)
+                for task in pending:
+                    task.cancel()
 
         if not all_content:
-            return {
-                "query": query,
-                "count": 0,
-                "message": "No content found for this topic",
-                "emotion": None,
-                "topics": [],
+            yield {
+                "event": "result",
+                "data": {
+                    "query": query,
+                    "count": 0,
+                    "message": "No content found for this topic",
+                    "emotion": None,
+                    "topics": [],
+                },
             }
+            return
 
-        # Analyze sentiment
-        texts = [c["text"] for c in all_content]
-        results = self.analyzer.analyze_batch(texts)
+        sources = {"reddit": 0, "hackernews": 0}
+        sources.update(Counter(c["source"] for c in all_content))
 
         # Aggregate emotions
         emotion_state = self._aggregate_emotions(all_content, results)
 
         # Extract related topics
-        content_dicts = [{"title": c["title"], "text": c["text"]} for c in all_content]
         result_dicts = [{"sentiment_score": r.sentiment_score} for r in results]
-        topics = topic_extractor.extract_topics(content_dicts, result_dicts, limit=10)
+        with tracer.activate(root), tracer.span("extract_topics"):
+            topics = topic_extractor.extract_topics(
+                all_content, result_dicts, limit=10, item_index=topic_item_index
+            )
 
         # Filter out the search query itself from topics
         topics = [t for t in topics if t["topic"].lower() != query.lower()]
 
         # Store in history
-        history_store.add_entry(
-            emotion_state={
-                "happiness": emotion_state.happiness,
-                "sadness": emotion_state.sadness,
-                "anger": emotion_state.anger,
-                "fear": emotion_state.fear,
-                "surprise": emotion_state.surprise,
-                "disgust": emotion_state.disgust,
-                "confusion": emotion_state.confusion,
-                "pride": emotion_state.pride,
-                "loneliness": emotion_state.loneliness,
-                "pain": emotion_state.pain,
-                "overall_sentiment": emotion_state.overall_sentiment,
-                "intensity": emotion_state.intensity,
+        emotion = self._emotion_dict(emotion_state)
+        with tracer.activate(root), tracer.span("persist"):
+            history_store.add_entry(
+                emotion_state={k: v for k, v in emotion.items() if k != "timestamp"},
+                topics=[{"topic": query, "count": len(all_content), "sentiment": emotion_state.overall_sentiment}] + topics[:5],
+                sources_summary=sources,
+            )
+
+        yield {
+            "event": "result",
+            "data": {
+                "query": query,
+                "count": len(all_content),
+                "emotion": emotion,
+                "topics": topics[:10],
+                "sources": sources,
+                "localMatches": len(local_matches),
             },
-            topics=[{"topic": query, "count": len(all_content), "sentiment": emotion_state.overall_sentiment}] + topics[:5],
-            sources_summary={"reddit": len(reddit_content), "hackernews": len(hn_content)},
-        )
+        }
 
+    async def _merge_remote(
+        self,
+        remote_content: List[Dict],
+        seen_urls: Set[str],
+        all_content: List[Dict],
+        results: List[AnalysisResult],
+    ) -> bool:
+        """Add one source's results, reusing indexed analyses and indexing the rest.
+
+        Returns whether any new items were added.
+        """
+        added = len(all_content)
+        new_content = []
+        for item in remote_content:
+            if item["url"] in seen_urls:
+                continue
+            seen_urls.add(item["url"])
+            document = content_index.get(item["url"])
+            if document is not None:
+                all_content.append(item)
+                results.append(document.analysis)
+            else:
+                new_content.append(item)
+
+        if new_content:
+            with tracer.span("analyze", source=new_content[0]["source"], items=len(new_content)):
+                # Off the event loop, so other requests are served during inference
+                new_results = await asyncio.to_thread(
+                    self.analyzer.analyze_batch, [c["text"] for c in new_content]
+                )
+            content_index.add_batch(new_content, new_results)
+            all_content.extend(new_content)
+            results.extend(new_results)
+
+        return len(all_content) > added
+
+    def _partial_event(self, source: str, content: List[Dict], results: List[AnalysisResult]) -> Dict:
+        """Build a partial estimate from the results gathered so far."""
         return {
-            "query": query,
-            "count": len(all_content),
-            "emotion": {
-                "happiness": emotion_state.happiness,
-                "sadness": emotion_state.sadness,
-                "anger": emotion_state.anger,
-                "fear": emotion_state.fear,
-                "surprise": emotion_state.surprise,
-                "disgust": emotion_state.disgust,
-                "confusion": emotion_state.confusion,
-                "pride": emotion_state.pride,
-                "loneliness": emotion_state.loneliness,
-                "pain": emotion_state.pain,
-                "overall_sentiment": emotion_state.overall_sentiment,
-                "intensity": emotion_state.intensity,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-            "topics": topics[:10],
-            "sources": {
-                "reddit": len(reddit_content),
-                "hackernews": len(hn_content),
+            "event": "partial",
+            "data": {
+                "source": source,
+                "count": len(content),
+                "emotion": self._emotion_dict(self._aggregate_emotions(content, results)),
             },
         }
 
+    def _emotion_dict(self, emotion_state: EmotionState) -> Dict:
+        return {
+            "happiness": emotion_state.happiness,
+            "sadness": emotion_state.sadness,
+            "anger": emotion_state.anger,
+            "fear": emotion_state.fear,
+            "surprise": emotion_state.surprise,
+            "disgust": emotion_state.disgust,
+            "confusion": emotion_state.confusion,
+            "pride": emotion_state.pride,
+            "loneliness": emotion_state.loneliness,
+            "pain": emotion_state.pain,
+            "overall_sentiment": emotion_state.overall_sentiment,
+            "intensity": emotion_state.intensity,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
     async def _search_reddit(self, query: str, limit: int = 30) -> List[Dict]:
         """Search Reddit for a topic."""
+        with tracer.span("remote_search", source="reddit") as span:
+            content = await self._fetch_reddit(query, limit)
+            if span:
+                span.set("items", len(content))
+        return content
+
+    async def _search_hackernews(self, query: str, limit: int = 30) -> List[Dict]:
+        """Search HackerNews for a topic."""
+        with tracer.span("remote_search", source="hackernews") as span:
+            content = await self._fetch_hackernews(query, limit)
+            if span:
+                span.set("items", len(content))
+        return content
+
+    async def _fetch_reddit(self, query: str, limit: int) -> List[Dict]:
+        """Query the Reddit search API."""
         content = []
         headers = {"User-Agent": "SentimentFace/1.0"}
 
@@ -136,8 +253,8 @@ class TopicSearcher:
 
         return content
 
-    async def _search_hackernews(self, query: str, limit: int = 30) -> List[Dict]:
-        """Search HackerNews for a topic using Algolia API."""
+    async def _fetch_hackernews(self, query: str, limit: int) -> List[Dict]:
+        """Search HackerNews using the Algolia API."""
         content = []
 
         try:
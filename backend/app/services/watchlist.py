@@ -0,0 +1,298 @@
+"""Persistent watchlist of topics matched against every scrape.
+
+The watchlist file is the shared copy for every worker on the host: a
+worker reloads it whenever another worker has replaced it, and changes
+(new terms, removed terms, the scheduler's series points) are made under
+an exclusive lock as reload, modify, save. Terms added on any worker are
+therefore matched by the worker that scrapes, and its saves keep them.
+"""
+import json
+import logging
+import os
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.sentiment_analyzer import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST_FILE = Path(__file__).parent.parent.parent / "data" / "watchlist.json"
+
+EMOTIONS = ("happiness", "sadness", "anger", "fear", "surprise", "disgust")
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase a term and collapse its whitespace."""
+    return " ".join(term.lower().split())
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton matching many terms in one pass over a text.
+
+    Terms only match on word boundaries, so "ai" does not match inside
+    "said". Texts are expected to be lowercased already.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[str]] = [[]]
+
+        for term in terms:
+            self._insert(term)
+        self._build_failure_links()
+
+    def _insert(self, term: str):
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(term)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # Inherit matches that end at the failure state
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Get the terms occurring in `text` as whole words."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: Set[str] = set()
+        state = 0
+        length = len(text)
+
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if not outputs[state]:
+                continue
+            if end + 1 < length and text[end + 1].isalnum():
+                continue
+            for term in outputs[state]:
+                start = end - len(term) + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.add(term)
+
+        return found
+
+
+class Watchlist:
+    """User-registered terms, each with its own emotion time series.
+
+    Terms are compiled into one automaton, so every scraped item is matched
+    against all of them in a single pass, and each cycle's series points
+    reuse the analysis results the scrape has already computed.
+    """
+
+    def __init__(self, max_terms: int = 500, max_points: int = 1000):
+        self.max_terms = max_terms
+        self.max_points = max_points
+        self._revision = 0
+        self._series: Dict[str, Deque[Dict]] = {}
+        self._matcher: Optional[AhoCorasick] = None
+        # Identity of the file as last loaded or saved by this worker
+        self._file_version: Optional[Tuple[int, int, int]] = None
+        self._refresh()
+
+    @property
+    def revision(self) -> int:
+        """Advances whenever the terms or series change, here or on another worker."""
+        self._refresh()
+        return self._revision
+
+    def _refresh(self):
+        """Reload terms and series if the file changed since this worker read it."""
+        try:
+            with open(WATCHLIST_FILE, 'r') as f:
+                version = _version(os.fstat(f.fileno()))
+                if version == self._file_version:
+                    return
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Failed to load watchlist: {e}")
+            return
+
+        first_load = self._file_version is None
+        self._series = {
+            term: deque(points, maxlen=self.max_points)
+            for term, points in data.get("terms", {}).items()
+        }
+        self._file_version = version
+        self._changed()
+        if first_load:
+            logger.info(f"Loaded {len(self._series)} watchlist terms")
+
+    def _save(self):
+        """Save watched terms and their series to file."""
+        try:
+            WATCHLIST_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = WATCHLIST_FILE.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"terms": {t: list(s) for t, s in self._series.items()}}, f)
+            tmp_path.replace(WATCHLIST_FILE)
+            self._file_version = _version(WATCHLIST_FILE.stat())
+        except Exception as e:
+            logger.error(f"Failed to save watchlist: {e}")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the file lock across a reload, change and save."""
+        import fcntl
+
+        WATCHLIST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(WATCHLIST_FILE.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._refresh()
+            yield
+        finally:
+            os.close(fd)
+
+    def _changed(self):
+        self._matcher = AhoCorasick(self._series) if self._series else None
+        self._revision += 1
+
+    def __contains__(self, term: str) -> bool:
+        self._refresh()
+        return normalize_term(term) in self._series
+
+    def add_term(self, term: str) -> bool:
+        """Start watching a term. Returns False if it was already watched."""
+        term = normalize_term(term)
+        with self._locked():
+            if term in self._series:
+                return False
+            if len(self._series) >= self.max_terms:
+                raise ValueError(f"Watchlist is limited to {self.max_terms} terms")
+
+            self._series[term] = deque(maxlen=self.max_points)
+            self._changed()
+            self._save()
+        return True
+
+    def remove_term(self, term: str) -> bool:
+        """Stop watching a term and drop its series."""
+        term = normalize_term(term)
+        with self._locked():
+            if self._series.pop(term, None) is None:
+                return False
+            self._changed()
+            self._save()
+        return True
+
+    def get_terms(self) -> List[Dict]:
+        """Get watched terms with their latest point."""
+        self._refresh()
+        return [
+            {
+                "term": term,
+                "points": len(series),
+                "latest": series[-1] if series else None,
+            }
+            for term, series in sorted(self._series.items())
+        ]
+
+    def get_series(self, term: str, limit: int = 100) -> Optional[List[Dict]]:
+        """Get the most recent points of a term's series, oldest first."""
+        self._refresh()
+        series = self._series.get(normalize_term(term))
+        if series is None:
+            return None
+        return list(series)[-limit:]
+
+    def observe(
+        self,
+        contents: List[Dict],
+        results: List[AnalysisResult],
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Match a scrape against every term and record a point per matched term.
+
+        Returns the number of terms that matched.
+        """
+        with self._locked():
+            return self._observe(contents, results, now)
+
+    def _observe(
+        self,
+        contents: List[Dict],
+        results: List[AnalysisResult],
+        now: Optional[datetime],
+    ) -> int:
+        if self._matcher is None:
+            return 0
+
+        # term -> [mentions, weight, sentiment_sum, *emotion_sums]
+        totals: Dict[str, List[float]] = {}
+        for content, result in zip(contents, results):
+            text = f"{content.get('title', '')} {content.get('text', '')}".lower()
+            matched = self._matcher.find(text)
+            if not matched:
+                continue
+
+            weight = result.confidence
+            for term in matched:
+                total = totals.get(term)
+                if total is None:
+                    total = totals[term] = [0.0] * (3 + len(EMOTIONS))
+                total[0] += 1
+                total[1] += weight
+                total[2] += result.sentiment_score * weight
+                for i, emotion in enumerate(EMOTIONS, start=3):
+                    total[i] += result.emotions.get(emotion, 0.0) * weight
+
+        if not totals:
+            return 0
+
+        timestamp = (now or datetime.utcnow()).isoformat()
+        for term, total in totals.items():
+            weight = total[1] or 1.0
+            self._series[term].append({
+                "timestamp": timestamp,
+                "mentions": int(total[0]),
+                "sentiment": total[2] / weight,
+                "emotions": {
+                    emotion: total[i] / weight
+                    for i, emotion in enumerate(EMOTIONS, start=3)
+                },
+            })
+
+        self._revision += 1
+        self._save()
+        return len(totals)
+
+
+def _version(stat: os.stat_result) -> Tuple[int, int, int]:
+    # Every save replaces the file, so the inode changes too
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+# Global instance
+watchlist = Watchlist(
+    max_terms=settings.watchlist_max_terms,
+    max_points=settings.watchlist_max_points,
+)
@@ -0,0 +1 @@
+"""Benchmark suite for the sentiment pipeline and API (run with `python -m benchmarks`)."""
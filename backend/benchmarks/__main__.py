@@ -0,0 +1,95 @@
+"""Run the benchmark suite.
+
+    cd backend
+    python -m benchmarks --output benchmarks/results/baseline.json
+    python -m benchmarks --compare benchmarks/results/baseline.json --threshold 0.15
+
+Benchmarks use a deterministic synthetic corpus and never touch the
+network; history writes go to a temporary directory. With --compare, the
+run exits non-zero if any benchmark's median regressed by more than the
+threshold.
+"""
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from benchmarks import harness
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.suites import SUITES
+
+
+def _sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",") if size]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n")[0])
+    parser.add_argument("--suites", default=",".join(SUITES), help="comma-separated suites to run")
+    parser.add_argument("--corpus-size", type=int, default=150, help="items per scrape cycle")
+    parser.add_argument("--model-size", type=int, default=32, help="items per model inference batch")
+    parser.add_argument("--history-sizes", type=_sizes, default=[1000, 10000, 100000],
+                        help="history entry counts, e.g. 1000,100000,1000000")
+    parser.add_argument("--api-history", type=int, default=1000, help="history entries behind the API")
+    parser.add_argument("--api-requests", type=int, default=50, help="requests per API repetition")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative median slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    # Keep history, topic sketch and archive writes away from the real data files
+    from app.services import history_store as history_module
+    data_dir = Path(tempfile.mkdtemp(prefix="sentiment-bench-"))
+    history_module.HISTORY_FILE = data_dir / "sentiment_history.json"
+    history_module.TOPIC_SKETCH_FILE = data_dir / "topic_sketch.json"
+
+    from app.services.analysis_archive import analysis_archive
+    analysis_archive.directory = data_dir / "analysis_archive"
+
+    from benchmarks import suites
+
+    corpus = CorpusGenerator(seed=args.seed)
+    selected = [name for name in args.suites.split(",") if name]
+    benchmarks = []
+    for name in selected:
+        if name == "analyzer":
+            benchmarks += suites.analyzer_suite(corpus, args.corpus_size, args.model_size)
+        elif name == "aggregator":
+            benchmarks += suites.aggregator_suite(corpus, args.corpus_size)
+        elif name == "topics":
+            benchmarks += suites.topics_suite(corpus, args.corpus_size)
+        elif name == "history":
+            benchmarks += suites.history_suite(corpus, args.history_sizes)
+        elif name == "api":
+            benchmarks += suites.api_suite(corpus, args.corpus_size, args.api_history, args.api_requests)
+        else:
+            parser.error(f"unknown suite '{name}' (choose from {', '.join(SUITES)})")
+
+    results = harness.run(benchmarks, repeat=args.repeat, warmup=args.warmup)
+
+    if args.output:
+        harness.save(args.output, harness.metadata(vars(args) | {"output": str(args.output)}), results)
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        baseline = harness.load(args.compare)
+        rows = harness.compare(baseline["results"], results, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline['meta'].get('commit')}):")
+        print(harness.format_comparison(rows))
+        regressions = [row for row in rows if row["status"] == "regressed"]
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
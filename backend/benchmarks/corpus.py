@@ -0,0 +1,134 @@
+"""Deterministic synthetic corpus shaped like Reddit, HN and RSS scrapes."""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.services.scrapers.base_scraper import ScrapedContent
+
+SUBJECTS = [
+    "openai", "nvidia", "rust", "python", "kubernetes", "climate change", "federal reserve",
+    "electric vehicles", "spacex", "linux kernel", "interest rates", "supreme court",
+    "world cup", "housing market", "quantum computing", "chip shortage", "remote work",
+    "machine learning", "cybersecurity", "solar power", "tesla", "apple", "election",
+]
+VERBS = [
+    "announces", "releases", "delays", "cuts", "raises", "launches", "drops", "wins",
+    "loses", "expands", "warns about", "reports on", "faces", "rejects", "backs",
+]
+OBJECTS = [
+    "new model", "quarterly earnings", "security patch", "layoffs", "funding round",
+    "open source release", "price increase", "trade policy", "record growth", "outage",
+    "court ruling", "benchmark results", "safety review", "hiring freeze", "partnership",
+]
+POSITIVE = ["happy", "great", "good", "love", "amazing", "wonderful", "excellent", "excited"]
+NEGATIVE = ["sad", "bad", "hate", "terrible", "awful", "angry", "fear", "scared", "worried"]
+FILLER = [
+    "honestly", "the community", "this week", "developers", "investors", "everyone",
+    "the thread", "comments", "analysts", "users", "maintainers", "critics", "fans",
+]
+SOURCES = ("reddit", "hackernews", "rss")
+
+
+class CorpusGenerator:
+    """Generates the same items for the same seed and size.
+
+    Subjects follow a skewed distribution so some topics recur across
+    items, like a real front page.
+    """
+
+    def __init__(self, seed: int = 42, now: Optional[datetime] = None):
+        self.seed = seed
+        self.now = now or datetime.utcnow()
+
+    def items(self, size: int) -> List[ScrapedContent]:
+        """Generate `size` items spread evenly across the three sources."""
+        rng = random.Random(self.seed)
+        return [self._item(rng, i, SOURCES[i % len(SOURCES)]) for i in range(size)]
+
+    def _title(self, rng: random.Random) -> str:
+        subject = SUBJECTS[min(int(rng.expovariate(0.25)), len(SUBJECTS) - 1)]
+        return f"{subject} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+
+    def _body(self, rng: random.Random, words: int) -> str:
+        tone = POSITIVE if rng.random() < 0.5 else NEGATIVE
+        parts = []
+        for _ in range(words):
+            roll = rng.random()
+            if roll < 0.15:
+                parts.append(rng.choice(tone))
+            elif roll < 0.25:
+                parts.append(rng.choice(SUBJECTS))
+            else:
+                parts.append(rng.choice(FILLER))
+        return " ".join(parts)
+
+    def _item(self, rng: random.Random, index: int, source: str) -> ScrapedContent:
+        title = self._title(rng)
+        timestamp = self.now - timedelta(minutes=rng.randint(0, 48 * 60))
+        if source == "reddit":
+            return ScrapedContent(
+                text=f"{title} {self._body(rng, rng.randint(10, 80))}",
+                source="reddit",
+                url=f"https://reddit.com/r/synthetic/comments/{index}",
+                timestamp=timestamp,
+                score=int(rng.paretovariate(1.2) * 10),
+                comment_count=rng.randint(0, 500),
+                title=title,
+            )
+        if source == "hackernews":
+            # HN stories are mostly titles
+            return ScrapedContent(
+                text=title,
+                source="hackernews",
+                url=f"https://news.ycombinator.com/item?id={index}",
+                timestamp=timestamp,
+                score=int(rng.paretovariate(1.3) * 5),
+                comment_count=rng.randint(0, 300),
+                title=title,
+            )
+        return ScrapedContent(
+            text=f"{title}. {self._body(rng, rng.randint(20, 60))}",
+            source="rss",
+            url=f"https://feeds.example.com/article/{index}",
+            timestamp=timestamp,
+            title=title,
+        )
+
+    def history_entries(self, size: int) -> List[Dict]:
+        """Generate `size` history entries one cycle (30s) apart, ending now."""
+        rng = random.Random(self.seed + 1)
+        start = self.now - timedelta(seconds=30 * size)
+        emotions = ["happiness", "sadness", "anger", "fear", "surprise", "disgust",
+                    "confusion", "pride", "loneliness", "pain"]
+        entries = []
+        for i in range(size):
+            values = {emotion: round(rng.random(), 4) for emotion in emotions}
+            topics = [
+                {"topic": subject, "count": rng.randint(2, 20), "sentiment": round(rng.uniform(-1, 1), 3)}
+                for subject in rng.sample(SUBJECTS, 5)
+            ]
+            entries.append({
+                "timestamp": (start + timedelta(seconds=30 * i)).isoformat(),
+                "emotions": values,
+                "overallSentiment": round(rng.uniform(-1, 1), 4),
+                "intensity": round(rng.random(), 4),
+                "topics": topics,
+                "sources": {source: rng.randint(0, 50) for source in SOURCES},
+                "dominantEmotion": max(values, key=values.get),
+            })
+        return entries
+
+
+def to_content_dicts(items: List[ScrapedContent]) -> List[Dict]:
+    """Convert items to the dicts topic extraction and indexing take."""
+    return [
+        {
+            "title": c.title,
+            "text": c.text,
+            "url": c.url,
+            "source": c.source,
+            "score": c.score,
+            "timestamp": c.timestamp,
+        }
+        for c in items
+    ]
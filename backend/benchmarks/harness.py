@@ -0,0 +1,169 @@
+"""Timing, result files and regression comparison for the benchmarks."""
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Benchmark:
+    """One measured operation.
+
+    `fn` may be sync or async. `setup` runs before every repetition and is
+    not timed; its return value (if any) is passed to `fn`. `items` is the
+    number of items one call processes, used to report a throughput.
+    """
+
+    name: str
+    group: str
+    fn: Callable
+    setup: Optional[Callable] = None
+    items: Optional[int] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    repeat: Optional[int] = None
+    skip: Optional[str] = None
+
+
+def measure(benchmark: Benchmark, repeat: int, warmup: int, loop: asyncio.AbstractEventLoop) -> Dict:
+    """Time a benchmark and summarise the repetitions."""
+    result: Dict[str, Any] = {
+        "name": benchmark.name,
+        "group": benchmark.group,
+        "params": benchmark.params,
+    }
+    if benchmark.skip:
+        result["skipped"] = benchmark.skip
+        return result
+
+    is_async = inspect.iscoroutinefunction(benchmark.fn)
+    repeat = benchmark.repeat or repeat
+
+    def call_once() -> float:
+        arg = benchmark.setup() if benchmark.setup else None
+        args = () if benchmark.setup is None else (arg,)
+        started = time.perf_counter()
+        if is_async:
+            loop.run_until_complete(benchmark.fn(*args))
+        else:
+            benchmark.fn(*args)
+        return time.perf_counter() - started
+
+    for _ in range(warmup):
+        call_once()
+    timings = sorted(call_once() for _ in range(repeat))
+
+    median = statistics.median(timings)
+    result.update({
+        "repeat": repeat,
+        "min": timings[0],
+        "median": median,
+        "mean": statistics.fmean(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    })
+    if benchmark.items:
+        result["items"] = benchmark.items
+        result["itemsPerSecond"] = benchmark.items / median if median > 0 else None
+    return result
+
+
+def run(benchmarks: List[Benchmark], repeat: int, warmup: int, log: Callable[[str], None] = print) -> List[Dict]:
+    """Run benchmarks in order, printing one line per result."""
+    loop = asyncio.new_event_loop()
+    results = []
+    try:
+        for benchmark in benchmarks:
+            result = measure(benchmark, repeat, warmup, loop)
+            results.append(result)
+            log(format_result(result))
+    finally:
+        loop.close()
+    return results
+
+
+def format_result(result: Dict) -> str:
+    if "skipped" in result:
+        return f"{result['name']:<60} skipped: {result['skipped']}"
+    line = f"{result['name']:<60} median {_ms(result['median']):>11}  p95 {_ms(result['p95']):>11}"
+    if result.get("itemsPerSecond"):
+        line += f"  {result['itemsPerSecond']:>12,.0f} items/s"
+    return line
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.3f} ms"
+
+
+def metadata(args: Dict[str, Any]) -> Dict:
+    """Describe the environment a result file was produced in."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "args": args,
+    }
+
+
+def save(path: Path, meta: Dict, results: List[Dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+
+
+def load(path: Path) -> Dict:
+    return json.loads(path.read_text())
+
+
+def compare(baseline: List[Dict], current: List[Dict], threshold: float) -> List[Dict]:
+    """Compare medians by benchmark name.
+
+    A benchmark regressed when its median grew by more than `threshold`
+    (0.1 = 10%) over the baseline.
+    """
+    baseline_by_name = {r["name"]: r for r in baseline if "median" in r}
+    rows = []
+    for result in current:
+        before = baseline_by_name.get(result["name"])
+        if before is None or "median" not in result:
+            continue
+        change = result["median"] / before["median"] - 1 if before["median"] > 0 else 0.0
+        if change > threshold:
+            status = "regressed"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = "unchanged"
+        rows.append({
+            "name": result["name"],
+            "baseline": before["median"],
+            "current": result["median"],
+            "change": change,
+            "status": status,
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'benchmark':<60} {'baseline':>11} {'current':>11} {'change':>8}"]
+    for row in rows:
+        marker = {"regressed": "  REGRESSED", "improved": "  improved"}.get(row["status"], "")
+        lines.append(
+            f"{row['name']:<60} {_ms(row['baseline']):>11} {_ms(row['current']):>11} "
+            f"{row['change']:>+7.1%}{marker}"
+        )
+    return "\n".join(lines)
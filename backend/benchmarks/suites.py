@@ -0,0 +1,208 @@
+"""Benchmark definitions, grouped by the component they cover."""
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import CorpusGenerator, to_content_dicts
+from benchmarks.harness import Benchmark
+
+
+def analyzer_suite(corpus: CorpusGenerator, size: int, model_size: int) -> List[Benchmark]:
+    from app.services.sentiment_analyzer import SentimentAnalyzer, get_emotion_pipeline
+
+    texts = [c.text for c in corpus.items(size)]
+
+    fallback = SentimentAnalyzer()
+    fallback.pipeline = None
+    benchmarks = [
+        Benchmark(
+            name=f"analyzer.fallback.analyze_batch[{size}]",
+            group="analyzer",
+            fn=lambda: fallback.analyze_batch(texts),
+            items=size,
+            params={"size": size},
+        ),
+    ]
+
+    pipeline = get_emotion_pipeline()
+    model_texts = texts[:model_size]
+    model = SentimentAnalyzer()
+    benchmarks.append(Benchmark(
+        name=f"analyzer.model.analyze_batch[{model_size}]",
+        group="analyzer",
+        fn=lambda: model.analyze_batch(model_texts),
+        items=len(model_texts),
+        params={"size": len(model_texts)},
+        repeat=3,
+        skip=None if pipeline is not None else "emotion model unavailable",
+    ))
+    return benchmarks
+
+
+def aggregator_suite(corpus: CorpusGenerator, size: int) -> List[Benchmark]:
+    from app.services.emotion_aggregator import EmotionAggregator
+    from app.services.sentiment_analyzer import SentimentAnalyzer
+
+    items = corpus.items(size)
+    analyzer = SentimentAnalyzer()
+    analyzer.pipeline = None
+    results = analyzer.analyze_batch([c.text for c in items])
+    source_content: Dict[str, list] = {}
+    for item in items:
+        source_content.setdefault(item.source, []).append(item)
+
+    aggregator = EmotionAggregator()
+    return [
+        Benchmark(
+            name=f"aggregator._aggregate_results[{size}]",
+            group="aggregator",
+            fn=lambda: aggregator._aggregate_results(items, results, source_content),
+            items=size,
+            params={"size": size},
+        ),
+    ]
+
+
+def topics_suite(corpus: CorpusGenerator, size: int) -> List[Benchmark]:
+    from app.services.history_store import TopicExtractor
+    from app.services.sentiment_analyzer import SentimentAnalyzer
+
+    items = corpus.items(size)
+    contents = to_content_dicts(items)
+    analyzer = SentimentAnalyzer()
+    analyzer.pipeline = None
+    results = [{"sentiment_score": r.sentiment_score} for r in analyzer.analyze_batch([c.text for c in items])]
+
+    extractor = TopicExtractor()
+    return [
+        Benchmark(
+            name=f"topics.extract_topics[{size}]",
+            group="topics",
+            fn=lambda: extractor.extract_topics(contents, results, limit=10),
+            items=size,
+            params={"size": size},
+        ),
+    ]
+
+
+def history_suite(corpus: CorpusGenerator, sizes: List[int]) -> List[Benchmark]:
+    from app.services.history_store import SentimentHistoryStore
+
+    emotion_state = {
+        "happiness": 0.4, "sadness": 0.1, "anger": 0.1, "fear": 0.05, "surprise": 0.2,
+        "disgust": 0.05, "confusion": 0.1, "pride": 0.1, "loneliness": 0.05, "pain": 0.05,
+        "overall_sentiment": 0.3, "intensity": 0.6,
+    }
+    topics = [{"topic": "python", "count": 5, "sentiment": 0.2}, {"topic": "rust", "count": 3, "sentiment": 0.5}]
+    sources = {"reddit": 50, "hackernews": 50, "rss": 50}
+
+    benchmarks = []
+    for size in sizes:
+        entries = corpus.history_entries(size)
+        store = SentimentHistoryStore()
+        store.load()
+        store.history = list(entries)
+        store.topic_index.rebuild(entries)
+        from_date = corpus.now - timedelta(hours=1)
+
+        def fresh_history(entries=entries, store=store):
+            store.history = list(entries)
+
+        benchmarks.extend([
+            Benchmark(
+                name=f"history.add_entry[{size}]",
+                group="history",
+                setup=fresh_history,
+                fn=lambda _, store=store: store.add_entry(emotion_state, topics, sources),
+                params={"entries": size},
+            ),
+            Benchmark(
+                name=f"history.get_history.last_hour[{size}]",
+                group="history",
+                setup=fresh_history,
+                fn=lambda _, store=store, from_date=from_date: store.get_history(from_date=from_date, limit=100),
+                params={"entries": size},
+            ),
+            Benchmark(
+                name=f"history.get_trending_topics[{size}]",
+                group="history",
+                fn=lambda store=store: store.get_trending_topics(hours=24, limit=10),
+                params={"entries": size},
+            ),
+            Benchmark(
+                name=f"history.topic_index.rebuild[{size}]",
+                group="history",
+                fn=lambda store=store, entries=entries: store.topic_index.rebuild(entries),
+                items=size,
+                params={"entries": size},
+                repeat=3,
+            ),
+        ])
+    return benchmarks
+
+
+API_ENDPOINTS = [
+    "/health",
+    "/api/v1/sentiment/current",
+    "/api/v1/sentiment/current/detailed",
+    "/api/v1/sentiment/history?limit=100",
+    "/api/v1/sentiment/topics?hours=24",
+    "/api/v1/sentiment/topics/heavy-hitters",
+    "/api/v1/sentiment/sources",
+    "/api/v1/sentiment/emotion-topics",
+    "/metrics",
+]
+
+
+def api_suite(corpus: CorpusGenerator, size: int, history_size: int, requests: int) -> List[Benchmark]:
+    """Endpoints over an in-process ASGI client, with and without the response cache."""
+    import httpx
+
+    from app.api.routes import sentiment
+    from app.core.response_cache import response_cache
+    from app.main import app
+    from app.services.emotion_aggregator import EmotionAggregator
+    from app.services.history_store import history_store
+    from app.services.sentiment_analyzer import SentimentAnalyzer
+
+    items = corpus.items(size)
+    analyzer = SentimentAnalyzer()
+    analyzer.pipeline = None
+    results = analyzer.analyze_batch([c.text for c in items])
+    source_content: Dict[str, list] = {}
+    for item in items:
+        source_content.setdefault(item.source, []).append(item)
+    sentiment._apply_emotion(EmotionAggregator()._aggregate_results(items, results, source_content))
+
+    entries = corpus.history_entries(history_size)
+    history_store.load()
+    history_store.history = entries
+    history_store.topic_index.rebuild(entries)
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    def requester(path: str, uncached: bool) -> Callable:
+        async def fetch():
+            for _ in range(requests):
+                if uncached:
+                    response_cache.bump()
+                response = await client.get(path)
+                response.raise_for_status()
+        return fetch
+
+    benchmarks = []
+    for path in API_ENDPOINTS:
+        # Only the sentiment routes go through the response cache
+        variants = (False, True) if path.startswith("/api/") else (False,)
+        for uncached in variants:
+            label = "uncached" if uncached else "cached"
+            benchmarks.append(Benchmark(
+                name=f"api.GET {path} [{label}]" if len(variants) > 1 else f"api.GET {path}",
+                group="api",
+                fn=requester(path, uncached),
+                items=requests,
+                params={"path": path, "requests": requests, "cache": label, "historyEntries": history_size},
+            ))
+    return benchmarks
+
+
+SUITES = ("analyzer", "aggregator", "topics", "history", "api")
@@ -0,0 +1 @@
+"""Load-testing harness for the REST and WebSocket endpoints (run with `python -m loadtest`)."""
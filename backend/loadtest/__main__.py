@@ -0,0 +1,239 @@
+"""Load test the REST and WebSocket endpoints.
+
+    cd backend
+    python -m loadtest --ws-clients 2000 --rps 200 --duration 60
+    python -m loadtest --url http://127.0.0.1:8000 --ws-clients 500   # an already running server
+
+By default a server with stubbed scrapers (loadtest.server) is started in
+a subprocess, so client load does not share its event loop. The run opens
+the WebSocket subscribers, drives the HTTP request mix while scheduled
+broadcasts fire, and reports request latency, broadcast delivery skew,
+memory per connection and the server's event loop lag. Results can be
+written as JSON and checked against latency SLOs to find the capacity of
+an instance size.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.clients import RequestMix, Subscribers, parse_mix, percentile
+from loadtest.server import raise_fd_limit
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+async def _server_stats(base_url: str) -> Optional[Dict]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        try:
+            response = await client.get("/loadtest/stats")
+        except httpx.HTTPError:
+            return None
+        return response.json() if response.status_code == 200 else None
+
+
+class ClientLag:
+    """Event loop lag of the load generator itself, to flag overloaded runs."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+
+async def run(args) -> Dict:
+    base_url = args.url.rstrip("/")
+    ws_url = base_url.replace("http", "ws", 1) + "/api/v1/sentiment/stream"
+    await _wait_ready(base_url)
+
+    client_lag = ClientLag()
+    lag_task = asyncio.create_task(client_lag.run())
+
+    baseline = await _server_stats(base_url)
+
+    print(f"Opening {args.ws_clients} WebSocket connections...")
+    subscribers = Subscribers(ws_url)
+    ramp_started = time.monotonic()
+    await subscribers.open(args.ws_clients, args.connect_concurrency)
+    ramp_seconds = time.monotonic() - ramp_started
+    connected = len(subscribers.connect_latencies)
+    print(f"Connected {connected} in {ramp_seconds:.1f}s ({subscribers.connect_errors} failed)")
+
+    # Let the initial state messages drain before measuring
+    await asyncio.sleep(1.0)
+    connected_stats = await _server_stats(base_url)
+    await _server_stats(base_url)  # reset the loop lag window
+
+    print(f"Running {args.rps:g} req/s for {args.duration:g}s with broadcasts firing...")
+    subscribers.start_recording()
+    requests = RequestMix(base_url, parse_mix(args.mix), args.rps, args.http_connections, seed=args.seed)
+    await requests.run(args.duration)
+    final_stats = await _server_stats(base_url)
+
+    await requests.close()
+    await subscribers.close()
+    lag_task.cancel()
+
+    report: Dict = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "websocket": {
+            "connected": connected,
+            "connectErrors": subscribers.connect_errors,
+            "connectP50": percentile(subscribers.connect_latencies, 50),
+            "connectP99": percentile(subscribers.connect_latencies, 99),
+            "rampSeconds": ramp_seconds,
+            **subscribers.broadcast_stats(connected),
+        },
+        "http": requests.stats(args.duration),
+        "clientLoopLagP99": percentile(client_lag.samples, 99),
+    }
+
+    if baseline and connected_stats and final_stats:
+        per_connection = (connected_stats["rssBytes"] - baseline["rssBytes"]) / connected if connected else None
+        lag = final_stats["loopLag"]
+        report["server"] = {
+            "rssBaselineBytes": baseline["rssBytes"],
+            "rssConnectedBytes": connected_stats["rssBytes"],
+            "rssFinalBytes": final_stats["rssBytes"],
+            "bytesPerConnection": per_connection,
+            "loopLagP50": percentile(lag, 50),
+            "loopLagP99": percentile(lag, 99),
+            "loopLagMax": max(lag) if lag else None,
+            "cycles": final_stats["cycles"] - connected_stats["cycles"],
+        }
+    return report
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return f"{seconds * 1000:.1f} ms" if seconds is not None else "n/a"
+
+
+def print_report(report: Dict, slo: Dict[str, float]) -> bool:
+    ws, http, server = report["websocket"], report["http"], report.get("server")
+
+    print("\nHTTP")
+    print(f"  {'endpoint':<16} {'requests':>9} {'errors':>7} {'p50':>10} {'p99':>10}")
+    for name, stats in http["endpoints"].items():
+        print(f"  {name:<16} {stats['requests']:>9} {stats['errors']:>7} {_ms(stats['p50']):>10} {_ms(stats['p99']):>10}")
+    print(f"  overall: {http['throughput'] or 0:.1f} req/s, p50 {_ms(http['p50'])}, p99 {_ms(http['p99'])}, "
+          f"{http['errors']} errors")
+
+    print("\nWebSocket")
+    print(f"  connected {ws['connected']} ({ws['connectErrors']} failed), "
+          f"handshake p50 {_ms(ws['connectP50'])} p99 {_ms(ws['connectP99'])}")
+    ratio = f"{ws['deliveryRatio']:.1%}" if ws["deliveryRatio"] is not None else "n/a"
+    print(f"  {ws['broadcasts']} broadcasts, delivered {ratio}, "
+          f"skew p50 {_ms(ws['skewP50'])} p99 {_ms(ws['skewP99'])} max {_ms(ws['skewMax'])}")
+
+    if server:
+        per_connection = server["bytesPerConnection"]
+        print("\nServer")
+        print(f"  RSS {server['rssBaselineBytes'] / 2**20:.1f} MiB idle, "
+              f"{server['rssConnectedBytes'] / 2**20:.1f} MiB connected, "
+              f"{server['rssFinalBytes'] / 2**20:.1f} MiB at end")
+        if per_connection is not None:
+            print(f"  {per_connection / 1024:.1f} KiB per WebSocket connection")
+        print(f"  event loop lag p50 {_ms(server['loopLagP50'])} p99 {_ms(server['loopLagP99'])} "
+              f"max {_ms(server['loopLagMax'])} over {server['cycles']} cycles")
+    else:
+        print("\nServer stats unavailable (is the target running loadtest.server?)")
+
+    client_lag = report["clientLoopLagP99"]
+    if client_lag is not None and client_lag > 0.05:
+        print(f"\nWarning: load generator loop lag p99 is {_ms(client_lag)}; "
+              "results are limited by the client, not the server")
+
+    checks = {
+        "http p99": (http["p99"], slo["http_p99"]),
+        "broadcast skew p99": (ws["skewP99"], slo["skew_p99"]),
+        "server loop lag p99": (server["loopLagP99"] if server else None, slo["loop_lag_p99"]),
+    }
+    passed = ws["connectErrors"] == 0 and http["errors"] == 0
+    print("\nSLO")
+    for name, (value, limit) in checks.items():
+        ok = value is not None and value <= limit
+        passed = passed and ok
+        print(f"  {name:<20} {_ms(value):>10} <= {_ms(limit):>10}  {'PASS' if ok else 'FAIL'}")
+    print(f"\n{'PASS' if passed else 'FAIL'}")
+    return passed
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.split("\n")[0])
+    parser.add_argument("--url", help="target server; by default a stubbed server is started")
+    parser.add_argument("--ws-clients", type=int, default=1000)
+    parser.add_argument("--connect-concurrency", type=int, default=200, help="handshakes in flight")
+    parser.add_argument("--rps", type=float, default=100, help="HTTP requests per second")
+    parser.add_argument("--mix", default="current=60,detailed=10,history=10,topics=10,sources=5,emotion-topics=5",
+                        help="endpoint weights, e.g. current=60,history=20,topics=20")
+    parser.add_argument("--http-connections", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--broadcast-interval", type=int, default=2, help="seconds between cycles (started server)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--slo-http-p99-ms", type=float, default=250)
+    parser.add_argument("--slo-skew-p99-ms", type=float, default=500)
+    parser.add_argument("--slo-loop-lag-p99-ms", type=float, default=100)
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    raise_fd_limit()
+    server = None
+    if not args.url:
+        port = _free_port()
+        args.url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "loadtest.server", "--port", str(port),
+             "--broadcast-interval", str(args.broadcast_interval), "--seed", str(args.seed)],
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    passed = print_report(report, {
+        "http_p99": args.slo_http_p99_ms / 1000,
+        "skew_p99": args.slo_skew_p99_ms / 1000,
+        "loop_lag_p99": args.slo_loop_lag_p99_ms / 1000,
+    })
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({**report, "passed": passed}, indent=2))
+        print(f"Wrote report to {args.output}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""WebSocket subscribers and the HTTP request mix."""
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import websockets
+
+ENDPOINTS = {
+    "current": "/api/v1/sentiment/current",
+    "detailed": "/api/v1/sentiment/current/detailed",
+    "history": "/api/v1/sentiment/history?limit=100",
+    "topics": "/api/v1/sentiment/topics",
+    "heavy-hitters": "/api/v1/sentiment/topics/heavy-hitters",
+    "sources": "/api/v1/sentiment/sources",
+    "emotion-topics": "/api/v1/sentiment/emotion-topics",
+    "health": "/health",
+}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+
+def parse_mix(value: str) -> List[Tuple[str, float]]:
+    """Parse "current=60,history=20" into (endpoint, weight) pairs."""
+    mix = []
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+class Subscribers:
+    """Holds WebSocket connections open and records when broadcasts arrive.
+
+    Broadcasts are identified by their state timestamp, so receipts of the
+    same update can be compared across clients.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.connect_latencies: List[float] = []
+        self.connect_errors = 0
+        self.disconnects = 0
+        self.receipts: Dict[str, List[float]] = defaultdict(list)
+        self.first_seen: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._recording = False
+
+    def __len__(self) -> int:
+        return len(self.connect_latencies) - self.disconnects
+
+    async def open(self, count: int, concurrency: int):
+        """Open `count` connections, at most `concurrency` handshakes at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+        connected = []
+
+        async def connect_one():
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    ws = await websockets.connect(self.url, open_timeout=30, max_queue=None, ping_interval=None)
+                except Exception:
+                    self.connect_errors += 1
+                    return
+                self.connect_latencies.append(time.perf_counter() - started)
+                connected.append(ws)
+
+        await asyncio.gather(*(connect_one() for _ in range(count)))
+        self._tasks = [asyncio.create_task(self._listen(ws)) for ws in connected]
+
+    def start_recording(self):
+        """Count broadcasts from now on, ignoring the initial state on connect."""
+        self._recording = True
+
+    async def _listen(self, ws):
+        try:
+            async for message in ws:
+                received = time.time()
+                if not self._recording:
+                    continue
+                key = json.loads(message).get("timestamp")
+                self.receipts[key].append(received)
+                self.first_seen.setdefault(key, received)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.disconnects += 1
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def broadcast_stats(self, clients: int) -> Dict:
+        """Delivery ratio and skew (last minus first receipt) per broadcast."""
+        # The broadcast in flight when recording stopped is incomplete
+        keys = sorted(self.receipts, key=self.first_seen.get)[:-1] or list(self.receipts)
+        skews = [max(self.receipts[k]) - min(self.receipts[k]) for k in keys]
+        delivered = sum(len(self.receipts[k]) for k in keys)
+        return {
+            "broadcasts": len(keys),
+            "deliveryRatio": delivered / (len(keys) * clients) if keys and clients else None,
+            "skewP50": percentile(skews, 50),
+            "skewP99": percentile(skews, 99),
+            "skewMax": max(skews) if skews else None,
+        }
+
+
+class RequestMix:
+    """Sends an open-loop request stream at a fixed rate.
+
+    Requests start on schedule whether or not earlier ones finished, so a
+    slow server shows up as latency rather than a lower request rate.
+    """
+
+    def __init__(self, base_url: str, mix: List[Tuple[str, float]], rps: float, connections: int, seed: int = 0):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        )
+        self.names = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.rps = rps
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self._rng = random.Random(seed)
+        self._inflight: set = set()
+
+    async def run(self, duration: float):
+        if self.rps <= 0:
+            await asyncio.sleep(duration)
+            return
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.rps
+        started = loop.time()
+        sent = 0
+        while loop.time() - started < duration:
+            name = self._rng.choices(self.names, self.weights)[0]
+            task = asyncio.create_task(self._request(name))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            sent += 1
+            await asyncio.sleep(max(0.0, started + sent * interval - loop.time()))
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _request(self, name: str):
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(ENDPOINTS[name])
+            if response.status_code >= 400:
+                self.errors[name] += 1
+                return
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return
+        self.latencies[name].append(time.perf_counter() - started)
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self, duration: float) -> Dict:
+        endpoints = {}
+        for name in self.names:
+            values = self.latencies.get(name, [])
+            endpoints[name] = {
+                "requests": len(values) + self.errors.get(name, 0),
+                "errors": self.errors.get(name, 0),
+                "p50": percentile(values, 50),
+                "p99": percentile(values, 99),
+            }
+        every = [v for values in self.latencies.values() for v in values]
+        completed = len(every)
+        return {
+            "endpoints": endpoints,
+            "throughput": completed / duration if duration else None,
+            "p50": percentile(every, 50),
+            "p99": percentile(every, 99),
+            "errors": sum(self.errors.values()),
+        }
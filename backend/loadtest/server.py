@@ -0,0 +1,169 @@
+"""The app with stubbed scrapers, for load testing.
+
+    python -m loadtest.server --port 8100 --broadcast-interval 2
+
+Scrapers return a rolling window of synthetic items, so every scheduled
+cycle analyzes new content and broadcasts to all WebSocket clients
+without touching the network. History and shared state are written to a
+temporary directory. GET /loadtest/stats reports resident memory, event
+loop lag and connected clients.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.corpus import CorpusGenerator
+
+
+class SyntheticScraper:
+    """Returns the next slice of a synthetic corpus on every scrape."""
+
+    def __init__(self, source: str, corpus: CorpusGenerator, pool: int = 2000, step: int = 10):
+        self.source = source
+        self._items = [c for c in corpus.items(pool * 3) if c.source == source]
+        self._offset = 0
+        self._step = step
+
+    @property
+    def source_name(self) -> str:
+        return self.source
+
+    async def scrape(self, limit: int = 100):
+        start = self._offset
+        self._offset = (self._offset + self._step) % len(self._items)
+        return [self._items[(start + i) % len(self._items)] for i in range(limit)]
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a periodic sleeper."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def drain(self) -> List[float]:
+        samples, self.samples = self.samples, []
+        return samples
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def raise_fd_limit():
+    """Allow as many open sockets as the hard limit permits."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def build_app(broadcast_interval: int, seed: int):
+    data_dir = Path(tempfile.mkdtemp(prefix="sentiment-loadtest-"))
+    os.environ.update({
+        "SCRAPE_INTERVAL_SECONDS": str(broadcast_interval),
+        "SCRAPE_SCHEDULE": "fixed",
+        "STATE_BACKEND": "memory",
+        "STATE_DIR": str(data_dir),
+        "LEADER_ELECTION": "none",
+        "DEBUG": "false",
+    })
+
+    from app.services import history_store as history_module
+    history_module.HISTORY_FILE = data_dir / "sentiment_history.json"
+    history_module.TOPIC_SKETCH_FILE = data_dir / "topic_sketch.json"
+
+    from app.services.analysis_archive import analysis_archive
+    analysis_archive.directory = data_dir / "analysis_archive"
+
+    from app.core.snapshot import runtime_snapshot
+    runtime_snapshot.path = data_dir / "runtime_snapshot.json"
+
+    from app.core.cycle import cycle_coordinator
+    from app.core.fanout import fanout
+    from app.main import app
+    from app.services.emotion_aggregator import EmotionAggregator
+
+    # Per-cycle INFO logs would dominate the server's own work
+    logging.getLogger().setLevel(logging.WARNING)
+
+    corpus = CorpusGenerator(seed=seed)
+    aggregator = EmotionAggregator()
+    aggregator.scrapers = [SyntheticScraper(source, corpus) for source in ("reddit", "hackernews", "rss")]
+    cycle_coordinator._aggregator = aggregator
+
+    monitor = LoopLagMonitor()
+    started = time.time()
+    original_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with original_lifespan(app):
+            monitor.start()
+            yield
+            monitor.stop()
+
+    app.router.lifespan_context = lifespan
+
+    @app.get("/loadtest/stats", include_in_schema=False)
+    async def loadtest_stats() -> Dict:
+        """Server-side measurements since the previous call."""
+        return {
+            "rssBytes": rss_bytes(),
+            "wsClients": len(fanout),
+            "cycles": cycle_coordinator.cycles,
+            "loopLag": monitor.drain(),
+            "uptime": time.time() - started,
+        }
+
+    # Ahead of the SPA catch-all route when static files are deployed
+    app.router.routes.insert(0, app.router.routes.pop())
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--broadcast-interval", type=int, default=2, help="seconds between scheduled cycles")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    raise_fd_limit()
+    app = build_app(args.broadcast_interval, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", backlog=4096)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""In-process stand-in for a Redis server, for tests.
+
+Speaks enough RESP for the state backend: AUTH, SELECT, GET, SET,
+PUBLISH and SUBSCRIBE. `drop_connections` closes every client connection,
+as a server restart would.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.state_backend import _read_reply
+
+
+def encode(value: Any) -> bytes:
+    """Encode a reply in RESP."""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return b"$%d\r\n" % len(value) + value + b"\r\n"
+
+
+class RespServer:
+    """Key/value store and pub/sub channels over RESP on localhost."""
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.values: Dict[bytes, bytes] = {}
+        self.subscribers: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+        self.commands: List[Tuple[bytes, ...]] = []
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{host}:{port}/1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self):
+        self.drop_connections()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def drop_connections(self):
+        """Close all client connections."""
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+        self.subscribers.clear()
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self.subscribers.get(channel.encode("utf-8"), ()))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await _read_reply(reader)
+                self.commands.append(tuple(command))
+                name = command[0].upper()
+                if name == b"AUTH":
+                    authenticated = command[1].decode("utf-8") == self.password
+                    writer.write(b"+OK\r\n" if authenticated else b"-ERR invalid password\r\n")
+                elif not authenticated:
+                    writer.write(b"-NOAUTH Authentication required.\r\n")
+                elif name == b"SELECT":
+                    writer.write(b"+OK\r\n")
+                elif name == b"GET":
+                    writer.write(encode(self.values.get(command[1])))
+                elif name == b"SET":
+                    self.values[command[1]] = command[2]
+                    writer.write(b"+OK\r\n")
+                elif name == b"SUBSCRIBE":
+                    self.subscribers.setdefault(command[1], set()).add(writer)
+                    writer.write(encode([b"subscribe", command[1], 1]))
+                elif name == b"PUBLISH":
+                    receivers = self.subscribers.get(command[1], set())
+                    for subscriber in receivers:
+                        subscriber.write(encode([b"message", command[1], command[2]]))
+                    writer.write(encode(len(receivers)))
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            for subscribers in self.subscribers.values():
+                subscribers.discard(writer)
+            writer.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from app.core.adaptive_interval import AdaptiveInterval
+from app.models.emotion import EmotionState
+
+CALM = EmotionState(happiness=0.3, sadness=0.2)
+
+
+def interval(**overrides):
+    return AdaptiveInterval(**{"base_seconds": 300, "min_seconds": 60, "max_seconds": 900, **overrides})
+
+
+def test_quiet_cycles_stretch_up_to_the_maximum():
+    schedule = interval()
+    seconds = [schedule.observe(1.0, 0.0, CALM) for _ in range(6)]
+
+    assert seconds[:3] == pytest.approx([375, 468.75, 585.9375])
+    assert seconds[-1] == 900
+    assert schedule.activity == 0.0
+
+
+def test_busy_cycles_shorten_in_proportion_to_activity():
+    schedule = interval()
+    # Twice the target share of new items halves the interval
+    assert schedule.observe(1.0, 0.4, CALM) == 150
+    # Activity is capped at 4, and the interval at its minimum
+    assert schedule.observe(1.0, 1.0, CALM) == 60
+    assert schedule.activity == 5.0
+
+
+def test_emotion_movement_counts_as_activity():
+    schedule = interval()
+    schedule.observe(1.0, 0.0, CALM)
+    assert schedule.seconds == 375
+
+    moved = CALM.model_copy(update={"anger": 0.15})
+    assert schedule.observe(1.0, 0.0, moved) == pytest.approx(125)
+    assert schedule.activity == pytest.approx(3.0)
+
+
+def test_moderate_activity_holds_the_interval():
+    schedule = interval()
+    assert schedule.observe(1.0, 0.15, CALM) == 300
+
+
+def test_slow_cycles_bound_the_duty_cycle():
+    schedule = interval(max_duty=0.5)
+    # A 200s cycle may take at most half of wall time
+    assert schedule.observe(200.0, 1.0, CALM) == 400
+    assert interval(base_seconds=10).seconds == 60
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from app.services.burst_detector import BurstDetector
+
+
+def test_steady_topic_scores_near_zero():
+    detector = BurstDetector(alpha=0.05)
+    for _ in range(300):
+        detector.observe({"weather": 10})
+
+    assert detector.score("weather") == pytest.approx(0.0, abs=0.01)
+    assert detector.baseline("weather")["mean"] == pytest.approx(10.0, abs=0.01)
+
+
+def test_spike_stands_out_from_a_noisy_baseline():
+    rng = random.Random(5)
+    detector = BurstDetector(alpha=0.05)
+    scores = []
+    for _ in range(300):
+        detector.observe({"weather": max(0.0, rng.gauss(10, 2)), "rust": max(0.0, rng.gauss(3, 1))})
+        scores.append(detector.score("weather"))
+
+    assert max(abs(score) for score in scores[100:]) < 4
+    detector.observe({"weather": 10, "rust": 30})
+    assert detector.score("rust") > 8
+    assert abs(detector.score("weather")) < 1
+
+
+def test_new_topic_is_scored_against_an_empty_baseline():
+    detector = BurstDetector(alpha=0.05, min_std=1.0)
+    detector.observe({"rust": 5})
+
+    # No history: (5 - 0) / sqrt(0 + 1)
+    assert detector.score("rust") == 5.0
+
+
+def test_absent_cycles_match_explicit_zero_counts():
+    lazy, explicit = BurstDetector(alpha=0.1), BurstDetector(alpha=0.1)
+    pattern = [4, 0, 0, 7, 0, 0, 0, 0, 2, 9, 0, 0, 0]
+    for count in pattern:
+        lazy.observe({"rust": count} if count else {"other": 1})
+        explicit.observe({"rust": count, "other": 1})
+
+    assert lazy.score("rust") == pytest.approx(explicit.score("rust"))
+    assert lazy.baseline("rust")["mean"] == pytest.approx(explicit.baseline("rust")["mean"])
+    assert lazy.baseline("rust")["std"] == pytest.approx(explicit.baseline("rust")["std"])
+    assert lazy.score("rust") < 0
+
+    lazy.observe({"rust": 5})
+    explicit.observe({"rust": 5, "other": 1})
+    assert lazy.score("rust") == pytest.approx(explicit.score("rust"))
+
+
+def test_decayed_topics_are_pruned():
+    detector = BurstDetector(alpha=0.5, prune_every=20)
+    detector.observe({"fad": 1})
+    for _ in range(19):
+        detector.observe({"steady": 1})
+
+    assert detector.baseline("fad") is None
+    assert detector.baseline("steady") is not None
+    assert detector.score("fad") == 0.0
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from app.services.content_index import ContentIndex, tokenize
+from app.services.sentiment_analyzer import AnalysisResult
+
+ANALYSIS = AnalysisResult(emotions={}, sentiment_score=0.0, confidence=1.0)
+
+CORPUS = {
+    "a": "rust compiler release notes",
+    "b": "rust rust rust borrow checker deep dive",
+    "c": "python release schedule",
+    "d": "rust and python interop with a long tail of unrelated words about many other things entirely",
+    "e": "golang release",
+}
+
+
+@pytest.fixture
+def index():
+    index = ContentIndex()
+    for key, title in CORPUS.items():
+        index.add({"url": f"https://example.com/{key}", "title": title, "text": ""}, ANALYSIS)
+    return index
+
+
+def ranked(index: ContentIndex, query: str):
+    return [document.url.rsplit("/", 1)[1] for document, _ in index.search(query)]
+
+
+def bm25(query: str, k1: float = 1.2, b: float = 0.75):
+    """Textbook BM25 over CORPUS, for documents matching every term."""
+    docs = {key: tokenize(title) for key, title in CORPUS.items()}
+    avg_length = sum(len(d) for d in docs.values()) / len(docs)
+    scores = {}
+    for key, words in docs.items():
+        terms = tokenize(query)
+        if not all(t in words for t in terms):
+            continue
+        score = 0.0
+        for term in dict.fromkeys(terms):
+            n = sum(term in d for d in docs.values())
+            idf = math.log(1 + (len(docs) - n + 0.5) / (n + 0.5))
+            f = words.count(term)
+            score += idf * f * (k1 + 1) / (f + k1 * (1 - b + b * len(words) / avg_length))
+        scores[key] = score
+    return scores
+
+
+def test_term_frequency_and_length_order_results(index):
+    # b repeats the term; d is long, so its single mention counts for least
+    assert ranked(index, "rust") == ["b", "a", "d"]
+
+
+def test_every_query_term_must_match(index):
+    assert ranked(index, "rust python") == ["d"]
+    assert ranked(index, "Release") == ["e", "c", "a"]
+    assert ranked(index, "rust haskell") == []
+    assert ranked(index, "!!!") == []
+
+
+@pytest.mark.parametrize("query", ["rust", "release", "python", "rust release", "rust rust"])
+def test_scores_match_textbook_bm25(index, query):
+    expected = bm25(query)
+    scores = {document.url.rsplit("/", 1)[1]: score for document, score in index.search(query)}
+    assert scores == pytest.approx(expected)
+
+
+def test_reindexing_changed_text_replaces_postings(index):
+    index.add({"url": "https://example.com/e", "title": "", "text": "rust release"}, ANALYSIS)
+    # Shorter than a, so it ranks first
+    assert ranked(index, "rust release") == ["e", "a"]
+    assert ranked(index, "golang") == []
+    assert len(index) == len(CORPUS)
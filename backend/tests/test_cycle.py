@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.core.cycle import CycleCoordinator
+from app.models.emotion import EmotionState
+
+
+def coordinator_with_fake_cycle(gate: asyncio.Event):
+    coordinator = CycleCoordinator()
+
+    async def fake_cycle():
+        coordinator.cycles += 1
+        await gate.wait()
+        return EmotionState(happiness=coordinator.cycles / 10)
+
+    coordinator._run_cycle = fake_cycle
+    return coordinator
+
+
+def test_concurrent_refreshes_join_the_running_cycle():
+    async def scenario():
+        gate = asyncio.Event()
+        coordinator = coordinator_with_fake_cycle(gate)
+
+        scheduled = asyncio.create_task(coordinator.run())
+        await asyncio.sleep(0.01)
+        assert coordinator.running
+        manual = [asyncio.create_task(coordinator.run()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        gate.set()
+        results = await asyncio.gather(scheduled, *manual)
+        assert {r.happiness for r in results} == {0.1}
+        assert (coordinator.cycles, coordinator.joined) == (1, 3)
+        assert not coordinator.running
+
+        # Once finished, the next call starts a new cycle
+        assert (await coordinator.run()).happiness == 0.2
+        assert (coordinator.cycles, coordinator.joined) == (2, 3)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_cycle():
+    async def scenario():
+        gate = asyncio.Event()
+        coordinator = coordinator_with_fake_cycle(gate)
+
+        first = asyncio.create_task(coordinator.run())
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(coordinator.run())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+
+        assert coordinator.running
+        gate.set()
+        assert (await second).happiness == 0.1
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert coordinator.cycles == 1
+
+    asyncio.run(scenario())
+
+
+def test_scrapers_are_empty_before_the_first_cycle():
+    assert CycleCoordinator().scrapers == []
@@ -0,0 +1,98 @@
+import asyncio
+from typing import List, Optional
+
+from app.core.fanout import FanOut
+from tests.test_state_backend import wait_until
+
+
+class FakeWebSocket:
+    """Records what is sent; sends wait while `gate` is closed."""
+
+    def __init__(self, gate: Optional[asyncio.Event] = None, fail: bool = False):
+        self.sent: List = []
+        self.closed_with: Optional[int] = None
+        self.gate = gate
+        self.fail = fail
+
+    async def send_text(self, data: str):
+        await self._send(data)
+
+    async def send_bytes(self, data: bytes):
+        await self._send(data)
+
+    async def _send(self, data):
+        if self.fail:
+            raise ConnectionError("client went away")
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+def test_stalled_client_is_evicted_without_blocking_others():
+    async def scenario():
+        fanout = FanOut(queue_size=4, send_timeout=0.5)
+        fast, stalled = FakeWebSocket(), FakeWebSocket(gate=asyncio.Event())
+        fanout.register(fast)
+        fanout.register(stalled)
+
+        for i in range(10):
+            fanout.publish(f"m{i}")
+            await asyncio.sleep(0.005)
+        # Delivered while the stalled client's send is still pending
+        await wait_until(lambda: len(fast.sent) == 10, timeout=0.1)
+        assert len(fanout) == 2
+
+        await wait_until(lambda: len(fanout) == 1)
+        assert stalled.closed_with == 1013
+        assert fanout.evicted == 1
+
+        fanout.publish("after")
+        await wait_until(lambda: fast.sent[-1] == "after")
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_skips_to_the_latest_messages():
+    async def scenario():
+        fanout = FanOut(queue_size=2, send_timeout=5.0)
+        gate = asyncio.Event()
+        slow = FakeWebSocket(gate=gate)
+        client = fanout.register(slow)
+
+        fanout.publish("m0")
+        await asyncio.sleep(0.01)
+        # m0 is being sent; m1..m3 overflow a queue of two
+        for i in range(1, 4):
+            fanout.publish(f"m{i}")
+        assert client.dropped == 1
+
+        gate.set()
+        await wait_until(lambda: len(slow.sent) == 3)
+        assert slow.sent == ["m0", "m2", "m3"]
+        fanout.unregister(client)
+
+    asyncio.run(scenario())
+
+
+def test_failed_send_evicts_and_encoders_shape_payloads():
+    class Encoder:
+        def encode(self, message):
+            return None if message == "skip" else message.encode()
+
+    async def scenario():
+        fanout = FanOut(queue_size=4, send_timeout=1.0)
+        broken, binary = FakeWebSocket(fail=True), FakeWebSocket()
+        fanout.register(broken)
+        client = fanout.register(binary, encoder=Encoder())
+
+        for message in ("a", "skip", "b"):
+            fanout.publish(message)
+        await wait_until(lambda: len(fanout) == 1 and len(binary.sent) == 2)
+        assert binary.sent == [b"a", b"b"]
+        assert broken.closed_with == 1013
+        fanout.unregister(client)
+
+    asyncio.run(scenario())
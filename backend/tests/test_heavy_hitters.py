@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.heavy_hitters import CountMinSketch, HeavyHitterTracker, SpaceSaving
+
+START = datetime(2026, 1, 1)
+
+
+def zipf_stream(n: int, keys: int, seed: int = 3):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, keys + 1)]
+    return rng.choices([f"topic-{i}" for i in range(keys)], weights=weights, k=n)
+
+
+def test_count_min_sketch_error_bound():
+    stream = zipf_stream(20000, 2000)
+    truth = Counter(stream)
+    sketch = CountMinSketch(width=256, depth=4)
+    for key in stream:
+        sketch.add(key)
+
+    bound = sketch.epsilon * sketch.total
+    errors = [sketch.estimate(key) - count for key, count in truth.items()]
+    assert min(errors) >= 0
+    # Each key exceeds the bound with probability at most delta
+    within = sum(error <= bound for error in errors) / len(errors)
+    assert within >= 1 - sketch.delta
+
+
+def test_space_saving_keeps_every_heavy_key_within_its_error():
+    stream = zipf_stream(20000, 2000)
+    truth = Counter(stream)
+    summary = SpaceSaving(capacity=50)
+    for key in stream:
+        summary.add(key)
+
+    total = len(stream)
+    for key, (count, error, _) in summary.counters.items():
+        assert count - error <= truth[key] <= count
+        assert error <= total / summary.capacity
+    for key, count in truth.items():
+        if count > total / summary.capacity:
+            assert key in summary.counters
+
+
+def test_decayed_counts_halve_every_half_life():
+    tracker = HeavyHitterTracker(capacity=10, width=64, depth=4, half_life_hours=6.0)
+    tracker.add("rust", count=8, sentiment=4.0, timestamp=START)
+    tracker.add("go", count=2, timestamp=START + timedelta(hours=6))
+
+    now = START + timedelta(hours=6)
+    assert tracker.estimate("rust", now=now) == pytest.approx(4.0)
+    top = tracker.top(now=now)
+    assert [t["topic"] for t in top] == ["rust", "go"]
+    assert top[0]["mentions"] == pytest.approx(4.0)
+    assert top[0]["avgSentiment"] == pytest.approx(0.5)
+    assert top[1]["mentions"] == pytest.approx(2.0)
+
+
+def test_rescaling_keeps_estimates_over_long_gaps():
+    tracker = HeavyHitterTracker(capacity=10, width=64, depth=4, half_life_hours=1.0)
+    tracker.add("rust", count=1, timestamp=START)
+    landmark = tracker.landmark
+
+    # Far enough that the forward-decay factor would overflow without rescaling
+    later = START + timedelta(hours=100)
+    tracker.add("go", count=1, timestamp=later)
+    assert tracker.landmark != landmark
+    assert tracker.estimate("go", now=later) == pytest.approx(1.0)
+    assert tracker.estimate("rust", now=later) == pytest.approx(2.0 ** -100, abs=1e-12)
+
+
+def test_snapshot_round_trip(tmp_path):
+    tracker = HeavyHitterTracker(capacity=5, width=32, depth=3, half_life_hours=2.0)
+    for i, key in enumerate(zipf_stream(500, 40)):
+        tracker.add(key, timestamp=START + timedelta(minutes=i))
+
+    path = tmp_path / "sketch.json"
+    tracker.save(path)
+    restored = HeavyHitterTracker.load(path)
+
+    now = START + timedelta(hours=10)
+    assert restored.top(now=now) == tracker.top(now=now)
+    assert restored.estimate("topic-0", now=now) == tracker.estimate("topic-0", now=now)
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+from app.api.routes import sentiment
+from app.core.leader import FileLockElector, LeaderElector, create_leader_elector
+from app.core.state_backend import RedisStateBackend
+from app.models.emotion import EmotionState
+from tests.resp_server import RespServer
+from tests.test_state_backend import wait_until
+
+
+def test_auto_election_follows_state_backend():
+    assert type(create_leader_elector("auto", "memory")) is LeaderElector
+    assert isinstance(create_leader_elector("auto", "local"), FileLockElector)
+    assert isinstance(create_leader_elector("auto", "redis"), FileLockElector)
+
+
+def test_election_without_shared_state_is_refused(caplog):
+    with caplog.at_level(logging.ERROR, logger="app.core.leader"):
+        elector = create_leader_elector("file", "memory")
+    # Every worker leads, so none is stuck on the default state
+    assert type(elector) is LeaderElector
+    assert "shared state backend" in caplog.text
+
+
+def test_follower_receives_leader_state(monkeypatch):
+    emotion = EmotionState(happiness=0.9, sadness=0.01, overall_sentiment=0.8, intensity=0.7)
+
+    async def scenario():
+        server = RespServer()
+        await server.start()
+        leader = RedisStateBackend(server.url, prefix="test")
+        follower = RedisStateBackend(server.url, prefix="test")
+        await leader.start(lambda channel, data: None)
+        await follower.start(sentiment.handle_state_message)
+        await wait_until(lambda: server.subscriber_count("test:events") == 2)
+        try:
+            monkeypatch.setattr(sentiment, "state_backend", leader)
+            sentiment.update_current_emotion(emotion)
+            # Both workers live in this process: forget the leader's copy
+            # before the update goes out, so only delivery can restore it
+            monkeypatch.setattr(sentiment, "_current_emotion", None)
+
+            await wait_until(lambda: sentiment._current_emotion is not None)
+            assert sentiment.get_current_emotion().happiness == 0.9
+
+            # A worker started later picks the state up from the backend
+            monkeypatch.setattr(sentiment, "_current_emotion", None)
+            monkeypatch.setattr(sentiment, "state_backend", follower)
+            await sentiment.restore_state()
+            assert sentiment.get_current_emotion().overall_sentiment == 0.8
+        finally:
+            await leader.stop()
+            await follower.stop()
+            await server.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+import pytest
+
+from app.core.metrics import Counter, Gauge, Histogram, Registry, _Metric
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = Registry()
+    monkeypatch.setattr("app.core.metrics.registry", registry)
+    return registry
+
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("test_metric", "")
+
+
+def test_render_labelled_metrics(registry):
+    Counter("test_items", "Items", ["source"]).labels("rss").inc(3)
+    Gauge("test_clients", "Clients", ["kind"]).labels("ws").set(2)
+    histogram = Histogram("test_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.5)
+
+    lines = registry.render().splitlines()
+    assert 'test_items_total{source="rss"} 3' in lines
+    assert 'test_clients{kind="ws"} 2' in lines
+    assert 'test_seconds_bucket{le="0.1"} 0' in lines
+    assert 'test_seconds_bucket{le="1"} 1' in lines
+    assert "test_seconds_count 1" in lines
@@ -0,0 +1,216 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+from app.services.search_cache import SearchCache
+
+
+class Compute:
+    """A search that counts its calls and waits on `gate` before answering."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, query: str):
+        self.calls += 1
+        call = self.calls
+        await self.gate.wait()
+        return {"query": query, "call": call}
+
+
+def age(cache: SearchCache, query: str, seconds: float):
+    cache._entries[cache.normalize(query)].created -= seconds
+
+
+def test_singleflight_shares_one_call_and_survives_cancelled_waiters():
+    async def scenario():
+        flight, compute = SingleFlight(), Compute()
+        compute.gate.clear()
+
+        waiters = [asyncio.create_task(flight.do("rust", lambda: compute("rust"))) for _ in range(5)]
+        other = asyncio.create_task(flight.do("go", lambda: compute("go")))
+        await asyncio.sleep(0.01)
+        assert flight.in_flight("rust") and compute.calls == 2
+
+        waiters[0].cancel()
+        compute.gate.set()
+        results = await asyncio.gather(*waiters[1:])
+        assert results == [{"query": "rust", "call": 1}] * 4
+        assert (await other)["call"] == 2
+        assert not flight.in_flight("rust")
+
+        # The next call after completion runs again
+        assert (await flight.do("rust", lambda: compute("rust")))["call"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_singleflight_shares_failures():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("scraper down")
+
+        results = await asyncio.gather(*(flight.do("q", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not flight.in_flight("q")
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_misses_are_coalesced_and_queries_normalized():
+    async def scenario():
+        cache, compute = SearchCache(ttl=60, stale_ttl=600), Compute()
+        compute.gate.clear()
+        pending = [asyncio.create_task(cache.get(q, compute)) for q in ("Rust", " rust ", "RUST")]
+        await asyncio.sleep(0)
+        compute.gate.set()
+
+        assert await asyncio.gather(*pending) == [{"query": "rust", "call": 1}] * 3
+        assert await cache.get("rust", compute) == {"query": "rust", "call": 1}
+        assert (cache.misses, cache.hits, compute.calls) == (3, 1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    async def scenario():
+        cache, compute = SearchCache(ttl=60, stale_ttl=600), Compute()
+        await cache.get("rust", compute)
+        age(cache, "rust", 120)
+        compute.gate.clear()
+
+        # Both served the stale value at once; only one refresh starts
+        assert await cache.get("rust", compute) == {"query": "rust", "call": 1}
+        assert await cache.get("rust", compute) == {"query": "rust", "call": 1}
+        assert cache.peek("rust") is None
+        await asyncio.sleep(0.01)
+        assert compute.calls == 2 and cache.stale_hits == 2
+
+        compute.gate.set()
+        await asyncio.gather(*cache._refreshes)
+        assert cache.peek("rust") == {"query": "rust", "call": 2}
+
+    asyncio.run(scenario())
+
+
+def test_expired_entry_waits_for_a_fresh_result():
+    async def scenario():
+        cache, compute = SearchCache(ttl=60, stale_ttl=600), Compute()
+        await cache.get("rust", compute)
+        age(cache, "rust", 1000)
+
+        assert await cache.get("rust", compute) == {"query": "rust", "call": 2}
+        assert cache.misses == 2
+
+    asyncio.run(scenario())
+
+
+def test_failed_background_refresh_keeps_the_stale_entry(caplog):
+    async def scenario():
+        cache = SearchCache(ttl=60, stale_ttl=600)
+        cache.put("rust", {"query": "rust"})
+        age(cache, "rust", 120)
+
+        async def fail(query):
+            raise RuntimeError("scraper down")
+
+        assert await cache.get("rust", fail) == {"query": "rust"}
+        await asyncio.gather(*cache._refreshes, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cache._entries["rust"].value == {"query": "rust"}
+
+    asyncio.run(scenario())
+    assert "Background search refresh failed" in caplog.text
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.put("a", {"q": "a"})
+    cache.put("b", {"q": "b"})
+    assert cache.peek("a") == {"q": "a"}
+    cache.put("c", {"q": "c"})
+
+    assert cache.peek("b") is None
+    assert list(cache._entries) == ["a", "c"]
+
+
+class StreamedSearch:
+    """A streamed search: two partial events, then the result."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+    async def __call__(self, query: str):
+        self.calls += 1
+        yield {"event": "partial", "data": {"source": "local"}}
+        await self.gate.wait()
+        yield {"event": "partial", "data": {"source": "reddit"}}
+        yield {"event": "result", "data": {"query": query, "call": self.calls}}
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+def test_stream_passes_partials_through_and_is_joined_by_get():
+    async def scenario():
+        cache, search = SearchCache(), StreamedSearch()
+        streamed = asyncio.create_task(collect(cache.stream("Rust", search)))
+        await asyncio.sleep(0.01)
+        joined = asyncio.create_task(cache.get("rust", Compute()))
+        await asyncio.sleep(0.01)
+        search.gate.set()
+
+        assert await streamed == [
+            {"event": "partial", "data": {"source": "local"}},
+            {"event": "partial", "data": {"source": "reddit"}},
+            {"event": "result", "data": {"query": "rust", "call": 1}},
+        ]
+        assert await joined == {"query": "rust", "call": 1}
+        assert search.calls == 1
+
+        # Answered from the cache
+        assert await collect(cache.stream("rust", search)) == [
+            {"event": "result", "data": {"query": "rust", "call": 1}}
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_stream_joins_a_search_in_flight():
+    async def scenario():
+        cache, compute, search = SearchCache(), Compute(), StreamedSearch()
+        compute.gate.clear()
+        running = asyncio.create_task(cache.get("rust", compute))
+        await asyncio.sleep(0.01)
+
+        streamed = asyncio.create_task(collect(cache.stream("rust", search)))
+        await asyncio.sleep(0.01)
+        compute.gate.set()
+
+        assert await streamed == [{"event": "result", "data": {"query": "rust", "call": 1}}]
+        assert await running == {"query": "rust", "call": 1}
+        assert search.calls == 0
+
+    asyncio.run(scenario())
+
+
+def test_disconnected_stream_still_caches_its_result():
+    async def scenario():
+        cache, search = SearchCache(), StreamedSearch()
+        stream = cache.stream("rust", search)
+        assert (await stream.__anext__())["event"] == "partial"
+        await stream.aclose()
+
+        search.gate.set()
+        await asyncio.sleep(0.01)
+        assert cache.peek("rust") == {"query": "rust", "call": 1}
+
+    asyncio.run(scenario())
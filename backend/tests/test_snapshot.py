@@ -0,0 +1,24 @@
+import json
+import os
+import stat
+
+from app.core.snapshot import RuntimeSnapshot
+from app.services.scrapers.reddit_scraper import RedditScraper
+
+
+def test_snapshot_file_is_private(tmp_path):
+    path = tmp_path / "runtime_snapshot.json"
+    snapshot = RuntimeSnapshot(path, interval_seconds=0, max_items=10, max_age_hours=1)
+    # A stale temporary file with wider permissions is tightened too
+    path.with_suffix(".tmp").write_text("")
+    os.chmod(path.with_suffix(".tmp"), 0o644)
+
+    snapshot._write({"version": 1})
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert json.loads(path.read_text()) == {"version": 1}
+
+
+def test_reddit_token_is_not_snapshotted():
+    assert not hasattr(RedditScraper, "to_dict")
+    assert not hasattr(RedditScraper, "restore")
@@ -0,0 +1,100 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.state_backend import LocalStateBackend, RedisStateBackend, StateBackend
+from tests.resp_server import RespServer
+
+CHANNEL = "test:events"
+
+
+async def wait_until(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timed out waiting for condition")
+        await asyncio.sleep(0.01)
+
+
+async def start_pair(server: RespServer):
+    received = {"a": [], "b": []}
+    a = RedisStateBackend(server.url, prefix="test")
+    b = RedisStateBackend(server.url, prefix="test")
+    await a.start(lambda channel, data: received["a"].append((channel, data)))
+    await b.start(lambda channel, data: received["b"].append((channel, data)))
+    await wait_until(lambda: server.subscriber_count(CHANNEL) == 2)
+    return a, b, received
+
+
+def test_state_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StateBackend()
+
+
+def test_get_set_publish_subscribe():
+    async def scenario():
+        server = RespServer(password="secret")
+        await server.start()
+        a, b, received = await start_pair(server)
+        try:
+            await a.set("emotion", '{"joy":1}')
+            assert await b.get("emotion") == '{"joy":1}'
+            assert await b.get("missing") is None
+
+            await a.publish("emotion", "direct")
+            a.publish_nowait("emotion", "queued", key="emotion")
+            await wait_until(lambda: len(received["b"]) == 2)
+            assert received["b"] == [("emotion", "direct"), ("emotion", "queued")]
+            # Workers skip their own messages
+            assert received["a"] == []
+            assert await b.get("emotion") == "queued"
+            assert (b"AUTH", b"secret") in server.commands
+            assert (b"SELECT", b"1") in server.commands
+        finally:
+            await a.stop()
+            await b.stop()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_after_server_drops_connections():
+    async def scenario():
+        server = RespServer()
+        await server.start()
+        a, b, received = await start_pair(server)
+        try:
+            await a.set("emotion", "before")
+            server.drop_connections()
+
+            # The stale command connection fails once, then is replaced
+            with pytest.raises((ConnectionError, asyncio.IncompleteReadError)):
+                await a.get("emotion")
+            assert await a.get("emotion") == "before"
+
+            # Subscriptions come back on their own
+            await wait_until(lambda: server.subscriber_count(CHANNEL) == 2)
+            await a.publish("emotion", "after")
+            await wait_until(lambda: received["b"] == [("emotion", "after")])
+        finally:
+            await a.stop()
+            await b.stop()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_worker_identity_is_taken_at_start(tmp_path):
+    async def scenario():
+        backend = LocalStateBackend(str(tmp_path))
+        assert backend.origin is None
+        await backend.start(lambda channel, data: None)
+        try:
+            assert backend.origin.split(":")[1] == str(os.getpid())
+            assert (tmp_path / f"worker-{os.getpid()}.sock").exists()
+        finally:
+            await backend.stop()
+        assert not list(tmp_path.glob("worker-*.sock"))
+
+    asyncio.run(scenario())
@@ -0,0 +1,151 @@
+import asyncio
+import gzip
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.static_assets import IMMUTABLE, MANIFEST_FILE, REVALIDATE, StaticAssets, main
+
+BODY = b"0123456789" * 300
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "index.html").write_text("<html>app</html>")
+    (tmp_path / "main.dart.js").write_bytes(BODY)
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "logo.3f2a9c1d.png").write_bytes(b"\x89PNG" + bytes(100))
+    return tmp_path
+
+
+@pytest.fixture
+def client(static_dir):
+    assets = StaticAssets(static_dir, exclude_prefixes=("assets/", "api/"), min_compress_bytes=1024)
+    assets.build()
+    assets.compress_missing()
+    return TestClient(assets)
+
+
+def test_full_response_and_revalidation(client):
+    response = client.get("/main.dart.js", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Cache-Control"] == REVALIDATE
+    etag = response.headers["ETag"]
+
+    cached = client.get("/main.dart.js", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    assert client.get("/main.dart.js", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_compressed_variant_has_its_own_etag(client):
+    response = client.get("/main.dart.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    # The test client decodes the body
+    assert response.content == BODY
+    assert int(response.headers["Content-Length"]) < len(BODY)
+    identity = client.get("/main.dart.js", headers={"Accept-Encoding": "identity"})
+    assert response.headers["ETag"] != identity.headers["ETag"]
+
+    # Either tag of the same content revalidates
+    revalidated = client.get(
+        "/main.dart.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+    assert client.get("/main.dart.js", headers={"Accept-Encoding": "gzip;q=0"}).headers.get("Content-Encoding") is None
+
+
+@pytest.mark.parametrize(
+    "range_header, start, end",
+    [("bytes=10-19", 10, 19), ("bytes=2990-", 2990, 2999), ("bytes=-5", 2995, 2999), ("bytes=0-99999", 0, 2999)],
+)
+def test_range_requests_return_partial_content(client, range_header, start, end):
+    response = client.get("/main.dart.js", headers={"Range": range_header, "Accept-Encoding": "gzip"})
+    assert response.status_code == 206
+    assert response.content == BODY[start:end + 1]
+    assert response.headers["Content-Range"] == f"bytes {start}-{end}/{len(BODY)}"
+    assert "Content-Encoding" not in response.headers
+
+
+def test_unsatisfiable_and_ignored_ranges(client):
+    response = client.get("/main.dart.js", headers={"Range": "bytes=3000-"})
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(BODY)}"
+
+    # Multiple ranges, other units and stale If-Range get the full body
+    for headers in (
+        {"Range": "bytes=0-1,5-6"},
+        {"Range": "items=0-1"},
+        {"Range": "bytes=0-1", "If-Range": '"stale"'},
+    ):
+        response = client.get("/main.dart.js", headers={**headers, "Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.content == BODY
+
+    etag = client.get("/main.dart.js", headers={"Accept-Encoding": "identity"}).headers["ETag"]
+    response = client.get("/main.dart.js", headers={"Range": "bytes=0-1", "If-Range": etag})
+    assert response.status_code == 206
+
+
+def test_routing_and_caching_policy(client):
+    logo = client.get("/assets/logo.3f2a9c1d.png")
+    assert logo.headers["Cache-Control"] == IMMUTABLE
+    assert "Content-Encoding" not in logo.headers
+
+    assert client.get("/").text == "<html>app</html>"
+    assert client.get("/some/client/route").text == "<html>app</html>"
+    assert client.get("/assets/missing.png").status_code == 404
+    assert client.post("/index.html").status_code == 405
+    assert client.head("/main.dart.js", headers={"Accept-Encoding": "identity"}).content == b""
+
+
+def test_stale_variant_is_ignored(static_dir):
+    variant = static_dir / "main.dart.js.gz"
+    variant.write_bytes(gzip.compress(b"old contents"))
+    (static_dir / "main.dart.js").write_bytes(BODY)
+    source_mtime = (static_dir / "main.dart.js").stat().st_mtime
+    os.utime(variant, (source_mtime - 10, source_mtime - 10))
+
+    assets = StaticAssets(static_dir)
+    assets.build()
+    assert "gzip" not in assets.assets["main.dart.js"].variants
+
+
+def test_saved_manifest_spares_hashing_at_startup(static_dir, monkeypatch):
+    assert main([str(static_dir)]) == 0
+    assert (static_dir / MANIFEST_FILE).exists()
+    assert (static_dir / "main.dart.js.gz").exists()
+
+    built = StaticAssets(static_dir)
+    built.build()
+    hashes = []
+    monkeypatch.setattr("app.core.static_assets._hash_file", lambda path: hashes.append(path.name) or "fresh")
+
+    loaded = StaticAssets(static_dir)
+    assert loaded.build() == 0
+    assert {rel: a.digest for rel, a in loaded.assets.items()} == {rel: a.digest for rel, a in built.assets.items()}
+    assert MANIFEST_FILE not in loaded.assets
+    assert "gzip" in loaded.assets["main.dart.js"].variants
+
+    # Only the changed file is hashed again
+    (static_dir / "index.html").write_text("<html>new</html>")
+    assert loaded.build() == 1
+    assert hashes == ["index.html"]
+    assert loaded.assets["index.html"].digest == "fresh"
+
+
+def test_missing_or_unreadable_manifest_builds_and_saves_one(static_dir):
+    (static_dir / MANIFEST_FILE).write_text("{not json")
+    assets = StaticAssets(static_dir)
+    asyncio.run(assets.load())
+    assert len(assets.assets) == 3
+
+    # Saved for the next worker or restart
+    assert StaticAssets(static_dir).build() == 0
@@ -0,0 +1,136 @@
+import json
+import random
+import struct
+from datetime import datetime, timedelta
+from typing import Dict
+
+import pytest
+
+from app.core.stream_protocol import (
+    DELTA,
+    FIELDS,
+    KEYFRAME,
+    SCALE,
+    SOURCES_BIT,
+    BinaryEncoder,
+    DeltaEncoder,
+    StateUpdate,
+    create_encoder,
+    negotiate,
+)
+from app.models.emotion import EmotionState
+
+START = datetime(2026, 1, 1)
+
+
+class DeltaDecoder:
+    """Client side of the JSON keyframe/delta encoding."""
+
+    def __init__(self):
+        self.values: Dict[str, float] = {}
+        self.sources: Dict[str, float] = {}
+        self.timestamp = 0
+
+    def apply(self, frame: str):
+        message = json.loads(frame)
+        if message["t"] == "k":
+            self.values, self.sources = {}, {}
+        self.values.update(message["v"])
+        if "s" in message:
+            self.sources = message["s"]
+        self.timestamp = message["ts"]
+
+
+class BinaryDecoder(DeltaDecoder):
+    """Client side of the binary frames, following the module docstring."""
+
+    def apply(self, frame: bytes):
+        kind, self.timestamp = struct.unpack_from("<BI", frame)
+        if kind == KEYFRAME:
+            raw = struct.unpack_from(f"<{len(FIELDS)}h", frame, 5)
+            self.values = {name: value / SCALE for name, value in zip(FIELDS, raw)}
+            self.sources = self._sources(frame, 5 + 2 * len(FIELDS))
+            return
+
+        assert kind == DELTA
+        (mask,) = struct.unpack_from("<H", frame, 5)
+        offset = 7
+        for i, name in enumerate(FIELDS):
+            if mask & (1 << i):
+                (value,) = struct.unpack_from("<h", frame, offset)
+                self.values[name] = value / SCALE
+                offset += 2
+        if mask & SOURCES_BIT:
+            self.sources = self._sources(frame, offset)
+
+    @staticmethod
+    def _sources(frame: bytes, offset: int) -> Dict[str, float]:
+        (count,) = struct.unpack_from("<B", frame, offset)
+        offset += 1
+        sources = {}
+        for _ in range(count):
+            (length,) = struct.unpack_from("<B", frame, offset)
+            name = frame[offset + 1:offset + 1 + length].decode("utf-8")
+            (value,) = struct.unpack_from("<h", frame, offset + 1 + length)
+            sources[name] = value / SCALE
+            offset += 3 + length
+        return sources
+
+
+def random_states(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    state = {name: rng.random() for name in FIELDS}
+    for i in range(n):
+        # A few fields move each cycle, the rest stay put
+        for name in rng.sample(FIELDS, rng.randint(0, 4)):
+            state[name] = rng.random()
+        state["overallSentiment"] = rng.uniform(-1, 1) if i % 3 == 0 else state["overallSentiment"]
+        sources = {"reddit": 0.5, "hackernews": 0.3, "rss": 0.2}
+        if i % 5 == 0:
+            sources = {"reddit": rng.random(), "hackernews": rng.random()}
+        yield EmotionState(**state, timestamp=START + timedelta(seconds=30 * i), sourceContributions=sources)
+
+
+@pytest.mark.parametrize("encoder_class, decoder_class", [(DeltaEncoder, DeltaDecoder), (BinaryEncoder, BinaryDecoder)])
+def test_frames_round_trip_to_the_quantized_state(encoder_class, decoder_class):
+    encoder, decoder = encoder_class(keyframe_interval=7), decoder_class()
+    kinds = []
+    for emotion in random_states(60):
+        frame = encoder.encode(StateUpdate(emotion))
+        if frame is None:
+            continue
+        kinds.append(frame[0] if isinstance(frame, bytes) else json.loads(frame)["t"])
+        decoder.apply(frame)
+
+        data = emotion.model_dump(by_alias=True)
+        for name in FIELDS:
+            assert decoder.values[name] == pytest.approx(data[name], abs=0.5 / SCALE)
+        assert decoder.sources == pytest.approx(data["sourceContributions"], abs=0.5 / SCALE)
+        assert decoder.timestamp == int((emotion.timestamp - datetime(1970, 1, 1)).total_seconds())
+
+    keyframe = KEYFRAME if encoder_class is BinaryEncoder else "k"
+    # A keyframe first, then one after every `keyframe_interval` deltas
+    assert [i for i, kind in enumerate(kinds) if kind == keyframe] == list(range(0, len(kinds), 8))
+
+
+def test_unchanged_state_sends_nothing_and_deltas_are_small():
+    emotion = EmotionState(happiness=0.5, sadness=0.25, timestamp=START, sourceContributions={"reddit": 1.0})
+    encoder = BinaryEncoder()
+    keyframe = encoder.encode(StateUpdate(emotion))
+
+    assert encoder.encode(StateUpdate(emotion)) is None
+    # Below the quantization step is not a change either
+    assert encoder.encode(StateUpdate(emotion.model_copy(update={"happiness": 0.50001}))) is None
+
+    delta = encoder.encode(StateUpdate(emotion.model_copy(update={"anger": 0.75})))
+    assert len(delta) == 9
+    assert len(keyframe) == 5 + 2 * len(FIELDS) + 1 + 1 + len("reddit") + 2
+
+
+def test_negotiation_prefers_subprotocols():
+    assert negotiate(None, []) == ("json", None)
+    assert negotiate("binary", []) == ("binary", None)
+    assert negotiate("json", ["other", "sentiment.delta.v1"]) == ("delta", "sentiment.delta.v1")
+    assert negotiate("nonsense", []) == ("json", None)
+    assert type(create_encoder("binary", 5)) is BinaryEncoder
+    assert create_encoder("json").encode(StateUpdate(EmotionState())) == EmotionState().model_dump_json(by_alias=True)
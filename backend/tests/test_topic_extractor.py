@@ -0,0 +1,97 @@
+import re
+
+from benchmarks.corpus import CorpusGenerator
+from app.services.history_store import TopicExtractor
+
+FILLERS = [
+    "apple", "banana", "cherry", "delta", "eagle", "falcon", "garden", "harbor", "island", "jungle",
+    "kernel", "lemon", "mango", "nectar", "orbit", "planet", "quartz", "river", "saturn", "tiger",
+]
+
+
+def baseline_words(extractor: TopicExtractor, text: str):
+    """Word extraction as it was before phrase detection."""
+    filtered = []
+    for word in re.findall(r"\b[a-z]{3,}\b", text.lower()):
+        if word in extractor.STOP_WORDS or word in extractor.GENERIC_WORDS:
+            continue
+        normalized = extractor.STEM_MAPPINGS.get(word, word)
+        if normalized not in filtered and len(normalized) >= 3:
+            filtered.append(normalized)
+    return filtered
+
+
+def extract(titles, sentiment=0.5):
+    contents = [{"title": title} for title in titles]
+    results = [{"sentiment_score": sentiment} for _ in titles]
+    return TopicExtractor().extract_topics(contents, results, limit=10)
+
+
+def test_words_match_baseline_extraction():
+    extractor = TopicExtractor()
+    titles = [item.title for item in CorpusGenerator(seed=7).items(500)] + [
+        "Rust rust RUST: the tested build",
+        "Café owner's GPT4 naïve résumé",
+        "multi\nline title_with_underscore",
+    ]
+    for title in titles:
+        assert extractor._extract_words(title) == baseline_words(extractor, title)
+
+    assert extractor._extract_words("Rust rust, Kubernetes tested rust") == ["rust", "kubernetes", "test"]
+    assert extractor._extract_words("Café naïve") == []
+
+
+def test_stop_words_and_punctuation_break_phrases():
+    extractor = TopicExtractor()
+
+    assert extractor._tokenize("the Supreme Court's ruling")[1] == {"supreme court"}
+    assert extractor._tokenize("Court of Appeals")[1] == set()
+    assert extractor._tokenize("court, appeals")[1] == set()
+    assert extractor._tokenize("court said appeals")[1] == set()
+    assert extractor._tokenize("machine learning model")[1] == {
+        "machine learning", "learning model", "machine learning model",
+    }
+
+
+def test_recurring_pair_becomes_a_phrase():
+    titles = [f"Supreme Court, {filler}" for filler in FILLERS[:10]]
+    titles += [f"{filler} forecast" for filler in FILLERS[10:]]
+    assert len(titles) == TopicExtractor.MIN_PHRASE_DOCS
+
+    topics = {t["topic"]: t["count"] for t in extract(titles)}
+
+    assert topics["supreme court"] == 10
+    assert "supreme" not in topics and "court" not in topics
+    assert topics["forecast"] == 10
+
+
+def test_small_batches_have_no_phrases():
+    titles = [f"Supreme Court, {filler}" for filler in FILLERS[:10]]
+    titles += [f"{filler} forecast" for filler in FILLERS[10:19]]
+    assert len(titles) < TopicExtractor.MIN_PHRASE_DOCS
+
+    topics = {t["topic"]: t["count"] for t in extract(titles)}
+
+    assert topics == {"supreme": 10, "court": 10, "forecast": 9}
+
+
+def test_triple_absorbs_its_pairs():
+    titles = [f"Machine learning model, {filler}" for filler in FILLERS[:10]]
+    titles += [f"{filler} forecast" for filler in FILLERS[10:]]
+
+    topics = extract(titles, sentiment=-0.25)
+
+    assert topics[0] == {"topic": "machine learning model", "count": 10, "sentiment": -0.25}
+    assert not {"machine learning", "learning model", "machine", "learning"} & {t["topic"] for t in topics}
+
+
+def test_pairs_that_also_appear_apart_are_not_phrases():
+    # "court" and "ruling" each appear far more often on their own
+    titles = ["court ruling", "court ruling"]
+    titles += [f"court {filler}," for filler in FILLERS[:9]]
+    titles += [f"{filler}, ruling" for filler in FILLERS[9:18]]
+
+    topics = {t["topic"] for t in extract(titles)}
+
+    assert "court ruling" not in topics
+    assert {"court", "ruling"} <= topics
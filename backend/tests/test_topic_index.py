@@ -0,0 +1,85 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.topic_index import BUCKET_SECONDS, TopicIndex
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+def entry(timestamp: datetime, *topics: str, emotion: str = "happiness", sentiment: float = 0.5):
+    return {
+        "timestamp": timestamp.isoformat(),
+        "topics": [{"topic": t, "count": 1, "sentiment": sentiment} for t in topics],
+        "dominantEmotion": emotion,
+    }
+
+
+def mentions(index: TopicIndex, hours: int, now: datetime):
+    return {t["topic"]: t["mentions"] for t in index.get_trending(hours, limit=None, now=now)}
+
+
+def test_topics_expire_from_each_window_separately():
+    index = TopicIndex(max_hours=3)
+    index.add(START, [{"topic": "rust", "count": 2, "sentiment": 1.0}], "happiness")
+    index.add(START + timedelta(minutes=90), [{"topic": "go", "count": 1, "sentiment": -1.0}], "anger")
+
+    now = START + timedelta(minutes=100)
+    assert mentions(index, 1, now) == {"go": 1}
+    assert mentions(index, 2, now) == {"rust": 2, "go": 1}
+
+    now = START + timedelta(hours=3, minutes=30)
+    assert mentions(index, 3, now) == {"go": 1}
+    # The longest window dropped the bucket entirely
+    assert len(index._buckets) == 1
+
+
+def test_trending_aggregates_sentiment_and_emotion():
+    index = TopicIndex(max_hours=2)
+    index.add(START, [{"topic": "rust", "count": 1, "sentiment": 1.0}], "happiness")
+    index.add(START, [{"topic": "rust", "count": 1, "sentiment": 0.0}], "fear")
+    index.add(START + timedelta(minutes=5), [{"topic": "rust", "count": 2, "sentiment": 0.5}], "fear")
+
+    [rust] = index.get_trending(1, now=START + timedelta(minutes=10))
+    assert rust == {"topic": "rust", "mentions": 4, "avgSentiment": 0.375, "dominantEmotion": "fear"}
+
+
+def test_out_of_order_entries_join_the_latest_bucket():
+    index = TopicIndex(max_hours=1)
+    index.add(START + timedelta(minutes=30), [{"topic": "late"}], "neutral")
+    index.add(START, [{"topic": "early"}], "neutral")
+
+    # Counted from the later bucket, so it lives as long as "late"
+    now = START + timedelta(minutes=80)
+    assert mentions(index, 1, now) == {"late": 1, "early": 1}
+    assert mentions(index, 1, START + timedelta(minutes=91)) == {}
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_windows_match_a_full_scan(seed):
+    rng = random.Random(seed)
+    topics = ["rust", "go", "python", "zig", "elixir"]
+    history = []
+    timestamp = START
+    for _ in range(400):
+        timestamp += timedelta(seconds=rng.randint(0, 600))
+        history.append(entry(timestamp, *rng.sample(topics, rng.randint(1, 3))))
+
+    now = timestamp + timedelta(minutes=1)
+    rebuilt = TopicIndex(max_hours=24)
+    rebuilt.rebuild(history, now=now)
+    incremental = TopicIndex(max_hours=24)
+    for e in history:
+        incremental.add(datetime.fromisoformat(e["timestamp"]), e["topics"], e["dominantEmotion"])
+
+    now_key = rebuilt._bucket_key(now)
+    for hours in (1, 3, 12, 24):
+        lower = now_key - hours * 3600 // BUCKET_SECONDS
+        expected = Counter()
+        for e in history:
+            if rebuilt._bucket_key(datetime.fromisoformat(e["timestamp"])) >= lower:
+                expected.update(t["topic"] for t in e["topics"])
+        assert mentions(rebuilt, hours, now) == dict(expected)
+        assert mentions(incremental, hours, now) == dict(expected)
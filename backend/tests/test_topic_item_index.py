@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+from app.services.topic_item_index import TopicItemIndex
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+def item(n: int, score: int = 0):
+    return {"url": f"https://example.com/{n}", "title": f"title {n}", "source": "reddit", "score": score}
+
+
+def urls(index: TopicItemIndex, topic: str, now: datetime):
+    return [i["url"] for i in index.top_items(topic, limit=100, now=now)]
+
+
+def test_top_items_are_ordered_by_score():
+    index = TopicItemIndex()
+    for n, score in enumerate([5, 50, 20]):
+        index.add(item(n, score), 0.1, ["rust"], now=START)
+    index.add(item(3, 99), 0.1, ["go"], now=START)
+
+    assert urls(index, " Rust ", START) == [item(1)["url"], item(2)["url"], item(0)["url"]]
+    assert index.top_items("rust", limit=1, now=START)[0]["score"] == 50
+    assert index.top_items("python", now=START) == []
+
+
+def test_rescraped_item_refreshes_its_entry():
+    index = TopicItemIndex()
+    index.add(item(0, score=1), 0.1, ["rust"], now=START)
+    index.add(item(0, score=7), -0.4, ["rust"], now=START + timedelta(minutes=5))
+
+    assert len(index) == 1
+    [entry] = index.top_items("rust", now=START + timedelta(minutes=5))
+    assert (entry["score"], entry["sentiment"]) == (7, -0.4)
+
+
+def test_readded_item_drops_topics_it_no_longer_has():
+    index = TopicItemIndex()
+    index.add(item(0), 0.1, ["rust", "async"], now=START)
+    index.add(item(1), 0.1, ["async"], now=START)
+    index.add(item(0), 0.1, ["rust", "tokio"], now=START + timedelta(minutes=5))
+
+    now = START + timedelta(minutes=5)
+    assert urls(index, "async", now) == [item(1)["url"]]
+    assert urls(index, "tokio", now) == [item(0)["url"]]
+    assert index._items[item(0)["url"]].topics == {"rust", "tokio"}
+
+    index.add(item(1), 0.1, [], now=now)
+    assert "async" not in index._postings
+
+
+def test_items_expire_outside_the_window():
+    index = TopicItemIndex(window_hours=1)
+    index.add(item(0), 0.1, ["rust"], now=START)
+    index.add(item(1), 0.1, ["rust"], now=START + timedelta(minutes=30))
+    # Seen again, so it lives past its first sighting
+    index.add(item(0), 0.1, ["rust"], now=START + timedelta(minutes=50))
+
+    assert urls(index, "rust", START + timedelta(minutes=100)) == [item(0)["url"]]
+    assert urls(index, "rust", START + timedelta(minutes=111)) == []
+    assert len(index) == 0 and index._postings == {}
+
+
+def test_each_topic_keeps_its_most_recently_seen_items():
+    index = TopicItemIndex(max_items_per_topic=2)
+    for n in range(3):
+        index.add(item(n, score=n), 0.1, ["rust", f"only{n}"], now=START + timedelta(minutes=n))
+    # Re-seeing item 1 makes item 2 the least recent
+    index.add(item(1, score=1), 0.1, ["rust", "only1"], now=START + timedelta(minutes=3))
+    index.add(item(3, score=3), 0.1, ["rust"], now=START + timedelta(minutes=4))
+
+    now = START + timedelta(minutes=4)
+    assert sorted(urls(index, "rust", now)) == [item(1)["url"], item(3)["url"]]
+    # Evicted from one topic, still listed under its others
+    assert urls(index, "only2", now) == [item(2)["url"]]
+
+
+def test_snapshot_round_trip():
+    # restore() prunes against the clock, so the snapshot has to be recent
+    now = datetime.utcnow()
+    index = TopicItemIndex()
+    index.add(item(0, score=3), 0.2, ["rust", "async"], now=now - timedelta(minutes=2))
+    index.add(item(1, score=9), -0.1, ["rust"], now=now - timedelta(minutes=1))
+
+    restored = TopicItemIndex()
+    restored.restore(index.to_dict())
+    assert restored.to_dict() == index.to_dict()
+    assert urls(restored, "rust", now) == [item(1)["url"], item(0)["url"]]
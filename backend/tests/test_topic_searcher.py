@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.metrics import INFERENCE_QUEUE_WAIT
+from app.services import sentiment_analyzer, topic_searcher
+from app.services.content_index import ContentIndex
+
+
+def fake_pipeline(texts):
+    """Scores texts mentioning "great" as joy and everything else as anger."""
+    return [
+        [{"label": "joy" if "great" in text else "anger", "score": 0.9}, {"label": "neutral", "score": 0.1}]
+        for text in texts
+    ]
+
+
+@pytest.fixture
+def searcher(monkeypatch):
+    monkeypatch.setattr(sentiment_analyzer, "_emotion_pipeline", fake_pipeline)
+    monkeypatch.setattr(topic_searcher, "content_index", ContentIndex())
+    return topic_searcher.TopicSearcher()
+
+
+def test_batch_has_one_result_per_text(searcher):
+    results = searcher.analyzer.analyze_batch(["a great day", "ok", "", "an awful day"])
+
+    assert [r.emotions for r in results] == [{"happiness": 0.9}, {}, {}, {"anger": 0.9}]
+
+
+def test_concurrent_batches_queue_for_the_model(searcher, monkeypatch):
+    running = []
+
+    def slow_pipeline(texts):
+        running.append(texts)
+        assert len(running) == 1, "batches overlapped"
+        time.sleep(0.05)
+        running.pop()
+        return fake_pipeline(texts)
+
+    monkeypatch.setattr(searcher.analyzer, "pipeline", slow_pipeline)
+    waits, waited = INFERENCE_QUEUE_WAIT._state.count, INFERENCE_QUEUE_WAIT._state.sum
+    threads = [
+        threading.Thread(target=searcher.analyzer.analyze_batch, args=(["a great day"],)) for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert INFERENCE_QUEUE_WAIT._state.count == waits + 2
+    # The second batch waited out the first
+    assert INFERENCE_QUEUE_WAIT._state.sum - waited >= 0.04
+
+
+def test_merge_keeps_analyses_aligned_with_short_texts(searcher):
+    remote = [
+        {"url": "https://x/1", "title": "one", "text": "a great launch", "source": "reddit", "score": 1},
+        {"url": "https://x/2", "title": "two", "text": "meh", "source": "reddit", "score": 1},
+        {"url": "https://x/3", "title": "three", "text": "an awful outage", "source": "reddit", "score": 1},
+    ]
+    content, results = [], []
+
+    assert asyncio.run(searcher._merge_remote(remote, set(), content, results))
+
+    assert len(results) == len(content) == 3
+    assert results[0].emotions == {"happiness": 0.9}
+    assert results[1].emotions == {}
+    assert results[2].emotions == {"anger": 0.9}
+    index = topic_searcher.content_index
+    assert index.get("https://x/2").analysis.emotions == {}
+    assert index.get("https://x/3").analysis.emotions == {"anger": 0.9}
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.core.tracing import Tracer, _current_span
+
+
+def test_trace_is_finished_when_block_raises():
+    tracer = Tracer()
+    with pytest.raises(RuntimeError):
+        with tracer.trace("cycle"):
+            with tracer.span("stage"):
+                raise RuntimeError("boom")
+
+    [summary] = tracer.recent()
+    assert summary["name"] == "cycle"
+    assert "boom" in summary["error"]
+    assert _current_span.get() is None
+
+
+def test_stream_does_not_leak_current_span_to_consumer():
+    tracer = Tracer()
+
+    async def stream():
+        root = tracer.start_trace("search", query="q")
+        error = None
+        try:
+            for step in ("first", "second"):
+                with tracer.activate(root):
+                    task = asyncio.create_task(remote(step))
+                await task
+                with tracer.activate(root), tracer.span("local", step=step):
+                    pass
+                yield step
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            tracer.end_trace(root, error)
+
+    async def remote(step):
+        with tracer.span("remote", step=step):
+            await asyncio.sleep(0)
+
+    async def consume():
+        seen = []
+        async for step in stream():
+            assert _current_span.get() is None
+            seen.append(step)
+        return seen
+
+    assert asyncio.run(consume()) == ["first", "second"]
+    trace = tracer.get(tracer.recent()[0]["traceId"])
+    root, *children = trace["spans"]
+    assert root["name"] == "search" and root["durationMs"] is not None
+    assert [s["name"] for s in children] == ["remote", "local", "remote", "local"]
+    assert all(s["parentId"] == root["spanId"] for s in children)
+
+
+def test_abandoned_stream_still_finishes_trace():
+    tracer = Tracer()
+
+    async def stream():
+        root = tracer.start_trace("search")
+        error = None
+        try:
+            while True:
+                yield 1
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            tracer.end_trace(root, error)
+
+    async def consume():
+        events = stream()
+        await events.__anext__()
+        await events.aclose()
+
+    asyncio.run(consume())
+    assert "GeneratorExit" in tracer.recent()[0]["error"]
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core import warmup as warmup_module
+from app.services import history_store as history_module
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_module, "HISTORY_FILE", tmp_path / "sentiment_history.json")
+    monkeypatch.setattr(history_module, "TOPIC_SKETCH_FILE", tmp_path / "topic_sketch.json")
+    store = history_module.SentimentHistoryStore()
+    monkeypatch.setattr(history_module, "history_store", store)
+    return store
+
+
+def test_ensure_loaded_does_not_block_event_loop(store, monkeypatch):
+    load = store._load
+    monkeypatch.setattr(store, "_load", lambda: (time.sleep(0.3), load()))
+
+    async def scenario():
+        # Startup is loading in a worker thread when a request arrives
+        loader = threading.Thread(target=store.load)
+        loader.start()
+        await asyncio.sleep(0.05)
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while not store.loaded:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(store.ensure_loaded(), tick())
+        loader.join()
+        return ticks
+
+    assert asyncio.run(scenario()) > 5
+    assert store.loaded
+
+
+def test_storage_is_warm_only_after_a_successful_load(store, monkeypatch):
+    def fail():
+        raise OSError("disk unavailable")
+
+    monkeypatch.setattr(store, "load", fail)
+    warmup = warmup_module.Warmup()
+    asyncio.run(warmup._warm_storage())
+
+    assert warmup.storage is False
+    assert warmup.errors["storage"] == "disk unavailable"
+    assert not warmup.ready
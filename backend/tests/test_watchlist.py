@@ -0,0 +1,64 @@
+import pytest
+
+from app.services import watchlist as watchlist_module
+from app.services.sentiment_analyzer import AnalysisResult
+from app.services.watchlist import AhoCorasick, Watchlist
+
+
+def test_overlapping_terms_all_match():
+    matcher = AhoCorasick(["new york", "york", "new york city", "york city"])
+
+    assert matcher.find("a trip to new york city today") == {"new york", "york", "new york city", "york city"}
+    assert matcher.find("new york") == {"new york", "york"}
+
+
+def test_terms_match_on_word_boundaries_only():
+    matcher = AhoCorasick(["ai", "he", "she", "hers"])
+
+    assert matcher.find("she said ushers wait") == {"she"}
+    assert matcher.find("ai, then (ai) and ai") == {"ai"}
+    assert matcher.find("air hair maid") == set()
+    assert matcher.find("hers") == {"hers"}
+
+
+def test_failure_links_recover_a_match_after_a_partial_one():
+    matcher = AhoCorasick(["big apple pie", "apple tart", "pie"])
+
+    # "big apple t" fails to extend "big apple pie" and falls back into "apple tart"
+    assert matcher.find("a big apple tart") == {"apple tart"}
+    assert matcher.find("big apple pier") == set()
+    assert matcher.find("big apple pie") == {"big apple pie", "pie"}
+
+
+@pytest.fixture
+def watchlist_file(tmp_path, monkeypatch):
+    path = tmp_path / "watchlist.json"
+    monkeypatch.setattr(watchlist_module, "WATCHLIST_FILE", path)
+    return path
+
+
+def observe(watchlist: Watchlist, text: str) -> int:
+    result = AnalysisResult(emotions={"happiness": 0.8}, sentiment_score=0.5, confidence=1.0)
+    return watchlist.observe([{"title": "", "text": text}], [result])
+
+
+def test_term_added_on_another_worker_is_matched_and_kept(watchlist_file):
+    leader, follower = Watchlist(), Watchlist()
+
+    assert follower.add_term("Rust")
+    assert observe(leader, "rust 2.0 is out") == 1
+
+    # The leader's save kept the term, and the follower sees the new point
+    assert Watchlist().get_series("rust")[0]["mentions"] == 1
+    assert follower.get_series("rust")[0]["sentiment"] == 0.5
+
+
+def test_term_removed_on_another_worker_stops_matching(watchlist_file):
+    leader, follower = Watchlist(), Watchlist()
+    leader.add_term("python")
+    revision = follower.revision
+
+    assert follower.remove_term("python")
+    assert observe(leader, "python 4") == 0
+    assert "python" not in Watchlist()
+    assert leader.revision > revision